@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Audio Decode Benchmark
+
+Compares whole-file ``sf.read`` with incremental decoding through
+``AudioFileReader`` on a long synthetic file. Each mode runs in its own
+process and reports time-to-first-sample and peak RSS as JSON.
+
+Usage:
+    python benchmarks/bench_audio_decode.py --minutes 120 --format FLAC
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.absolute()))
+
+from core.audio_source import OUTPUT_CHANNELS, open_audio
+
+BLOCK_FRAMES = 1024
+
+
+def peak_rss_bytes():
+    """Return the peak resident set size of this process, if it can be measured."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss)
+    except ImportError:
+        return None
+
+
+def generate_audio(path: Path, minutes: float, samplerate: int = 48000, fmt: str = 'FLAC'):
+    """Write a stereo test tone of the given length without holding it in memory."""
+    block = samplerate  # One second at a time
+    t = np.arange(block) / samplerate
+    with sf.SoundFile(path, 'w', samplerate=samplerate, channels=2, format=fmt) as f:
+        for second in range(int(minutes * 60)):
+            tone = 0.2 * np.sin(2 * np.pi * (220 + second % 200) * t)
+            f.write(np.column_stack((tone, tone)).astype('float32'))
+
+
+def run_whole(path: str) -> dict:
+    """Decode the whole file up front, as the engine used to."""
+    start = time.perf_counter()
+    data, _ = sf.read(path, always_2d=True, dtype='float32')
+    first_sample = time.perf_counter() - start
+    return {
+        'time_to_first_sample_s': first_sample,
+        'total_s': first_sample,
+        'frames': len(data),
+        'peak_rss_bytes': peak_rss_bytes()
+    }
+
+
+def run_stream(path: str) -> dict:
+    """Decode block by block into one preallocated buffer."""
+    chunk = np.zeros((BLOCK_FRAMES, OUTPUT_CHANNELS), dtype='float32')
+
+    start = time.perf_counter()
+    source = open_audio(path, BLOCK_FRAMES)
+    frames = source.read_into(chunk)
+    first_sample = time.perf_counter() - start
+
+    while True:
+        count = source.read_into(chunk)
+        if count == 0:
+            break
+        frames += count
+    source.close()
+
+    return {
+        'time_to_first_sample_s': first_sample,
+        'total_s': time.perf_counter() - start,
+        'frames': frames,
+        'peak_rss_bytes': peak_rss_bytes()
+    }
+
+
+MODES = {'whole': run_whole, 'stream': run_stream}
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Audio decode benchmark')
+    parser.add_argument('--minutes', type=float, default=30, help='Length of the test file (default: 30)')
+    parser.add_argument('--format', default='FLAC', help='Container format for the test file (default: FLAC)')
+    parser.add_argument('--file', help='Use an existing audio file instead of generating one')
+    parser.add_argument('--mode', choices=sorted(MODES), help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    """Run every mode in a fresh process and print the results as JSON."""
+    args = parse_args()
+
+    # Child process: run a single mode
+    if args.mode:
+        print(json.dumps(MODES[args.mode](args.file)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if not path:
+            path = str(Path(tmp) / f"bench.{args.format.lower()}")
+            generate_audio(Path(path), args.minutes, fmt=args.format)
+
+        results = {'file': path, 'minutes': args.minutes if not args.file else None}
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, '--mode', mode, '--file', path],
+                check=True, capture_output=True, text=True
+            ).stdout
+            results[mode] = json.loads(output)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Frame Loop Benchmark
+
+Runs the per-frame decode/convert step the video decode thread performs and
+reports CPU time and memory allocated per frame, comparing the original
+allocating loop (``read()`` plus ``resize``/``cvtColor`` returning new arrays)
+with the preallocated path (``read(image)`` plus ``FrameFitter.fit`` into a
+reused slot, or ``read(slot)`` when nothing needs fitting), in every output
+pixel format. Prints the results as JSON.
+
+Allocations are measured with ``tracemalloc`` (NumPy and OpenCV output
+arrays are traced) as the peak transient bytes of each frame, a lower bound
+on what the frame allocated, reported both in bytes and in output-frame-sized
+buffers.
+
+Usage:
+    python benchmarks/bench_frame_loop.py --width 1920 --height 1080 --frames 240
+    python benchmarks/bench_frame_loop.py --input clip.mp4
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.absolute()))
+
+from core.output_profile import FrameFitter, OutputProfile
+
+
+def make_video(path: str, width: int, height: int, frames: int, fps: int = 30):
+    """Write a synthetic MJPEG clip with moving content."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, (width, height))
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    horizontal = np.linspace(0, 255, width, dtype=np.uint8)
+    frame[:, :, 1] = np.linspace(0, 255, height, dtype=np.uint8)[:, None]
+    for index in range(frames):
+        frame[:, :, 0] = np.roll(horizontal, index * 8)
+        frame[:, :, 2] = index % 256
+        writer.write(frame)
+    writer.release()
+
+
+def loop_allocating(capture: cv2.VideoCapture, profile: OutputProfile, slot: np.ndarray, step):
+    """The original loop: every call returns a new array."""
+    while True:
+        ret, frame = capture.read()
+        if not ret:
+            return
+        frame = cv2.resize(frame, (profile.width, profile.height))
+        if profile.pixel_format == 'RGB':
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        elif profile.pixel_format == 'NV12':
+            frame = i420_to_nv12(cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420), profile)
+        step(frame)
+
+
+def i420_to_nv12(i420: np.ndarray, profile: OutputProfile) -> np.ndarray:
+    """Interleave the chroma planes of an I420 frame into a new NV12 frame."""
+    luma = profile.width * profile.height
+    planes = i420.reshape(-1)
+    u = planes[luma:luma + luma // 4]
+    v = planes[luma + luma // 4:]
+    return np.concatenate([planes[:luma], np.stack([u, v], axis=1).reshape(-1)]).reshape(profile.frame_shape)
+
+
+def loop_preallocated(capture: cv2.VideoCapture, profile: OutputProfile, slot: np.ndarray, step):
+    """The current loop: decode into one reused image, fit into the output slot.
+
+    Frames that need no fitting are decoded straight into the slot.
+    """
+    width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fitter = FrameFitter(width, height, profile)
+    image = None
+    while True:
+        ret, frame = capture.read(slot if fitter.identity else image)
+        if not ret:
+            return
+        if frame is not slot:
+            image = frame
+            fitter.fit(frame, slot)
+        step(slot)
+
+
+LOOPS = {'allocating': loop_allocating, 'preallocated': loop_preallocated}
+
+
+def run(path: str, loop, profile: OutputProfile, trace: bool) -> dict:
+    """Run ``loop`` over the whole clip, timing it or tracing its allocations."""
+    capture = cv2.VideoCapture(path)
+    slot = np.empty(profile.frame_shape, dtype=np.uint8)
+    peaks = []
+
+    if trace:
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+        def step(_):
+            nonlocal baseline
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+            baseline = current
+            tracemalloc.reset_peak()
+    else:
+        def step(_):
+            peaks.append(0)
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    loop(capture, profile, slot, step)
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    capture.release()
+    if trace:
+        tracemalloc.stop()
+
+    frames = len(peaks)
+    if trace:
+        # The first frames allocate the reused buffers
+        steady = peaks[2:] or peaks
+        return {
+            'frames': frames,
+            'alloc_bytes_per_frame': float(np.mean(steady)),
+            'frame_buffers_per_frame': float(np.mean(steady)) / slot.nbytes
+        }
+    return {
+        'frames': frames,
+        'cpu_ms_per_frame': cpu / frames * 1000 if frames else None,
+        'wall_ms_per_frame': wall / frames * 1000 if frames else None
+    }
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Video frame loop benchmark')
+    parser.add_argument('--width', type=int, default=1920, help='Synthetic clip width (default: 1920)')
+    parser.add_argument('--height', type=int, default=1080, help='Synthetic clip height (default: 1080)')
+    parser.add_argument('--frames', type=int, default=240, help='Synthetic clip frames (default: 240)')
+    parser.add_argument('--output', default='1920x1080', help='Output size WxH (default: 1920x1080)')
+    parser.add_argument('--input', help='Benchmark an existing video instead of a synthetic one')
+    return parser.parse_args()
+
+
+def measure(path: str, width: int, height: int) -> dict:
+    """Run every loop in every output format."""
+    results = {}
+    for pixel_format in OutputProfile.SUPPORTED_FORMATS:
+        profile = OutputProfile(width=width, height=height, pixel_format=pixel_format)
+        for name, loop in LOOPS.items():
+            result = run(path, loop, profile, trace=False)
+            result.update(run(path, loop, profile, trace=True))
+            results[f"{name}_{pixel_format.lower()}"] = result
+    return results
+
+
+def main():
+    """Run the benchmark and print the results as JSON."""
+    args = parse_args()
+    width, height = (int(value) for value in args.output.lower().split('x'))
+
+    if args.input:
+        results = {'input': args.input, 'loops': measure(args.input, width, height)}
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / 'bench.avi')
+            make_video(path, args.width, args.height, args.frames)
+            results = {
+                'source': f"{args.width}x{args.height}",
+                'frames': args.frames,
+                'loops': measure(path, width, height)
+            }
+
+    results['output'] = f"{width}x{height}"
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark
+
+Drives ``VirtualAVEngine`` end to end against null sinks on synthetic clips
+(a matrix of resolutions, frame rates and codecs) with a long audio file as
+the master clock, so the whole pipeline can be measured without a camera or
+audio device. Every scenario runs twice, each time in a fresh process:
+
+- ``paced``: output at the clip's frame rate, as when streaming. Reports
+  send fps, send interval p50/p99, dropped and repeated frames, A/V offset
+  and audio underruns.
+- ``unpaced``: the engine's decode worker alone, its ring buffer drained
+  as soon as frames are ready. Reports decode fps.
+
+Both report CPU use (percent of one core) and peak RSS. Results are printed
+as JSON and optionally written to a file, for comparing releases.
+
+Clips are generated with ffmpeg when it is installed (``h264``, ``mpeg4``
+and ``mjpeg``); without it only ``mjpeg`` clips can be written, with OpenCV.
+
+Usage:
+    python benchmarks/bench_pipeline.py --output results.json
+    python benchmarks/bench_pipeline.py --resolutions 1920x1080 --fps 30,60 --codecs h264 --seconds 20
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import soundfile as sf
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.absolute()))
+
+from core.audio_sink import NullAudioSink
+from core.ffmpeg_tools import ffmpeg_available, find_tool
+from core.frame_buffer import FrameRingBuffer
+from core.output_profile import OutputProfile
+from core.video_sink import NullVideoSink
+from core.virtual_av import VirtualAVEngine
+
+# ffmpeg encoder arguments per codec
+CODECS = {
+    'h264': ['-c:v', 'libx264', '-preset', 'veryfast', '-pix_fmt', 'yuv420p'],
+    'mpeg4': ['-c:v', 'mpeg4', '-q:v', '5'],
+    'mjpeg': ['-c:v', 'mjpeg', '-q:v', '5', '-pix_fmt', 'yuvj420p']
+}
+CONTAINERS = {'h264': 'mp4', 'mpeg4': 'mp4', 'mjpeg': 'avi'}
+
+
+class TimingVideoSink(NullVideoSink):
+    """Null sink that records when each frame is sent."""
+
+    def __init__(self):
+        super().__init__()
+        self.times = []
+
+    def send(self, frame: np.ndarray):
+        self.times.append(time.perf_counter())
+        super().send(frame)
+
+
+def peak_rss_bytes():
+    """Return the peak resident set size of this process, if it can be measured."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss)
+    except ImportError:
+        return None
+
+
+# ===== Synthetic Media =====
+
+def generate_clip(path: Path, codec: str, width: int, height: int, fps: float, seconds: float):
+    """Write a synthetic clip with moving content and no audio."""
+    if ffmpeg_available():
+        subprocess.run(
+            [find_tool('ffmpeg'), '-v', 'error', '-y', '-f', 'lavfi',
+             '-i', f"testsrc2=size={width}x{height}:rate={fps}:duration={seconds}",
+             '-g', str(int(fps * 2))] + CODECS[codec] + ['-an', str(path)],
+            check=True
+        )
+        return
+
+    if codec != 'mjpeg':
+        raise RuntimeError(f"ffmpeg is needed to generate {codec} clips")
+
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), fps, (width, height))
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    horizontal = np.linspace(0, 255, width, dtype=np.uint8)
+    frame[:, :, 1] = np.linspace(0, 255, height, dtype=np.uint8)[:, None]
+    for index in range(int(fps * seconds)):
+        frame[:, :, 0] = np.roll(horizontal, index * 8)
+        frame[:, :, 2] = index % 256
+        writer.write(frame)
+    writer.release()
+
+
+def generate_audio(path: Path, minutes: float, samplerate: int = 48000):
+    """Write a long stereo FLAC test tone without holding it in memory."""
+    t = np.arange(samplerate) / samplerate
+    with sf.SoundFile(path, 'w', samplerate=samplerate, channels=2, format='FLAC') as f:
+        for second in range(int(minutes * 60)):
+            tone = 0.2 * np.sin(2 * np.pi * (220 + second % 200) * t)
+            f.write(np.column_stack((tone, tone)).astype('float32'))
+
+
+# ===== Runs =====
+
+def percentile_ms(values: np.ndarray, q: float):
+    return float(np.percentile(values, q) * 1000) if len(values) else None
+
+
+def clip_profile(clip: str) -> OutputProfile:
+    """Output profile matching the clip's size and frame rate."""
+    capture = cv2.VideoCapture(clip)
+    width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = capture.get(cv2.CAP_PROP_FPS)
+    capture.release()
+    return OutputProfile(width=width, height=height, fps=fps, pixel_format='BGR')
+
+
+def new_engine(profile: OutputProfile, video_sink: NullVideoSink) -> VirtualAVEngine:
+    engine = VirtualAVEngine()
+    engine.set_media_index(None)
+    engine.set_video_audio(False)
+    engine.set_output_profile(profile)
+    engine.set_video_sink(video_sink)
+    engine.set_audio_sink(NullAudioSink())
+    return engine
+
+
+def run_paced(clip: str, audio: str, timeout: float) -> dict:
+    """Stream ``clip`` with ``audio`` as the master clock to null sinks until the clip ends."""
+    video_sink = TimingVideoSink()
+    engine = new_engine(clip_profile(clip), video_sink)
+    engine.load_media([clip, audio])
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    engine.start_streaming()
+    while engine.video_playing and time.perf_counter() - wall < timeout:
+        time.sleep(0.05)
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    status = engine.get_status()
+    engine.cleanup()
+
+    times = np.array(video_sink.times)
+    intervals = np.diff(times)
+    sent = len(times)
+    send_time = times[-1] - times[0] if sent > 1 else 0.0
+    video_buffer = status['video']['buffer'] or {}
+    audio_buffer = status['audio']['buffer'] or {}
+    return {
+        'frames_sent': sent,
+        'send_fps': (sent - 1) / send_time if send_time else None,
+        'frame_time_p50_ms': percentile_ms(intervals, 50),
+        'frame_time_p99_ms': percentile_ms(intervals, 99),
+        'frame_time_max_ms': float(intervals.max() * 1000) if len(intervals) else None,
+        'frames_dropped': status['video']['frames_dropped'],
+        'frames_repeated': status['video']['frames_repeated'],
+        'video_underruns': video_buffer.get('underruns'),
+        'audio_underruns': audio_buffer.get('underruns'),
+        'av_offset_ms': status['sync']['av_offset_ms'],
+        'cpu_percent': cpu / wall * 100,
+        'peak_rss_bytes': peak_rss_bytes()
+    }
+
+
+def run_unpaced(clip: str, timeout: float) -> dict:
+    """Run the engine's decode worker on ``clip``, taking frames as soon as they are decoded."""
+    profile = clip_profile(clip)
+    engine = new_engine(profile, NullVideoSink())
+    engine.load_media([clip])
+    buffer = FrameRingBuffer(engine.frame_buffer_depth, profile.frame_shape)
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    worker = threading.Thread(target=engine._video_decode_worker, args=(buffer, profile), daemon=True)
+    worker.start()
+    frames = 0
+    while time.perf_counter() - wall < timeout:
+        if buffer.acquire_read(timeout=0.1) is None:
+            if buffer.finished:
+                break
+            continue
+        buffer.release_read()
+        frames += 1
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    buffer.close()
+    worker.join(timeout=2.0)
+    engine.cleanup()
+
+    return {
+        'frames_decoded': frames,
+        'decode_fps': frames / wall,
+        'cpu_percent': cpu / wall * 100,
+        'peak_rss_bytes': peak_rss_bytes()
+    }
+
+
+# ===== Driver =====
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='End-to-end pipeline benchmark with null sinks')
+    parser.add_argument('--resolutions', default='1280x720,1920x1080',
+                        help='Comma-separated clip sizes (default: 1280x720,1920x1080)')
+    parser.add_argument('--fps', default='30,60', help='Comma-separated clip frame rates (default: 30,60)')
+    parser.add_argument('--codecs', default=None,
+                        help=f"Comma-separated codecs out of {','.join(CODECS)} (default: all available)")
+    parser.add_argument('--seconds', type=float, default=10, help='Clip length (default: 10)')
+    parser.add_argument('--audio-minutes', type=float, default=30,
+                        help='Length of the master audio file (default: 30)')
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def run_child(args) -> dict:
+    """Run one scenario in a fresh process and return its results."""
+    output = subprocess.run(
+        [sys.executable, __file__, '--run', json.dumps(args)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def environment() -> dict:
+    """Describe the machine and build being measured."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+            capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'opencv': cv2.__version__,
+        'ffmpeg': ffmpeg_available()
+    }
+
+
+def main():
+    """Generate the media, run every scenario and print the results as JSON."""
+    args = parse_args()
+
+    # Child process: run a single scenario
+    if args.run:
+        run = json.loads(args.run)
+        if run['paced']:
+            result = run_paced(run['clip'], run['audio'], run['timeout'])
+        else:
+            result = run_unpaced(run['clip'], run['timeout'])
+        print(json.dumps(result))
+        return
+
+    if args.codecs:
+        codecs = args.codecs.split(',')
+    else:
+        codecs = list(CODECS) if ffmpeg_available() else ['mjpeg']
+    resolutions = [tuple(int(value) for value in size.lower().split('x')) for size in args.resolutions.split(',')]
+    rates = [float(value) for value in args.fps.split(',')]
+    timeout = args.seconds * 3 + 30
+
+    results = {'environment': environment(), 'seconds': args.seconds, 'scenarios': []}
+    with tempfile.TemporaryDirectory() as tmp:
+        audio = Path(tmp) / 'master.flac'
+        generate_audio(audio, args.audio_minutes)
+
+        for codec in codecs:
+            for width, height in resolutions:
+                for fps in rates:
+                    name = f"{codec}_{width}x{height}_{fps:g}fps"
+                    clip = Path(tmp) / f"{name}.{CONTAINERS[codec]}"
+                    generate_clip(clip, codec, width, height, fps, args.seconds)
+
+                    scenario = {'name': name, 'codec': codec, 'resolution': f"{width}x{height}", 'fps': fps}
+                    for paced in (True, False):
+                        scenario['paced' if paced else 'unpaced'] = run_child({
+                            'clip': str(clip), 'audio': str(audio), 'paced': paced, 'timeout': timeout
+                        })
+                    results['scenarios'].append(scenario)
+                    clip.unlink()
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Directory Scan Benchmark
+
+Builds a synthetic media tree and compares the old one-``rglob``-per-extension
+scan with the single-pass ``scan_media`` walk, sequential and parallel.
+Prints the timings as JSON.
+
+Usage:
+    python benchmarks/bench_scan.py --dirs 2000 --files 100
+    python benchmarks/bench_scan.py --root /mnt/nas/media
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.absolute()))
+
+from core.media_scan import scan_media
+from core.virtual_av import VirtualAVEngine
+
+VIDEO_EXTS = VirtualAVEngine.VIDEO_EXTS
+AUDIO_EXTS = VirtualAVEngine.AUDIO_EXTS
+
+# Mix of media and non-media names in each synthetic directory
+SUFFIXES = ['.mp4', '.mkv', '.wav', '.flac', '.jpg', '.txt', '.nfo', '.srt']
+
+
+def build_tree(root: Path, dirs: int, files: int, fanout: int = 20):
+    """Create ``dirs`` nested directories holding ``files`` empty files each."""
+    paths = [root]
+    for index in range(dirs):
+        parent = paths[index // fanout]
+        path = parent / f"dir{index:06d}"
+        path.mkdir()
+        paths.append(path)
+        for number in range(files):
+            (path / f"file{number:04d}{SUFFIXES[number % len(SUFFIXES)]}").touch()
+
+
+def scan_rglob(root: str) -> int:
+    """The previous load_media scan: one recursive glob per extension."""
+    found = 0
+    for ext in VIDEO_EXTS.union(AUDIO_EXTS):
+        for _ in Path(root).rglob(f"*{ext}"):
+            found += 1
+    return found
+
+
+def scan_single(root: str) -> int:
+    return sum(1 for _ in scan_media(root, VIDEO_EXTS, AUDIO_EXTS))
+
+
+def scan_parallel(root: str) -> int:
+    return sum(1 for _ in scan_media(root, VIDEO_EXTS, AUDIO_EXTS, parallel=True))
+
+
+METHODS = {'rglob_per_ext': scan_rglob, 'single_pass': scan_single, 'single_pass_parallel': scan_parallel}
+
+
+def measure(root: str, repeat: int) -> dict:
+    """Time every method, keeping the best of ``repeat`` runs."""
+    results = {}
+    for name, method in METHODS.items():
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            found = method(root)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = {'seconds': best, 'files_found': found}
+
+    baseline = results['rglob_per_ext']['seconds']
+    for result in results.values():
+        result['speedup'] = baseline / result['seconds'] if result['seconds'] else None
+    return results
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Directory scan benchmark')
+    parser.add_argument('--dirs', type=int, default=500, help='Synthetic directories (default: 500)')
+    parser.add_argument('--files', type=int, default=40, help='Files per directory (default: 40)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per method (default: 3)')
+    parser.add_argument('--root', help='Scan an existing tree instead of a synthetic one')
+    return parser.parse_args()
+
+
+def main():
+    """Run the benchmark and print the results as JSON."""
+    args = parse_args()
+
+    if args.root:
+        results = {'root': args.root, 'methods': measure(args.root, args.repeat)}
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            build_tree(Path(tmp), args.dirs, args.files)
+            results = {
+                'dirs': args.dirs,
+                'files': args.dirs * args.files,
+                'methods': measure(tmp, args.repeat)
+            }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
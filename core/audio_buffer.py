@@ -0,0 +1,125 @@
+"""
+Audio Ring Buffer
+
+Preallocated single-producer/single-consumer sample ring between an audio
+decoder thread and a sounddevice output callback. The two sides never share
+a lock: each only advances its own position counter, so the real-time
+callback can never block on the decoder.
+"""
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Lock-free SPSC ring of float32 sample frames.
+
+    The producer calls ``write``; the consumer (the audio callback) calls
+    ``read_into``. Positions are running frame totals and only ever written
+    by their owning side.
+
+    Args:
+        capacity: Number of frames the ring holds
+        channels: Samples per frame
+    """
+
+    def __init__(self, capacity: int, channels: int = 2):
+        self.capacity = capacity
+        self.channels = channels
+        self._buffer = np.zeros((capacity, channels), dtype='float32')
+        self._write_pos = 0  # Owned by the producer
+        self._read_pos = 0   # Owned by the consumer
+        self._skip_to = 0    # Set by the producer to drop queued audio
+        self.end_of_stream = False
+        self.frames_played = 0  # Real frames consumed since the last reset
+
+        # Counters
+        self.underruns = 0          # Callback found fewer frames than requested
+        self.device_underflows = 0  # Output underflows reported by the audio device
+        self.overruns = 0           # Output overflows reported by the audio device
+
+    # ===== Producer Side =====
+
+    @property
+    def available(self) -> int:
+        """Frames ready to be played."""
+        return self._write_pos - max(self._read_pos, self._skip_to)
+
+    @property
+    def free(self) -> int:
+        """Frames that can be written without overwriting unplayed audio."""
+        return self.capacity - self.available
+
+    def write(self, data: np.ndarray) -> int:
+        """Copy as many frames of ``data`` as fit into the ring.
+
+        Returns:
+            Number of frames written
+        """
+        count = min(len(data), self.free)
+        if count <= 0:
+            return 0
+
+        start = self._write_pos % self.capacity
+        first = min(count, self.capacity - start)
+        np.copyto(self._buffer[start:start + first], data[:first])
+        if count > first:
+            np.copyto(self._buffer[:count - first], data[first:count])
+
+        # Publish only after the samples are in place
+        self._write_pos += count
+        return count
+
+    def discard(self):
+        """Drop everything written so far, e.g. after a seek.
+
+        Producer side: the consumer skips the dropped frames on its next read,
+        so neither side touches the other's position.
+        """
+        self._skip_to = self._write_pos
+
+    def reset(self):
+        """Drop buffered audio; only call while no callback is running."""
+        self._read_pos = self._write_pos
+        self.end_of_stream = False
+        self.frames_played = 0
+
+    # ===== Consumer Side =====
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Fill ``out`` with the oldest frames, padding any shortfall with silence.
+
+        Safe to call from the audio callback: it never blocks and does not
+        allocate sample memory.
+
+        Returns:
+            Number of real frames copied
+        """
+        wanted = len(out)
+        if self._skip_to > self._read_pos:
+            self._read_pos = self._skip_to
+        count = min(wanted, self._write_pos - self._read_pos)
+
+        if count > 0:
+            start = self._read_pos % self.capacity
+            first = min(count, self.capacity - start)
+            np.copyto(out[:first], self._buffer[start:start + first])
+            if count > first:
+                np.copyto(out[first:count], self._buffer[:count - first])
+            self._read_pos += count
+            self.frames_played += count
+
+        if count < wanted:
+            out[count:] = 0
+            if not self.end_of_stream:
+                self.underruns += 1
+        return count
+
+    def stats(self) -> dict:
+        """Return a snapshot of the buffer counters."""
+        return {
+            'capacity': self.capacity,
+            'fill': self.available,
+            'fill_ratio': self.available / self.capacity,
+            'underruns': self.underruns,
+            'device_underflows': self.device_underflows,
+            'overruns': self.overruns
+        }
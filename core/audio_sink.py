@@ -0,0 +1,235 @@
+"""
+Audio Sinks
+
+Destinations for decoded audio. The engine plays every file through one
+``AudioSink``: the sounddevice output by default, or a null, raw file or
+pipe sink, which need no audio device and keep time with their own clock
+(e.g. for headless benchmarks).
+"""
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+
+import numpy as np
+from loguru import logger
+
+# Pull callback: (outdata, latency seconds, underflow, overflow). It fills
+# ``outdata`` in place and must not block.
+AudioCallback = Callable[[np.ndarray, float, bool, bool], None]
+
+
+class AudioSink(ABC):
+    """Destination for float32 audio, opened once per file at its sample rate.
+
+    A sink is either pulled from, if opened with a callback, or written to
+    with ``write``.
+    """
+
+    @abstractmethod
+    def open(self, samplerate: int, channels: int, callback: Optional[AudioCallback] = None):
+        """Start output; with ``callback``, the sink pulls blocks from it."""
+
+    @abstractmethod
+    def write(self, data: np.ndarray):
+        """Queue ``data`` for output, blocking while the sink is full."""
+
+    @property
+    def latency(self) -> float:
+        """Seconds until audio written now is heard."""
+        return 0.0
+
+    def close(self):
+        """Stop output; the sink can be opened again afterwards."""
+
+
+class SoundDeviceSink(AudioSink):
+    """Plays audio on a sounddevice (PortAudio) output device.
+
+    Args:
+        device: Output device name or index, or None for the default device
+    """
+
+    def __init__(self, device=None):
+        self.device = device
+        self._stream = None
+
+    def open(self, samplerate: int, channels: int, callback: Optional[AudioCallback] = None):
+        import sounddevice as sd
+
+        device_callback = None
+        if callback:
+            def device_callback(outdata, frames, time_info, status):
+                callback(
+                    outdata,
+                    time_info.outputBufferDacTime - time_info.currentTime,
+                    status.output_underflow,
+                    status.output_overflow
+                )
+
+        self._stream = sd.OutputStream(
+            samplerate=samplerate,
+            channels=channels,
+            dtype='float32',
+            device=self.device,
+            callback=device_callback
+        )
+        self._stream.start()
+
+    def write(self, data: np.ndarray):
+        self._stream.write(data)
+
+    @property
+    def latency(self) -> float:
+        return self._stream.latency if self._stream else 0.0
+
+    def close(self):
+        if self._stream:
+            try:
+                self._stream.stop()
+                self._stream.close()
+            except Exception as e:
+                logger.error(f"Error stopping audio stream: {e}")
+            self._stream = None
+
+
+class ClockedAudioSink(AudioSink):
+    """Base for sinks without a device: consumes audio at the sample rate.
+
+    In callback mode a thread pulls ``block_frames`` at a time. Writes and
+    pulls are paced in real time, like a device, unless ``realtime`` is
+    off, in which case writes are consumed as fast as they are produced.
+    A callback cannot tell the sink whether it had audio, so without real
+    time pacing it would be pulled in a busy loop; non-realtime sinks
+    therefore only take blocking writes (the engine's 'blocking' audio
+    mode).
+    Subclasses implement ``_emit``.
+
+    Args:
+        block_frames: Frames pulled per callback
+        realtime: Pace consumption at the sample rate
+    """
+
+    def __init__(self, block_frames: int = 1024, realtime: bool = True):
+        self.block_frames = block_frames
+        self.realtime = realtime
+        self.frames_written = 0
+        self._samplerate = 0
+        self._deadline = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def open(self, samplerate: int, channels: int, callback: Optional[AudioCallback] = None):
+        if callback and not self.realtime:
+            raise ValueError("A non-realtime audio sink needs blocking writes, not a callback")
+        self._samplerate = samplerate
+        self._deadline = time.perf_counter()
+        self._stop_event.clear()
+        if callback:
+            block = np.zeros((self.block_frames, channels), dtype='float32')
+            self._thread = threading.Thread(target=self._pump, args=(callback, block), daemon=True)
+            self._thread.start()
+
+    def _pump(self, callback: AudioCallback, block: np.ndarray):
+        """Pull blocks from ``callback`` until closed."""
+        while not self._stop_event.is_set():
+            callback(block, 0.0, False, False)
+            self._consume(block)
+
+    def _consume(self, data: np.ndarray):
+        self._emit(data)
+        self.frames_written += len(data)
+        if self.realtime:
+            self._deadline += len(data) / self._samplerate
+            delay = self._deadline - time.perf_counter()
+            if delay > 0:
+                self._stop_event.wait(delay)
+
+    def _emit(self, data: np.ndarray):
+        """Output ``data``."""
+
+    def write(self, data: np.ndarray):
+        self._consume(data)
+
+    def close(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+
+class NullAudioSink(ClockedAudioSink):
+    """Discards audio, counting the frames."""
+
+
+class RawFileAudioSink(ClockedAudioSink):
+    """Writes interleaved float32 samples to a file.
+
+    The file is truncated when the sink is created and every file played
+    is appended at its own sample rate.
+
+    Args:
+        path: Output file
+        block_frames: Frames pulled per callback
+        realtime: Pace consumption at the sample rate
+    """
+
+    def __init__(self, path: str, block_frames: int = 1024, realtime: bool = True):
+        super().__init__(block_frames, realtime)
+        self.path = path
+        self._file = None
+        open(path, 'wb').close()
+
+    def open(self, samplerate: int, channels: int, callback: Optional[AudioCallback] = None):
+        self._file = open(self.path, 'ab')
+        logger.info(f"Writing raw audio to {self.path} (f32le, {samplerate}Hz, {channels} channels)")
+        super().open(samplerate, channels, callback)
+
+    def _emit(self, data: np.ndarray):
+        self._file.write(memoryview(data).cast('B'))
+
+    def close(self):
+        super().close()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class PipeAudioSink(ClockedAudioSink):
+    """Writes interleaved float32 samples to the stdin of a command.
+
+    A process is started for every file played; ``{samplerate}`` and
+    ``{channels}`` in the command are filled in from the file.
+
+    Args:
+        command: Command and arguments
+        block_frames: Frames pulled per callback
+        realtime: Pace consumption at the sample rate
+    """
+
+    def __init__(self, command: List[str], block_frames: int = 1024, realtime: bool = True):
+        super().__init__(block_frames, realtime)
+        self.command = command
+        self._process: Optional[subprocess.Popen] = None
+
+    def open(self, samplerate: int, channels: int, callback: Optional[AudioCallback] = None):
+        self._process = subprocess.Popen(
+            [arg.format(samplerate=samplerate, channels=channels) for arg in self.command],
+            stdin=subprocess.PIPE
+        )
+        super().open(samplerate, channels, callback)
+
+    def _emit(self, data: np.ndarray):
+        self._process.stdin.write(memoryview(data).cast('B'))
+
+    def close(self):
+        super().close()
+        if self._process:
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=5.0)
+            except (OSError, subprocess.TimeoutExpired) as e:
+                logger.warning(f"Audio pipe did not exit cleanly: {e}")
+                self._process.kill()
+            self._process = None
@@ -0,0 +1,198 @@
+"""
+Audio Sources
+
+Incremental readers that decode audio a block at a time into caller-owned
+buffers, so memory use and startup latency do not depend on file length.
+Audio files are read with soundfile; soundtracks embedded in video files are
+demuxed by an ffmpeg subprocess.
+"""
+from typing import Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+from core.ffmpeg_tools import popen_ffmpeg, probe_media
+
+# Channels sent to the output device
+OUTPUT_CHANNELS = 2
+# Sample rate used for video soundtracks whose rate cannot be probed
+DEFAULT_SAMPLERATE = 48000
+
+
+class AudioFileReader:
+    """Streams an audio file as stereo float32 blocks via ``soundfile``.
+
+    Mono sources are duplicated to both channels; sources with more than two
+    channels keep the first two.
+
+    Args:
+        path: Audio file to read
+        block_frames: Largest block ``read_into`` will be asked for
+    """
+
+    def __init__(self, path: str, block_frames: int = 1024):
+        self.path = path
+        self._file = sf.SoundFile(path)
+        self.samplerate = self._file.samplerate
+        self.channels = self._file.channels
+        self.frames = self._file.frames
+        self._block = np.empty((block_frames, self.channels), dtype='float32')
+
+    @property
+    def position(self) -> int:
+        """Index of the next frame to be read."""
+        return self._file.tell()
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Decode up to ``len(out)`` frames into ``out`` (frames x 2).
+
+        Returns:
+            Number of frames written; 0 at end of file
+        """
+        frames = min(len(out), len(self._block))
+        if self.channels == OUTPUT_CHANNELS:
+            return len(self._file.read(frames, dtype='float32', always_2d=True, out=out[:frames]))
+
+        data = self._file.read(frames, dtype='float32', always_2d=True, out=self._block[:frames])
+        count = len(data)
+        if self.channels == 1:
+            out[:count, 0] = data[:, 0]
+            out[:count, 1] = data[:, 0]
+        else:
+            out[:count] = data[:, :OUTPUT_CHANNELS]
+        return count
+
+    def seek(self, frame: int):
+        """Move to ``frame`` (0 rewinds)."""
+        self._file.seek(frame)
+
+    def close(self):
+        """Close the underlying file."""
+        self._file.close()
+
+
+class FFmpegAudioReader:
+    """Streams the first audio track of a media file as stereo float32 via ffmpeg.
+
+    ffmpeg decodes, downmixes and writes raw samples to a pipe that is read
+    straight into the caller's buffer.
+
+    Args:
+        path: Media file to read
+        samplerate: Output sample rate; ffmpeg resamples if it differs
+        duration: Length in seconds, if known
+    """
+
+    FRAME_BYTES = OUTPUT_CHANNELS * 4  # float32
+
+    def __init__(self, path: str, samplerate: int, duration: Optional[float] = None):
+        self.path = path
+        self.samplerate = samplerate
+        self.channels = OUTPUT_CHANNELS
+        self.frames = int(duration * samplerate) if duration else -1
+        self._process = None
+        self._position = 0
+        self._start(0)
+
+    def _start(self, frame: int):
+        self.close()
+        args = ['-ss', f"{frame / self.samplerate:.6f}"] if frame else []
+        args += ['-i', self.path, '-map', '0:a:0', '-vn',
+                 '-f', 'f32le', '-ac', str(OUTPUT_CHANNELS), '-ar', str(self.samplerate), '-']
+        self._process = popen_ffmpeg(args)
+        self._position = frame
+
+    @property
+    def position(self) -> int:
+        """Index of the next frame to be read."""
+        return self._position
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Decode up to ``len(out)`` frames into ``out`` (frames x 2).
+
+        Returns:
+            Number of frames written; 0 at end of stream
+        """
+        view = memoryview(out).cast('B')
+        filled = 0
+        while filled < len(view):
+            count = self._process.stdout.readinto(view[filled:])
+            if not count:
+                break
+            filled += count
+
+        frames = filled // self.FRAME_BYTES
+        self._position += frames
+        return frames
+
+    def seek(self, frame: int):
+        """Restart decoding at ``frame`` (0 rewinds)."""
+        self._start(frame)
+
+    def close(self):
+        """Stop the ffmpeg process."""
+        if self._process:
+            self._process.kill()
+            self._process.stdout.close()
+            self._process.wait()
+            self._process = None
+
+
+class SilenceReader:
+    """Produces silence for a fixed duration.
+
+    Stands in for the soundtrack of a video without audio, so a queue of
+    video soundtracks stays in step with the video queue.
+    """
+
+    def __init__(self, path: str, duration: float, samplerate: int = DEFAULT_SAMPLERATE):
+        self.path = path
+        self.samplerate = samplerate
+        self.channels = OUTPUT_CHANNELS
+        self.frames = int(duration * samplerate)
+        self._position = 0
+
+    @property
+    def position(self) -> int:
+        """Index of the next frame to be read."""
+        return self._position
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Write up to ``len(out)`` frames of silence into ``out``."""
+        count = min(len(out), self.frames - self._position)
+        out[:count] = 0
+        self._position += count
+        return count
+
+    def seek(self, frame: int):
+        """Move to ``frame`` (0 rewinds)."""
+        self._position = min(frame, self.frames)
+
+    def close(self):
+        """Nothing to release."""
+
+
+AudioSource = Union[AudioFileReader, FFmpegAudioReader, SilenceReader]
+
+
+def open_audio(path: str, block_frames: int = 1024, video: bool = False) -> AudioSource:
+    """Open ``path`` for incremental reading.
+
+    Audio files are read with soundfile. For video files the embedded
+    soundtrack is demuxed with ffmpeg, or silence of the video's length is
+    produced if it has none.
+
+    Raises:
+        IOError: If a video file cannot be probed
+    """
+    if not video:
+        return AudioFileReader(path, block_frames)
+
+    info = probe_media(path)
+    if info is None:
+        raise IOError(f"Could not probe video soundtrack: {path}")
+
+    audio = info['audio']
+    if audio is None:
+        return SilenceReader(path, info['duration'] or 0.0)
+    return FFmpegAudioReader(path, audio['samplerate'] or DEFAULT_SAMPLERATE, info['duration'])
@@ -0,0 +1,116 @@
+"""
+Clip Prefetching
+
+Opens, probes and pre-decodes the next playlist item in the background so
+the decode thread can switch clips without waiting on container parsing or
+the first keyframe.
+"""
+import threading
+from typing import List, Optional
+
+import cv2
+import numpy as np
+from loguru import logger
+
+
+class PreparedClip:
+    """An opened video file with its probed properties and preroll frames."""
+
+    def __init__(self, path: str, capture: cv2.VideoCapture, frames: List[np.ndarray]):
+        self.path = path
+        self.capture = capture
+        self.width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = capture.get(cv2.CAP_PROP_FPS)
+        self.frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.frames = frames
+
+    def release(self):
+        """Release the underlying capture."""
+        self.capture.release()
+        self.frames = []
+
+
+def open_clip(path: str, preroll_frames: int = 0) -> PreparedClip:
+    """Open ``path`` and decode its first ``preroll_frames`` frames.
+
+    Raises:
+        IOError: If the file cannot be opened
+    """
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise IOError(f"Could not open video file: {path}")
+
+    frames = []
+    for _ in range(preroll_frames):
+        ret, frame = capture.read()
+        if not ret:
+            break
+        frames.append(frame)
+
+    return PreparedClip(path, capture, frames)
+
+
+class ClipPrefetcher:
+    """Prepares one upcoming clip at a time on a background thread."""
+
+    def __init__(self, preroll_frames: int = 5):
+        self.preroll_frames = preroll_frames
+        self._path: Optional[str] = None
+        self._clip: Optional[PreparedClip] = None
+        self._error: Optional[Exception] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending_path(self) -> Optional[str]:
+        """Path currently being (or already) prefetched."""
+        return self._path
+
+    def prefetch(self, path: str):
+        """Start preparing ``path`` unless it is already being prepared."""
+        if self._path == path:
+            return
+
+        self.cancel()
+        self._path = path
+        self._thread = threading.Thread(target=self._prefetch_worker, args=(path,), daemon=True)
+        self._thread.start()
+
+    def take(self, path: str) -> Optional[PreparedClip]:
+        """Return the prepared clip for ``path``, waiting for it if needed.
+
+        Returns None if a different path was prefetched, nothing was
+        prefetched, or preparation failed; the caller then opens the file
+        itself.
+        """
+        if self._path != path:
+            self.cancel()
+            return None
+
+        self._thread.join()
+        clip = self._clip
+        if self._error:
+            logger.warning(f"Prefetch failed for {path}: {self._error}")
+        self._reset()
+        return clip
+
+    def cancel(self):
+        """Drop any prefetched clip and release its capture."""
+        if self._thread:
+            self._thread.join()
+        if self._clip:
+            self._clip.release()
+        self._reset()
+
+    def _reset(self):
+        self._path = None
+        self._clip = None
+        self._error = None
+        self._thread = None
+
+    def _prefetch_worker(self, path: str):
+        """Background thread that opens and pre-decodes ``path``."""
+        try:
+            self._clip = open_clip(path, self.preroll_frames)
+        except Exception as e:
+            self._error = e
@@ -0,0 +1,322 @@
+"""
+Disk Frame Cache
+
+Stores clips decoded once at output profile resolution as raw, uncompressed
+frame files. Cached clips are memory-mapped and their frames handed to the
+virtual camera as zero-copy slices, so repeat playback costs no decoding.
+"""
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+from loguru import logger
+
+from core.clip_prefetch import open_clip
+from core.output_profile import OutputProfile, FrameFitter
+
+
+class DiskCachedClip:
+    """A memory-mapped clip from the disk cache.
+
+    ``frames[i]`` is shown for ``repeats[i]`` output frames.
+    """
+
+    def __init__(self, raw_path: Path, repeats: np.ndarray, shape: tuple):
+        self.frames = np.memmap(raw_path, dtype=np.uint8, mode='r', shape=(len(repeats),) + shape)
+        self.repeats = repeats
+
+    def __len__(self) -> int:
+        return len(self.repeats)
+
+    def prefault(self, index: int) -> np.ndarray:
+        """Return frame ``index`` after touching each of its pages.
+
+        Reading one byte per page pulls the frame into memory on the calling
+        thread, so the thread that sends it never blocks on disk.
+        """
+        frame = self.frames[index]
+        frame.reshape(-1)[::mmap.PAGESIZE].max()
+        return frame
+
+
+class DiskCacheWriter:
+    """Appends output-size frames of one clip to a raw cache file."""
+
+    def __init__(self, cache: 'DiskFrameCache', digest: str, entry: dict):
+        self.cache = cache
+        self.digest = digest
+        self.entry = entry
+        self.tmp_path = cache.directory / f"{digest}.raw.tmp"
+        self._file = open(self.tmp_path, 'wb')
+        self._repeats = []
+
+    def append(self, frame: np.ndarray, repeats: int):
+        """Write one frame shown for ``repeats`` output frames."""
+        self._file.write(memoryview(np.ascontiguousarray(frame)).cast('B'))
+        self._repeats.append(repeats)
+
+    def finish(self):
+        """Close the file and publish it in the cache."""
+        self._file.close()
+        if not self._repeats:
+            self.abort()
+            return
+        self.cache._publish(self, np.asarray(self._repeats, dtype=np.uint16))
+
+    def abort(self):
+        """Close and delete the partial file."""
+        self._file.close()
+        self.cache._release_writer(self.digest)
+        try:
+            self.tmp_path.unlink()
+        except OSError:
+            pass
+
+
+class DiskFrameCache:
+    """LRU cache of raw decoded clips on disk under a byte budget.
+
+    Entries are keyed by source path, modification time and output profile,
+    and tracked in an ``index.json`` next to the frame files.
+
+    Args:
+        directory: Directory holding the cache files
+        budget_bytes: Maximum total size of cached frame files
+    """
+
+    INDEX_NAME = 'index.json'
+
+    def __init__(self, directory: str, budget_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        self._writing = set()
+        self._index: Dict[str, dict] = self._load_index()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    # ===== Keys and Index =====
+
+    @staticmethod
+    def _digest(path: str, profile: OutputProfile) -> Optional[str]:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        key = f"{path}|{mtime}|{profile.width}x{profile.height}@{profile.fps}|{profile.pixel_format}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _load_index(self) -> Dict[str, dict]:
+        index_path = self.directory / self.INDEX_NAME
+        try:
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        # Drop entries whose files went missing, and files nothing refers to
+        index = {
+            digest: entry for digest, entry in index.items()
+            if (self.directory / f"{digest}.raw").exists()
+        }
+        for file_path in self.directory.glob('*.r*'):
+            if file_path.name.split('.')[0] not in index:
+                try:
+                    file_path.unlink()
+                except OSError:
+                    pass
+        return index
+
+    def _save_index(self):
+        index_path = self.directory / self.INDEX_NAME
+        tmp_path = index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, index_path)
+
+    # ===== Lookup =====
+
+    def contains(self, path: str, profile: OutputProfile) -> bool:
+        """Check whether ``path`` is cached for ``profile``."""
+        digest = self._digest(path, profile)
+        with self._lock:
+            return digest in self._index
+
+    def lookup(self, path: str, profile: OutputProfile) -> Optional[DiskCachedClip]:
+        """Memory-map the cached copy of ``path``, if any."""
+        digest = self._digest(path, profile)
+        with self._lock:
+            entry = self._index.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            try:
+                repeats = np.load(self.directory / f"{digest}.rep.npy")
+                clip = DiskCachedClip(self.directory / f"{digest}.raw", repeats, profile.frame_shape)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable disk cache entry for {path}: {e}")
+                self._remove(digest)
+                self._save_index()
+                self.misses += 1
+                return None
+
+            entry['last_used'] = time.time()
+            self._save_index()
+            self.hits += 1
+            return clip
+
+    # ===== Writing =====
+
+    def start_writing(self, path: str, profile: OutputProfile,
+                      frame_count: int, rate_ratio: float) -> Optional[DiskCacheWriter]:
+        """Begin caching ``path``; returns None if it is cached, being written or too large."""
+        digest = self._digest(path, profile)
+        if digest is None:
+            return None
+
+        frame_bytes = int(np.prod(profile.frame_shape))
+        estimate = int(max(frame_count, 0) * min(1.0, rate_ratio)) * frame_bytes
+        with self._lock:
+            if digest in self._index or digest in self._writing:
+                return None
+            if estimate > self.budget_bytes:
+                logger.info(f"Clip too large for disk cache ({estimate / 2**20:.0f}MB): {path}")
+                return None
+            self._writing.add(digest)
+
+        entry = {
+            'path': path,
+            'profile': profile.to_dict(),
+            'frame_bytes': frame_bytes
+        }
+        try:
+            return DiskCacheWriter(self, digest, entry)
+        except OSError as e:
+            logger.error(f"Could not create disk cache file for {path}: {e}")
+            self._release_writer(digest)
+            return None
+
+    def build(self, path: str, profile: OutputProfile,
+              stop_event: Optional[threading.Event] = None) -> bool:
+        """Decode ``path`` into the cache without playing it.
+
+        Returns:
+            True if the clip is cached when this returns
+        """
+        if self.contains(path, profile):
+            return True
+
+        clip = open_clip(path)
+        try:
+            rate_ratio = profile.fps / clip.fps if clip.fps > 0 else 1.0
+            writer = self.start_writing(path, profile, clip.frame_count, rate_ratio)
+            if writer is None:
+                return False
+
+            fitter = FrameFitter(clip.width, clip.height, profile)
+            frame_out = np.empty(profile.frame_shape, dtype=np.uint8)
+            credit = 0.0
+            try:
+                while True:
+                    if stop_event is not None and stop_event.is_set():
+                        writer.abort()
+                        return False
+
+                    ret, frame = clip.capture.read()
+                    if not ret:
+                        break
+
+                    credit += rate_ratio
+                    repeats = int(credit)
+                    credit -= repeats
+                    if repeats:
+                        fitter.fit(frame, frame_out)
+                        writer.append(frame_out, repeats)
+            except Exception:
+                writer.abort()
+                raise
+
+            writer.finish()
+            return self.contains(path, profile)
+        finally:
+            clip.release()
+
+    def _publish(self, writer: DiskCacheWriter, repeats: np.ndarray):
+        digest = writer.digest
+        raw_path = self.directory / f"{digest}.raw"
+        np.save(self.directory / f"{digest}.rep.npy", repeats)
+        os.replace(writer.tmp_path, raw_path)
+
+        entry = dict(writer.entry)
+        entry['frames'] = len(repeats)
+        entry['nbytes'] = raw_path.stat().st_size
+        entry['last_used'] = time.time()
+
+        with self._lock:
+            self._writing.discard(digest)
+            self._index[digest] = entry
+            self._evict(keep=digest)
+            self._save_index()
+        logger.info(f"Cached {entry['path']} on disk ({len(repeats)} frames, {entry['nbytes'] / 2**20:.0f}MB)")
+
+    def _release_writer(self, digest: str):
+        with self._lock:
+            self._writing.discard(digest)
+
+    # ===== Eviction =====
+
+    @property
+    def used_bytes(self) -> int:
+        """Total size of cached frame files."""
+        return sum(entry['nbytes'] for entry in self._index.values())
+
+    def _evict(self, keep: str):
+        """Remove least recently used entries until the cache fits its budget."""
+        by_age = sorted(self._index, key=lambda digest: self._index[digest]['last_used'])
+        used = self.used_bytes
+        for digest in by_age:
+            if used <= self.budget_bytes:
+                break
+            if digest == keep:
+                continue
+            used -= self._index[digest]['nbytes']
+            self._remove(digest)
+
+    def _remove(self, digest: str):
+        entry = self._index.pop(digest, None)
+        for suffix in ('.raw', '.rep.npy'):
+            try:
+                (self.directory / f"{digest}{suffix}").unlink()
+            except OSError as e:
+                # Still mapped by a player (Windows); removed on the next start
+                logger.debug(f"Could not remove cache file {digest}{suffix}: {e}")
+        if entry:
+            logger.info(f"Evicted {entry['path']} from disk cache")
+
+    def clear(self):
+        """Remove every cached clip."""
+        with self._lock:
+            for digest in list(self._index):
+                self._remove(digest)
+            self._save_index()
+
+    def stats(self) -> dict:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return {
+                'clips': len(self._index),
+                'used_bytes': self.used_bytes,
+                'budget_bytes': self.budget_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,145 @@
+"""
+FFmpeg Tools
+
+Thin helpers around a locally installed ``ffmpeg``/``ffprobe``. FFmpeg is
+optional: callers check ``ffmpeg_available()`` and fall back to OpenCV and
+soundfile when it is missing.
+"""
+import json
+import shutil
+import subprocess
+import sys
+from typing import List, Optional
+
+from loguru import logger
+
+# Keep ffmpeg from opening console windows on Windows
+CREATION_FLAGS = getattr(subprocess, 'CREATE_NO_WINDOW', 0) if sys.platform == 'win32' else 0
+
+
+def find_tool(name: str) -> Optional[str]:
+    """Return the full path of an ffmpeg tool on PATH, if installed."""
+    return shutil.which(name)
+
+
+def ffmpeg_available() -> bool:
+    """Check whether both ffmpeg and ffprobe are installed."""
+    return bool(find_tool('ffmpeg') and find_tool('ffprobe'))
+
+
+def popen_ffmpeg(args: List[str]) -> subprocess.Popen:
+    """Start ffmpeg with ``args`` and a binary stdout pipe.
+
+    Raises:
+        FileNotFoundError: If ffmpeg is not installed
+    """
+    ffmpeg = find_tool('ffmpeg')
+    if not ffmpeg:
+        raise FileNotFoundError("ffmpeg is not installed")
+
+    return subprocess.Popen(
+        [ffmpeg, '-v', 'error', '-nostdin'] + args,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        creationflags=CREATION_FLAGS
+    )
+
+
+def probe_media(path: str) -> Optional[dict]:
+    """Probe the duration and first video and audio streams of ``path`` with ffprobe.
+
+    Returns:
+        Dict with ``duration`` (seconds or None), ``video`` (a dict with
+        ``width``, ``height``, ``fps`` and ``codec``, or None) and ``audio``
+        (a dict with ``samplerate``, ``channels`` and ``codec``, or None if
+        the file has no audio stream); None if ffprobe is missing or fails
+    """
+    ffprobe = find_tool('ffprobe')
+    if not ffprobe:
+        return None
+
+    try:
+        result = subprocess.run(
+            [ffprobe, '-v', 'error',
+             '-show_entries', 'stream=codec_type,codec_name,sample_rate,channels,width,height,avg_frame_rate'
+                              ':format=duration',
+             '-of', 'json', path],
+            capture_output=True, text=True, timeout=30, check=True,
+            creationflags=CREATION_FLAGS
+        )
+        info = json.loads(result.stdout)
+    except (OSError, subprocess.SubprocessError, ValueError) as e:
+        logger.warning(f"ffprobe failed for {path}: {e}")
+        return None
+
+    duration = info.get('format', {}).get('duration')
+    video = None
+    audio = None
+    for stream in info.get('streams') or []:
+        if stream.get('codec_type') == 'video' and video is None:
+            video = {
+                'width': int(stream.get('width', 0)) or None,
+                'height': int(stream.get('height', 0)) or None,
+                'fps': _parse_rate(stream.get('avg_frame_rate')),
+                'codec': stream.get('codec_name')
+            }
+        elif stream.get('codec_type') == 'audio' and audio is None:
+            audio = {
+                'samplerate': int(stream.get('sample_rate', 0)) or None,
+                'channels': int(stream.get('channels', 0)) or None,
+                'codec': stream.get('codec_name')
+            }
+
+    return {
+        'duration': float(duration) if duration else None,
+        'video': video,
+        'audio': audio
+    }
+
+
+def probe_keyframes(path: str) -> Optional[List[float]]:
+    """List the timestamps (seconds) of the video keyframes in ``path``.
+
+    Only packet headers are read, nothing is decoded.
+
+    Returns:
+        Sorted keyframe times; None if ffprobe is missing or fails
+    """
+    ffprobe = find_tool('ffprobe')
+    if not ffprobe:
+        return None
+
+    try:
+        result = subprocess.run(
+            [ffprobe, '-v', 'error', '-select_streams', 'v:0',
+             '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0', path],
+            capture_output=True, text=True, timeout=600, check=True,
+            creationflags=CREATION_FLAGS
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"ffprobe keyframe scan failed for {path}: {e}")
+        return None
+
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts_time, _, flags = line.partition(',')
+        if 'K' in flags:
+            try:
+                keyframes.append(float(pts_time))
+            except ValueError:
+                continue  # pts_time is N/A
+    keyframes.sort()
+    return keyframes
+
+
+def _parse_rate(rate: Optional[str]) -> Optional[float]:
+    """Turn an ffprobe rational such as ``30000/1001`` into a float."""
+    if not rate:
+        return None
+    num, _, den = rate.partition('/')
+    try:
+        value = float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return value or None
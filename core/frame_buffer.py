@@ -0,0 +1,174 @@
+"""
+Frame Ring Buffer
+
+Fixed-size ring of preallocated frame slots used to decouple video decoding
+from virtual camera output. One decode thread fills slots while one pacing
+thread drains them, so a slow decode never blocks a send.
+"""
+import threading
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+
+class FrameRingBuffer:
+    """Single-producer/single-consumer ring buffer of video frames.
+
+    All slots are allocated once up front. The producer asks for a free slot
+    with ``acquire_write``, fills it in place and publishes it with
+    ``commit_write``. The consumer gets the oldest published slot with
+    ``acquire_read`` and hands it back with ``release_read``.
+    """
+
+    def __init__(self, depth: int, shape: Tuple[int, ...], dtype=np.uint8):
+        if depth < 2:
+            raise ValueError("Frame buffer depth must be at least 2")
+
+        self.depth = depth
+        self.shape = tuple(shape)
+        self._slots = np.empty((depth,) + self.shape, dtype=dtype)
+        self._tags = [None] * depth
+        self._external = [None] * depth
+        self._read_index = 0
+        self._write_index = 0
+        self._count = 0
+        self._reading = False
+        self._eof = False
+        self._closed = False
+        self._cond = threading.Condition()
+
+        # Counters
+        self.frames_written = 0
+        self.frames_read = 0
+        self.underruns = 0
+
+    # ===== Producer Side =====
+
+    def acquire_write(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """Wait for a free slot and return it, or None on timeout or close."""
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: self._count < self.depth or self._closed, timeout
+            )
+            if not ready or self._closed:
+                return None
+            return self._slots[self._write_index]
+
+    def commit_write(self, tag: Any = None):
+        """Publish the slot returned by the last ``acquire_write``.
+
+        ``tag`` travels with the frame and is available to the consumer as
+        ``read_tag``, e.g. to tell which clip a frame belongs to.
+        """
+        self._publish(None, tag)
+
+    def commit_external(self, frame: np.ndarray, tag: Any = None):
+        """Publish a caller-owned frame in place of the acquired slot.
+
+        The consumer receives ``frame`` itself, so frames that already exist
+        in memory (e.g. a memory-mapped cache) are passed on without a copy.
+        """
+        self._publish(frame, tag)
+
+    def _publish(self, external: Optional[np.ndarray], tag: Any):
+        with self._cond:
+            self._external[self._write_index] = external
+            self._tags[self._write_index] = tag
+            self._write_index = (self._write_index + 1) % self.depth
+            self._count += 1
+            self.frames_written += 1
+            self._cond.notify_all()
+
+    def flush(self) -> int:
+        """Drop published frames the consumer has not started reading, e.g. after a seek.
+
+        Returns:
+            Number of frames dropped
+        """
+        with self._cond:
+            keep = 1 if self._reading else 0
+            dropped = self._count - keep
+            if dropped > 0:
+                self._write_index = (self._read_index + keep) % self.depth
+                self._count = keep
+                self._cond.notify_all()
+            return max(dropped, 0)
+
+    def finish(self):
+        """Mark the end of the stream; the consumer drains what is left."""
+        with self._cond:
+            self._eof = True
+            self._cond.notify_all()
+
+    # ===== Consumer Side =====
+
+    def acquire_read(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """Wait for the oldest published frame and return it.
+
+        Returns None on timeout, on close, or once the stream has finished
+        and every frame was consumed. Finding the buffer empty after playback
+        has started counts as an underrun.
+        """
+        with self._cond:
+            if self._count == 0 and not self._eof and self.frames_read > 0:
+                self.underruns += 1
+            ready = self._cond.wait_for(
+                lambda: self._count > 0 or self._eof or self._closed, timeout
+            )
+            if not ready or self._closed or self._count == 0:
+                return None
+            self._reading = True
+            external = self._external[self._read_index]
+            return external if external is not None else self._slots[self._read_index]
+
+    @property
+    def read_tag(self) -> Any:
+        """Tag of the slot returned by the last ``acquire_read``."""
+        return self._tags[self._read_index]
+
+    def release_read(self):
+        """Hand the slot returned by the last ``acquire_read`` back to the producer."""
+        with self._cond:
+            self._reading = False
+            self._read_index = (self._read_index + 1) % self.depth
+            self._count -= 1
+            self.frames_read += 1
+            self._cond.notify_all()
+
+    # ===== Lifecycle =====
+
+    def close(self):
+        """Abort the stream and wake up any waiting thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def finished(self) -> bool:
+        """True once the stream has ended (or was closed) and nothing is left to read."""
+        with self._cond:
+            return self._closed or (self._eof and self._count == 0)
+
+    # ===== Statistics =====
+
+    @property
+    def fill_level(self) -> int:
+        """Number of decoded frames waiting to be sent."""
+        return self._count
+
+    @property
+    def fill_ratio(self) -> float:
+        """Fill level as a fraction of the buffer depth."""
+        return self._count / self.depth
+
+    def stats(self) -> dict:
+        """Return a snapshot of the buffer counters."""
+        with self._cond:
+            return {
+                'depth': self.depth,
+                'fill': self._count,
+                'fill_ratio': self._count / self.depth,
+                'frames_written': self.frames_written,
+                'frames_read': self.frames_read,
+                'underruns': self.underruns
+            }
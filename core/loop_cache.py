@@ -0,0 +1,186 @@
+"""
+Loop Cache
+
+Keeps fully decoded copies of short looping clips in memory so every
+iteration after the first is served from RAM without touching the decoder.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from core.output_profile import OutputProfile
+
+
+class CachedClip:
+    """Decoded frames of one clip at output frame rate.
+
+    Frames are stored once each together with how many output frames they
+    cover, so rate conversion is replayed exactly without storing duplicates.
+    """
+
+    def __init__(self, key: tuple, capacity: int, shape: Tuple[int, ...]):
+        self.key = key
+        self.frames = np.empty((capacity,) + shape, dtype=np.uint8)
+        self.repeats = np.zeros(capacity, dtype=np.uint16)
+        self.count = 0
+        self.complete = False
+
+    @property
+    def nbytes(self) -> int:
+        """Memory reserved by this clip."""
+        return self.frames.nbytes + self.repeats.nbytes
+
+    def append(self, frame: np.ndarray, repeats: int) -> bool:
+        """Store an output-size frame; returns False once the clip is full."""
+        if self.count >= len(self.frames):
+            return False
+
+        dst = self.frames[self.count]
+        if frame.shape == dst.shape:
+            np.copyto(dst, frame)
+        else:
+            cv2.resize(frame, (dst.shape[1], dst.shape[0]), dst=dst, interpolation=cv2.INTER_AREA)
+        self.repeats[self.count] = repeats
+        self.count += 1
+        return True
+
+    def read_into(self, index: int, dst: np.ndarray):
+        """Write stored frame ``index`` into an output-size buffer."""
+        src = self.frames[index]
+        if src.shape == dst.shape:
+            np.copyto(dst, src)
+        else:
+            cv2.resize(src, (dst.shape[1], dst.shape[0]), dst=dst, interpolation=cv2.INTER_LINEAR)
+
+
+class LoopCache:
+    """LRU cache of decoded clips under a memory budget.
+
+    Clips are recorded while they play for the first time. A clip that
+    would not fit in the budget is never recorded and keeps streaming from
+    the decoder.
+
+    Args:
+        budget_bytes: Maximum memory used by cached frames
+        downscale: Factor (0, 1] applied to the output resolution before
+            storing; frames are scaled back up on playback
+    """
+
+    def __init__(self, budget_bytes: int, downscale: float = 1.0):
+        if not 0.0 < downscale <= 1.0:
+            raise ValueError(f"Invalid loop cache downscale: {downscale}")
+
+        self.budget_bytes = budget_bytes
+        self.downscale = downscale
+        self._clips: 'OrderedDict[tuple, CachedClip]' = OrderedDict()
+        self._used_bytes = 0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, path: str, profile: OutputProfile) -> Optional[tuple]:
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        return (path, mtime, profile, self.downscale)
+
+    def contains(self, path: str, profile: OutputProfile) -> bool:
+        """Check whether a complete copy of ``path`` is cached."""
+        key = self._key(path, profile)
+        with self._lock:
+            clip = self._clips.get(key)
+            return clip is not None and clip.complete
+
+    def lookup(self, path: str, profile: OutputProfile) -> Optional[CachedClip]:
+        """Return the complete cached clip for ``path``, if any."""
+        key = self._key(path, profile)
+        with self._lock:
+            clip = self._clips.get(key)
+            if clip is None or not clip.complete:
+                self.misses += 1
+                return None
+            self._clips.move_to_end(key)
+            self.hits += 1
+            return clip
+
+    def start_recording(self, path: str, profile: OutputProfile,
+                        frame_count: int, rate_ratio: float) -> Optional[CachedClip]:
+        """Reserve memory for recording ``path`` as it is decoded.
+
+        Returns None if the clip length is unknown or it cannot fit in the
+        budget even after evicting every other clip.
+        """
+        key = self._key(path, profile)
+        if key is None or frame_count <= 0:
+            return None
+
+        # Frames dropped by rate conversion are not stored; allow some
+        # slack for containers that under-report their frame count
+        capacity = int(frame_count * min(1.0, rate_ratio) * 1.05) + 2
+        if profile.pixel_format == 'NV12':
+            # Planar frames cannot be resized as images; store them at full size
+            shape = profile.frame_shape
+        else:
+            shape = (max(1, round(profile.height * self.downscale)),
+                     max(1, round(profile.width * self.downscale)), 3)
+        nbytes = capacity * (int(np.prod(shape)) + 2)
+
+        with self._lock:
+            if nbytes > self.budget_bytes:
+                logger.info(f"Clip too large for loop cache ({nbytes / 2**20:.0f}MB): {path}")
+                return None
+
+            self._drop(key)
+            while self._used_bytes + nbytes > self.budget_bytes and self._clips:
+                self._drop(next(iter(self._clips)))
+
+            clip = CachedClip(key, capacity, shape)
+            self._clips[key] = clip
+            self._used_bytes += clip.nbytes
+            return clip
+
+    def commit(self, clip: CachedClip):
+        """Mark a recording as complete so it can be served."""
+        if clip.count == 0:
+            self.discard(clip)
+            return
+
+        with self._lock:
+            clip.complete = True
+        logger.info(f"Cached loop clip {clip.key[0]} ({clip.count} frames, {clip.nbytes / 2**20:.0f}MB)")
+
+    def discard(self, clip: CachedClip):
+        """Drop an unfinished recording."""
+        with self._lock:
+            if self._clips.get(clip.key) is clip:
+                self._drop(clip.key)
+
+    def clear(self):
+        """Drop every cached clip."""
+        with self._lock:
+            self._clips.clear()
+            self._used_bytes = 0
+
+    def _drop(self, key: tuple):
+        clip = self._clips.pop(key, None)
+        if clip is not None:
+            self._used_bytes -= clip.nbytes
+
+    def stats(self) -> dict:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return {
+                'clips': sum(1 for clip in self._clips.values() if clip.complete),
+                'used_bytes': self._used_bytes,
+                'budget_bytes': self.budget_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
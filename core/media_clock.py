@@ -0,0 +1,110 @@
+"""
+Media Clock
+
+Shared playback clock for audio/video synchronization. While audio is
+playing the clock follows the audio device's output position; otherwise it
+runs from the system's monotonic timer. The video pacing loop presents
+frames against this clock, so video follows audio instead of drifting.
+"""
+import threading
+import time
+from typing import Optional, Tuple
+
+
+class MediaClock:
+    """Session clock in seconds, slaved to the audio output when attached."""
+
+    # How far the clock may run past the last audio position report before
+    # it stops; a stalled audio device stalls video with it
+    MAX_EXTRAPOLATION = 0.2
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._offset = 0.0
+        self._audio_base: Optional[float] = None
+        # (clock position, perf_counter time it is heard); swapped atomically
+        self._audio_anchor: Optional[Tuple[float, float]] = None
+        self._paused_at: Optional[float] = None
+
+    @property
+    def audio_master(self) -> bool:
+        """True while the clock is driven by audio output."""
+        return self._audio_anchor is not None
+
+    @property
+    def paused(self) -> bool:
+        return self._paused_at is not None
+
+    def now(self) -> float:
+        """Current session time in seconds."""
+        paused_at = self._paused_at
+        if paused_at is not None:
+            return paused_at
+        anchor = self._audio_anchor
+        if anchor is not None:
+            position, heard_at = anchor
+            return position + min(time.perf_counter() - heard_at, self.MAX_EXTRAPOLATION)
+        return self._offset + (time.perf_counter() - self._origin)
+
+    def reset(self):
+        """Restart the clock at zero, running from the system timer."""
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._offset = 0.0
+            self._audio_base = None
+            self._audio_anchor = None
+            self._paused_at = None
+
+    def pause(self):
+        """Freeze the clock at its current time."""
+        with self._lock:
+            if self._paused_at is None:
+                self._paused_at = self.now()
+
+    def resume(self):
+        """Continue from the time the clock was paused at.
+
+        An attached audio stream must not have advanced meanwhile (it plays
+        silence while paused), so its reports line up again on their own.
+        """
+        with self._lock:
+            position = self._paused_at
+            if position is None:
+                return
+            self._paused_at = None
+            self._origin = time.perf_counter()
+            self._offset = position
+
+    # ===== Audio Master =====
+
+    def attach_audio(self) -> float:
+        """Start following an audio stream whose first sample plays from now on.
+
+        Returns:
+            The clock time of that first sample
+        """
+        with self._lock:
+            self._audio_base = self.now()
+            return self._audio_base
+
+    def update_audio(self, played_seconds: float, output_latency: float):
+        """Report audio output progress; called from the audio thread or callback.
+
+        Args:
+            played_seconds: Audio handed to the device since ``attach_audio``,
+                up to the first sample of the block now being queued
+            output_latency: Seconds until that sample reaches the output
+        """
+        base = self._audio_base
+        if base is not None:
+            self._audio_anchor = (base + played_seconds, time.perf_counter() + output_latency)
+
+    def detach_audio(self):
+        """Stop following audio and continue from the current time on the system timer."""
+        with self._lock:
+            position = self.now()
+            self._audio_base = None
+            self._audio_anchor = None
+            self._origin = time.perf_counter()
+            self._offset = position
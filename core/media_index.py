@@ -0,0 +1,136 @@
+"""
+Media Index
+
+Persistent SQLite index of media metadata keyed by path, size and
+modification time, so a library loads without opening every file and only
+files that changed since the last run are probed again.
+"""
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from core.media_probe import MediaInfo
+
+# Default location of the index database
+DEFAULT_INDEX_PATH = Path.home() / '.streamforge' / 'media_index.db'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    duration REAL,
+    width INTEGER,
+    height INTEGER,
+    fps REAL,
+    frame_count INTEGER,
+    video_codec TEXT,
+    audio_codec TEXT,
+    samplerate INTEGER,
+    channels INTEGER,
+    keyframes TEXT
+)
+"""
+
+_COLUMNS = (
+    'path', 'size', 'mtime_ns', 'kind', 'duration', 'width', 'height', 'fps',
+    'frame_count', 'video_codec', 'audio_codec', 'samplerate', 'channels', 'keyframes'
+)
+
+
+class MediaIndex:
+    """SQLite-backed store of ``MediaInfo`` records.
+
+    A record is only returned while the file's size and modification time
+    still match what was probed. Safe to share between threads.
+
+    Args:
+        db_path: Database file; created with its directory if missing
+    """
+
+    def __init__(self, db_path: str = str(DEFAULT_INDEX_PATH)):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _to_info(row: tuple) -> MediaInfo:
+        values = dict(zip(_COLUMNS, row))
+        if values['keyframes'] is not None:
+            values['keyframes'] = json.loads(values['keyframes'])
+        return MediaInfo(**values)
+
+    @staticmethod
+    def _is_fresh(info: MediaInfo) -> bool:
+        try:
+            stat = os.stat(info.path)
+        except OSError:
+            return False
+        return stat.st_size == info.size and stat.st_mtime_ns == info.mtime_ns
+
+    def get(self, path: str) -> Optional[MediaInfo]:
+        """Return the record for ``path`` if the file is unchanged since it was probed."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM media WHERE path = ?", (path,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        info = self._to_info(row)
+        return info if self._is_fresh(info) else None
+
+    def get_many(self, paths: Iterable[str]) -> Dict[str, MediaInfo]:
+        """Return fresh records for every path in ``paths`` that has one."""
+        paths = list(paths)
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound parameter limit
+            for start in range(0, len(paths), 500):
+                batch = paths[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM media "
+                    f"WHERE path IN ({', '.join('?' * len(batch))})", batch
+                ).fetchall()
+                for row in rows:
+                    info = self._to_info(row)
+                    found[info.path] = info
+        return {path: info for path, info in found.items() if self._is_fresh(info)}
+
+    def stale(self, paths: Iterable[str]) -> List[str]:
+        """Return the paths in ``paths`` that need probing (new or changed)."""
+        paths = list(paths)
+        fresh = self.get_many(paths)
+        return [path for path in paths if path not in fresh]
+
+    def put(self, info: MediaInfo):
+        """Insert or replace the record for ``info.path``."""
+        values = info.to_dict()
+        if values['keyframes'] is not None:
+            values['keyframes'] = json.dumps(values['keyframes'])
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO media ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [values[column] for column in _COLUMNS]
+            )
+            self._conn.commit()
+
+    def remove(self, path: str):
+        """Forget ``path``."""
+        with self._lock:
+            self._conn.execute("DELETE FROM media WHERE path = ?", (path,))
+            self._conn.commit()
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
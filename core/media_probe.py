@@ -0,0 +1,107 @@
+"""
+Media Probing
+
+Reads the technical metadata of a media file: duration, resolution, frame
+rate, codecs, audio format and keyframe positions. Uses ffprobe when it is
+installed and falls back to OpenCV and soundfile otherwise.
+"""
+import os
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+import cv2
+import soundfile as sf
+
+from core.ffmpeg_tools import probe_keyframes, probe_media
+from core.media_scan import VIDEO
+
+
+@dataclass
+class MediaInfo:
+    """Metadata of one media file, as stored in the media index."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    kind: str
+    duration: Optional[float] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    frame_count: Optional[int] = None
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+    samplerate: Optional[int] = None
+    channels: Optional[int] = None
+    keyframes: Optional[List[float]] = None
+
+    def to_dict(self) -> dict:
+        """Return the metadata as a plain dict."""
+        return asdict(self)
+
+
+def _fourcc(value: float) -> Optional[str]:
+    """Decode an OpenCV FOURCC property into its four characters."""
+    code = int(value)
+    if code <= 0:
+        return None
+    return ''.join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip('\x00 ') or None
+
+
+def probe_file(path: str, kind: str, keyframes: bool = False) -> MediaInfo:
+    """Probe ``path`` and return its metadata.
+
+    Args:
+        path: Media file to probe
+        kind: ``'video'`` or ``'audio'``
+        keyframes: Also list video keyframe positions (needs ffprobe, which
+            reads the whole file; the engine lists them on first seek instead)
+
+    Raises:
+        IOError: If the file cannot be opened as media of that kind
+    """
+    stat = os.stat(path)
+    info = MediaInfo(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns, kind=kind)
+
+    probed = probe_media(path)
+    if probed:
+        info.duration = probed['duration']
+        if probed['video']:
+            info.width = probed['video']['width']
+            info.height = probed['video']['height']
+            info.fps = probed['video']['fps']
+            info.video_codec = probed['video']['codec']
+        if probed['audio']:
+            info.samplerate = probed['audio']['samplerate']
+            info.channels = probed['audio']['channels']
+            info.audio_codec = probed['audio']['codec']
+
+    if kind == VIDEO:
+        capture = cv2.VideoCapture(path)
+        try:
+            if not capture.isOpened():
+                raise IOError(f"Could not open video file: {path}")
+            info.width = info.width or int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+            info.height = info.height or int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            info.fps = info.fps or capture.get(cv2.CAP_PROP_FPS) or None
+            info.frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT)) or None
+            info.video_codec = info.video_codec or _fourcc(capture.get(cv2.CAP_PROP_FOURCC))
+        finally:
+            capture.release()
+
+        if info.duration is None and info.frame_count and info.fps:
+            info.duration = info.frame_count / info.fps
+        if keyframes:
+            info.keyframes = probe_keyframes(path)
+
+    elif probed is None or probed['audio'] is None:
+        try:
+            audio = sf.info(path)
+        except RuntimeError as e:
+            raise IOError(f"Could not open audio file: {path} ({e})")
+        info.duration = audio.duration
+        info.samplerate = audio.samplerate
+        info.channels = audio.channels
+        info.audio_codec = audio.subtype
+
+    return info
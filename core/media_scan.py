@@ -0,0 +1,85 @@
+"""
+Media Scanning
+
+Single-pass directory walker that classifies media files by suffix while it
+walks, instead of globbing the tree once per extension.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Set, Tuple
+
+# Kinds yielded by scan_media
+VIDEO = 'video'
+AUDIO = 'audio'
+
+
+def _classify(name: str, video_exts: Set[str], audio_exts: Set[str]) -> Optional[str]:
+    suffix = os.path.splitext(name)[1].lower()
+    if suffix in video_exts:
+        return VIDEO
+    if suffix in audio_exts:
+        return AUDIO
+    return None
+
+
+def _scan_dir(path: str, video_exts: Set[str], audio_exts: Set[str]) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """List the media files and subdirectories directly inside ``path``, sorted by name."""
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        kind = _classify(entry.name, video_exts, audio_exts)
+                        if kind:
+                            files.append((kind, entry.path))
+                except OSError:
+                    continue  # Entry vanished or is unreadable
+    except OSError:
+        pass  # Directory vanished or is unreadable
+    return files, subdirs
+
+
+def _walk(root: str, video_exts: Set[str], audio_exts: Set[str]) -> Iterator[Tuple[str, str]]:
+    """Depth-first walk of ``root``, yielding files as each directory is read."""
+    stack = [root]
+    while stack:
+        files, subdirs = _scan_dir(stack.pop(), video_exts, audio_exts)
+        yield from files
+        stack.extend(reversed(subdirs))
+
+
+def _walk_list(root: str, video_exts: Set[str], audio_exts: Set[str]) -> List[Tuple[str, str]]:
+    return list(_walk(root, video_exts, audio_exts))
+
+
+def scan_media(root: str, video_exts: Set[str], audio_exts: Set[str],
+               parallel: bool = False, max_workers: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+    """Walk ``root`` once and yield ``(kind, path)`` for every media file.
+
+    ``kind`` is ``VIDEO`` or ``AUDIO``. Results stream out as directories are
+    read, in a stable depth-first, name-sorted order. Symlinked directories
+    are not followed.
+
+    Args:
+        root: Directory to scan
+        video_exts: Lower-case video suffixes including the dot
+        audio_exts: Lower-case audio suffixes including the dot
+        parallel: Walk the top-level subdirectories on a thread pool; helps
+            on network shares where each directory read waits on the network
+        max_workers: Thread count for the parallel walk
+    """
+    if not parallel:
+        yield from _walk(root, video_exts, audio_exts)
+        return
+
+    files, subdirs = _scan_dir(root, video_exts, audio_exts)
+    yield from files
+
+    # Each subtree is walked by one worker; results are yielded in order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for subtree in executor.map(lambda d: _walk_list(d, video_exts, audio_exts), subdirs):
+            yield from subtree
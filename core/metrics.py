@@ -0,0 +1,248 @@
+"""
+Metrics
+
+Counters, gauges, rate meters and histograms for the streaming threads,
+readable as a snapshot dict or in the Prometheus text exposition format.
+Updates are plain attribute increments: every metric has a single writer
+thread and readers may see a value one update old, so the hot paths never
+take a lock.
+"""
+import bisect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Histogram buckets (seconds) for work done once per frame
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+# Histogram buckets (seconds) for the time between frames
+INTERVAL_BUCKETS = (0.005, 0.01, 0.015, 0.02, 0.025, 0.03, 0.035, 0.04, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0)
+
+
+class Counter:
+    """Monotonic count of events."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+    def collect(self):
+        return self.value
+
+
+class Gauge:
+    """Value that goes up and down, set directly or read from ``fn`` when collected."""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help_text: str, fn: Optional[Callable[[], Optional[float]]] = None):
+        self.name = name
+        self.help = help_text
+        self.value = 0.0
+        self._fn = fn
+
+    def set(self, value: float):
+        self.value = value
+
+    def collect(self):
+        return self._fn() if self._fn else self.value
+
+
+class RateMeter:
+    """Events per second over the last ``window`` seconds, e.g. frames per second.
+
+    ``mark`` costs one clock read; the rate is recomputed once per window
+    and reads as 0 once events stop arriving.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help_text: str, window: float = 1.0):
+        self.name = name
+        self.help = help_text
+        self.window = window
+        self.rate = 0.0
+        self._count = 0
+        self._window_start = time.perf_counter()
+        self._last_mark = 0.0
+
+    def mark(self, count: int = 1):
+        now = time.perf_counter()
+        self._count += count
+        self._last_mark = now
+        elapsed = now - self._window_start
+        if elapsed >= self.window:
+            self.rate = self._count / elapsed
+            self._count = 0
+            self._window_start = now
+
+    def collect(self):
+        if time.perf_counter() - self._last_mark > 2 * self.window:
+            return 0.0
+        return self.rate
+
+
+class Histogram:
+    """Distribution of observed values over fixed buckets.
+
+    Args:
+        name: Metric name
+        help_text: Description
+        buckets: Increasing bucket upper bounds; values above the last
+            fall into an implicit +Inf bucket
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the ``q`` quantile by interpolating within its bucket."""
+        counts = list(self.counts)
+        total = sum(counts)
+        if not total:
+            return None
+
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]  # Beyond the last bound
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def collect(self) -> dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'p50': self.quantile(0.50),
+            'p90': self.quantile(0.90),
+            'p99': self.quantile(0.99)
+        }
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """``(le, count)`` pairs for the Prometheus bucket series."""
+        series = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), list(self.counts)):
+            total += count
+            series.append(('+Inf' if bound == float('inf') else repr(bound), total))
+        return series
+
+
+class MetricsRegistry:
+    """Named metrics, exported as a snapshot dict or Prometheus text.
+
+    Args:
+        prefix: Prepended to every name in the Prometheus output
+    """
+
+    def __init__(self, prefix: str = ''):
+        self.prefix = prefix
+        self._metrics: Dict[str, object] = {}
+
+    def _add(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._add(Counter(name, help_text))
+
+    def gauge(self, name: str, help_text: str, fn: Optional[Callable[[], Optional[float]]] = None) -> Gauge:
+        return self._add(Gauge(name, help_text, fn))
+
+    def rate(self, name: str, help_text: str, window: float = 1.0) -> RateMeter:
+        return self._add(RateMeter(name, help_text, window))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, buckets))
+
+    def snapshot(self) -> dict:
+        """Return the current value of every metric; histograms as count, sum and quantiles."""
+        return {name: metric.collect() for name, metric in self._metrics.items()}
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for name, metric in self._metrics.items():
+            full_name = f"{self.prefix}_{name}" if self.prefix else name
+            lines.append(f"# HELP {full_name} {metric.help}")
+            lines.append(f"# TYPE {full_name} {metric.kind}")
+            if isinstance(metric, Histogram):
+                for bound, count in metric.cumulative():
+                    lines.append(f'{full_name}_bucket{{le="{bound}"}} {count}')
+                lines.append(f"{full_name}_sum {metric.sum!r}")
+                lines.append(f"{full_name}_count {metric.count}")
+            else:
+                value = metric.collect()
+                lines.append(f"{full_name} {'NaN' if value is None else repr(float(value))}")
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str):
+        """Write the Prometheus text to ``path`` atomically (e.g. for node_exporter's textfile collector)."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+
+class MetricsServer:
+    """Serves a registry's Prometheus text over HTTP from a background thread.
+
+    Args:
+        registry: Metrics to serve
+        port: TCP port (0 picks a free one, see ``port``)
+        host: Address to bind; local only by default
+    """
+
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = '127.0.0.1'):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # Scrapes are too frequent to log
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def close(self):
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=2.0)
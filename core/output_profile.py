@@ -0,0 +1,173 @@
+"""
+Output Profile
+
+Describes the fixed format the virtual camera is opened with, and fits
+decoded frames of any size into it so clips can change without reopening
+the device.
+"""
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+@dataclass(frozen=True)
+class OutputProfile:
+    """Resolution, frame rate and pixel format of the virtual camera output.
+
+    ``pixel_format`` 'AUTO' lets the camera pick: the formats in
+    ``AUTO_FORMATS`` are tried in order when it opens, and the first one the
+    backend accepts is used.
+    """
+
+    width: int = 1280
+    height: int = 720
+    fps: float = 30.0
+    pixel_format: str = 'AUTO'
+
+    # Pixel formats frames can be produced in from OpenCV's BGR output
+    SUPPORTED_FORMATS = ('RGB', 'BGR', 'NV12')
+    # Tried for 'AUTO', cheapest first: BGR is the decoder's own format
+    AUTO_FORMATS = ('BGR', 'RGB', 'NV12')
+
+    def __post_init__(self):
+        if self.width <= 0 or self.height <= 0:
+            raise ValueError(f"Invalid output resolution: {self.width}x{self.height}")
+        if self.fps <= 0:
+            raise ValueError(f"Invalid output frame rate: {self.fps}")
+        if self.pixel_format != 'AUTO' and self.pixel_format not in self.SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported pixel format: {self.pixel_format}")
+        if self.pixel_format == 'NV12' and (self.width % 2 or self.height % 2):
+            raise ValueError(f"NV12 needs an even resolution: {self.width}x{self.height}")
+
+    @property
+    def candidate_formats(self) -> Tuple[str, ...]:
+        """Pixel formats to try when opening the camera, in order."""
+        if self.pixel_format == 'AUTO':
+            formats = self.AUTO_FORMATS
+            if self.width % 2 or self.height % 2:
+                formats = tuple(fmt for fmt in formats if fmt != 'NV12')
+            return formats
+        return (self.pixel_format,)
+
+    def with_format(self, pixel_format: str) -> 'OutputProfile':
+        """Return a copy of this profile using ``pixel_format``."""
+        return replace(self, pixel_format=pixel_format)
+
+    @property
+    def frame_shape(self) -> Tuple[int, ...]:
+        """Shape of one output frame as a numpy array.
+
+        NV12 frames are a full-size Y plane followed by a half-height plane
+        of interleaved U and V samples.
+        """
+        if self.pixel_format == 'NV12':
+            return (self.height * 3 // 2, self.width)
+        return (self.height, self.width, 3)
+
+    @property
+    def frame_interval(self) -> float:
+        """Time between two output frames in seconds."""
+        return 1.0 / self.fps
+
+    def to_dict(self) -> dict:
+        """Return the profile as a plain dict."""
+        return {
+            'width': self.width,
+            'height': self.height,
+            'fps': self.fps,
+            'pixel_format': self.pixel_format
+        }
+
+
+class FrameFitter:
+    """Scales and letterboxes BGR frames of one source size into an output profile.
+
+    The scaled picture keeps its aspect ratio and is centred in the output
+    frame; the remaining border is black. Frames are converted only when the
+    output format is not BGR, and a same-size BGR frame is a plain copy,
+    which the decoder skips by decoding straight into the output
+    (``identity``).
+    Scratch memory is allocated once per source size, so fitting a frame does
+    not allocate.
+    """
+
+    def __init__(self, src_width: int, src_height: int, profile: OutputProfile):
+        self.profile = profile
+        self.src_size = (src_width, src_height)
+
+        scale = min(profile.width / src_width, profile.height / src_height)
+        fit_w = max(1, min(profile.width, round(src_width * scale)))
+        fit_h = max(1, min(profile.height, round(src_height * scale)))
+        self.x0 = (profile.width - fit_w) // 2
+        self.y0 = (profile.height - fit_h) // 2
+        self.x1 = self.x0 + fit_w
+        self.y1 = self.y0 + fit_h
+
+        self.passthrough = (fit_w, fit_h) == self.src_size
+        self.letterboxed = (fit_w, fit_h) != (profile.width, profile.height)
+        self.interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+        self.color_code: Optional[int] = (
+            cv2.COLOR_BGR2RGB if profile.pixel_format == 'RGB' else None
+        )
+        # Source frames are already output frames
+        self.identity = self.passthrough and not self.letterboxed and profile.pixel_format == 'BGR'
+
+        # Scaled BGR frame, only needed when both scaling and conversion run
+        self._scaled: Optional[np.ndarray] = None
+        if not self.passthrough and self.color_code is not None:
+            self._scaled = np.empty((fit_h, fit_w, 3), dtype=np.uint8)
+
+        # NV12 is fitted as BGR into a full-size canvas, then converted
+        self._canvas: Optional[np.ndarray] = None
+        self._i420: Optional[np.ndarray] = None
+        if profile.pixel_format == 'NV12':
+            self._canvas = np.zeros((profile.height, profile.width, 3), dtype=np.uint8)
+            self._i420 = np.empty((profile.height * 3 // 2, profile.width), dtype=np.uint8)
+
+    def fit(self, frame: np.ndarray, dst: np.ndarray):
+        """Write ``frame`` (BGR, source size) into ``dst`` (output profile shape)."""
+        if self._canvas is not None:
+            self._fit_packed(frame, self._canvas)
+            self._bgr_to_nv12(self._canvas, dst)
+        else:
+            self._fit_packed(frame, dst)
+
+    def _bgr_to_nv12(self, bgr: np.ndarray, dst: np.ndarray):
+        """Convert ``bgr`` into an NV12 frame via OpenCV's planar I420 output."""
+        height, width = bgr.shape[:2]
+        cv2.cvtColor(bgr, cv2.COLOR_BGR2YUV_I420, dst=self._i420)
+        planes = self._i420.reshape(-1)
+        luma = height * width
+        chroma = luma // 4
+        u = planes[luma:luma + chroma].reshape(height // 2, width // 2)
+        v = planes[luma + chroma:].reshape(height // 2, width // 2)
+
+        np.copyto(dst[:height], self._i420[:height])
+        uv = dst[height:].reshape(height // 2, width // 2, 2)
+        uv[:, :, 0] = u
+        uv[:, :, 1] = v
+
+    def _fit_packed(self, frame: np.ndarray, dst: np.ndarray):
+        """Fit ``frame`` into a packed three-channel ``dst`` (RGB or BGR order)."""
+        roi = dst[self.y0:self.y1, self.x0:self.x1]
+
+        if self.passthrough:
+            if self.color_code is not None:
+                cv2.cvtColor(frame, self.color_code, dst=roi)
+            else:
+                np.copyto(roi, frame)
+        elif self.color_code is not None:
+            cv2.resize(frame, (self.x1 - self.x0, self.y1 - self.y0),
+                       dst=self._scaled, interpolation=self.interpolation)
+            cv2.cvtColor(self._scaled, self.color_code, dst=roi)
+        else:
+            cv2.resize(frame, (self.x1 - self.x0, self.y1 - self.y0),
+                       dst=roi, interpolation=self.interpolation)
+
+        if self.letterboxed:
+            dst[:self.y0] = 0
+            dst[self.y1:] = 0
+            dst[self.y0:self.y1, :self.x0] = 0
+            dst[self.y0:self.y1, self.x1:] = 0
@@ -0,0 +1,273 @@
+"""
+Playlist
+
+Index-backed play queue with a cursor. Moving to the next, previous or any
+item is O(1) and keeps history, so the engine can step back and jump
+around instead of consuming a list with ``pop(0)``.
+"""
+import random
+import threading
+from typing import Iterator, List, Optional
+
+# Repeat modes
+REPEAT_OFF = 'off'
+REPEAT_ALL = 'all'
+REPEAT_ONE = 'one'
+
+
+class Playlist:
+    """Ordered list of media paths with a play cursor, shuffle and repeat.
+
+    The cursor is a position in play order: -1 before the first item and
+    ``len(playlist)`` after the last one. Shuffle plays the items in a
+    random permutation (a Fisher-Yates shuffle of their indices), kept with
+    its inverse so the mapping is O(1) both ways. Items added while
+    shuffled go to a random position not yet played in this pass, and
+    removing items keeps the order of the rest. Safe to share between
+    threads.
+    """
+
+    REPEAT_MODES = (REPEAT_OFF, REPEAT_ALL, REPEAT_ONE)
+
+    def __init__(self, items: Optional[List[str]] = None):
+        self._items: List[str] = list(items or [])
+        self._cursor = -1
+        self._shuffle = False
+        self._order: List[int] = []  # Play position -> item index, while shuffled
+        self._positions: List[int] = []  # Item index -> play position, while shuffled
+        self.repeat = REPEAT_OFF
+        self._lock = threading.RLock()
+
+    # ===== Order Mapping =====
+
+    def _index(self, position: int) -> int:
+        """Item index played at ``position``."""
+        return self._order[position] if self._shuffle else position
+
+    def _position(self, index: int) -> int:
+        """Play position of the item at ``index``."""
+        return self._positions[index] if self._shuffle else index
+
+    def _set_order(self, order: List[int]):
+        self._order = order
+        self._positions = [0] * len(order)
+        for position, index in enumerate(order):
+            self._positions[index] = position
+
+    def _reshuffle(self, first: Optional[int] = None):
+        """Draw a new random order, starting with the item at ``first`` if given."""
+        order = list(range(len(self._items)))
+        random.shuffle(order)
+        if first is not None:
+            position = order.index(first)
+            order[0], order[position] = order[position], order[0]
+        self._set_order(order)
+
+    # ===== Editing =====
+
+    def append(self, path: str):
+        """Add ``path`` to the end of the list."""
+        with self._lock:
+            index = len(self._items)
+            self._items.append(path)
+            if self._shuffle:
+                # Swap into a random position that is still to be played
+                self._order.append(index)
+                self._positions.append(index)
+                position = random.randint(min(max(self._cursor + 1, 0), index), index)
+                other = self._order[position]
+                self._order[position], self._order[index] = index, other
+                self._positions[index], self._positions[other] = position, index
+
+    def remove(self, path: str):
+        """Remove every occurrence of ``path``.
+
+        If the current item is removed, the cursor steps back so that
+        ``advance()`` continues with the item that followed it.
+        """
+        with self._lock:
+            if path not in self._items:
+                return
+
+            current = self._current_index()
+            played = min(max(self._cursor, 0), len(self._items))
+            removed_before = sum(1 for position in range(played) if self._items[self._index(position)] == path)
+            removed_current = current is not None and self._items[current] == path
+
+            if self._shuffle:
+                # Renumber the remaining items, keeping their play order
+                new_index = []
+                kept = 0
+                for item in self._items:
+                    new_index.append(kept)
+                    kept += item != path
+                self._set_order([new_index[index] for index in self._order if self._items[index] != path])
+
+            self._items = [item for item in self._items if item != path]
+            self._cursor -= removed_before + (1 if removed_current else 0)
+
+            self._cursor = max(-1, min(self._cursor, len(self._items)))
+
+    def clear(self):
+        """Remove all items and reset the cursor."""
+        with self._lock:
+            self._items.clear()
+            self._order.clear()
+            self._positions.clear()
+            self._cursor = -1
+
+    # ===== Navigation =====
+
+    def _current_index(self) -> Optional[int]:
+        if 0 <= self._cursor < len(self._items):
+            return self._index(self._cursor)
+        return None
+
+    @property
+    def current(self) -> Optional[str]:
+        """Item under the cursor, or None before the start or after the end."""
+        with self._lock:
+            index = self._current_index()
+            return self._items[index] if index is not None else None
+
+    @property
+    def current_index(self) -> Optional[int]:
+        """List index of the item under the cursor."""
+        with self._lock:
+            return self._current_index()
+
+    def _next_position(self) -> Optional[int]:
+        count = len(self._items)
+        if not count:
+            return None
+        if self.repeat == REPEAT_ONE and 0 <= self._cursor < count:
+            return self._cursor
+        if self._cursor + 1 < count:
+            return self._cursor + 1
+        if self.repeat == REPEAT_ALL:
+            return 0
+        return None
+
+    def advance(self) -> Optional[str]:
+        """Move to the next item and return it; None once the end is reached."""
+        with self._lock:
+            position = self._next_position()
+            if position is None:
+                self._cursor = len(self._items)
+                return None
+
+            # Every pass through a shuffled list gets a new order
+            if self._shuffle and position == 0 and self._cursor == len(self._items) - 1 \
+                    and self.repeat == REPEAT_ALL:
+                self._reshuffle()
+            self._cursor = position
+            return self._items[self._index(position)]
+
+    def peek_next(self) -> Optional[str]:
+        """Return the item ``advance()`` would move to, without moving."""
+        with self._lock:
+            position = self._next_position()
+            if position is None:
+                return None
+            return self._items[self._index(position)]
+
+    def previous(self) -> Optional[str]:
+        """Move back one item and return it.
+
+        Stays on the first item unless repeating the whole list, in which
+        case it wraps to the last one.
+        """
+        with self._lock:
+            count = len(self._items)
+            if not count:
+                return None
+            if self._cursor > 0:
+                self._cursor = min(self._cursor, count) - 1
+            elif self.repeat == REPEAT_ALL:
+                self._cursor = count - 1
+            else:
+                self._cursor = 0
+            return self._items[self._index(self._cursor)]
+
+    def jump(self, index: int) -> str:
+        """Make the item at list ``index`` current and return it.
+
+        Raises:
+            IndexError: If ``index`` is out of range
+        """
+        with self._lock:
+            if not 0 <= index < len(self._items):
+                raise IndexError(f"Playlist index out of range: {index}")
+            self._cursor = self._position(index)
+            return self._items[index]
+
+    def jump_to(self, path: str) -> bool:
+        """Make the first occurrence of ``path`` current.
+
+        Returns:
+            False if ``path`` is not in the list
+        """
+        with self._lock:
+            try:
+                self.jump(self._items.index(path))
+            except ValueError:
+                return False
+            return True
+
+    def rewind(self):
+        """Move the cursor back to before the first item."""
+        with self._lock:
+            self._cursor = -1
+
+    # ===== Modes =====
+
+    @property
+    def shuffle(self) -> bool:
+        return self._shuffle
+
+    def set_shuffle(self, enabled: bool):
+        """Turn shuffle on or off, keeping the current item current."""
+        with self._lock:
+            if enabled == self._shuffle:
+                return
+            current = self._current_index()
+            self._shuffle = enabled
+            if enabled:
+                # The current item starts the shuffled pass
+                self._reshuffle(current)
+                if current is not None:
+                    self._cursor = 0
+            elif current is not None:
+                self._cursor = current
+
+    def set_repeat(self, mode: str):
+        """Set the repeat mode: 'off', 'all' or 'one'."""
+        if mode not in self.REPEAT_MODES:
+            raise ValueError(f"Unknown repeat mode: {mode}")
+        self.repeat = mode
+
+    # ===== Inspection =====
+
+    def remaining(self) -> int:
+        """Number of items after the current one in this pass."""
+        with self._lock:
+            return max(0, len(self._items) - self._cursor - 1)
+
+    def has_next(self) -> bool:
+        """Whether starting playback now would play something."""
+        with self._lock:
+            return self._current_index() is not None or self._next_position() is not None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the items in list order."""
+        with self._lock:
+            return iter(list(self._items))
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._items
@@ -0,0 +1,180 @@
+"""
+Preview Tap
+
+Latest-frame channel from the pacing thread to a preview UI. The UI reads
+the frame the virtual camera was just sent, converted to the toolkit's
+format and scaled to the preview's size on its own thread, instead of
+decoding the video a second time.
+"""
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.output_profile import OutputProfile
+
+# Conversions from each output pixel format to each preview format
+_CONVERSIONS = {
+    'BGR': {'RGB': cv2.COLOR_RGB2BGR, 'NV12': cv2.COLOR_YUV2BGR_NV12},
+    'RGB': {'BGR': cv2.COLOR_BGR2RGB, 'NV12': cv2.COLOR_YUV2RGB_NV12}
+}
+
+
+class PreviewTap:
+    """Holds the most recent output frame for previewing as a packed 8-bit image.
+
+    The pacing thread calls ``publish`` with every frame it sends. While
+    the tap is enabled, and at most ``max_fps`` times a second, the frame
+    is copied into one of ``SLOTS`` preallocated buffers, which then
+    becomes the latest frame; frames in between are skipped before any
+    work is done. Converting and scaling to fit ``max_size`` happen in
+    ``latest``, on the reader's thread, so pacing only pays for the copy.
+    The writer never waits on readers: a copied frame is not written again
+    until two more frames have been published, and the image ``latest``
+    returns is reused after ``SLOTS`` more conversions, so it should be
+    used (or copied) right away.
+
+    Args:
+        max_size: ``(width, height)`` the preview is scaled to fit, keeping
+            the aspect ratio; None for the full output size
+        pixel_format: 'BGR' or 'RGB' (e.g. for Qt's ``Format_RGB888``)
+        max_fps: Most frames published per second; None for every frame
+    """
+
+    SLOTS = 3
+    PIXEL_FORMATS = tuple(_CONVERSIONS)
+
+    def __init__(self, max_size: Optional[Tuple[int, int]] = None, pixel_format: str = 'BGR',
+                 max_fps: Optional[float] = None):
+        if pixel_format not in self.PIXEL_FORMATS:
+            raise ValueError(f"Unsupported preview pixel format: {pixel_format}")
+        self.enabled = False
+        self.max_size = max_size
+        self.pixel_format = pixel_format
+        self.max_fps = max_fps
+        self._last_publish = 0.0
+        self._sequence = 0
+
+        # Written by the pacing thread only
+        self._frames: List[np.ndarray] = []
+        self._next_frame = 0
+        self._published: Optional[Tuple[int, np.ndarray, OutputProfile]] = None
+
+        # Reader side, converted on demand
+        self._lock = threading.Lock()
+        self._slots: List[np.ndarray] = []
+        self._next_slot = 0
+        self._scratch: Optional[np.ndarray] = None
+        self._latest: Optional[Tuple[int, np.ndarray]] = None
+
+    def preview_size(self, profile: OutputProfile) -> Tuple[int, int]:
+        """``(width, height)`` of preview frames for ``profile``."""
+        max_size = self.max_size
+        if not max_size:
+            return profile.width, profile.height
+        max_width, max_height = max_size
+        scale = min(max_width / profile.width, max_height / profile.height)
+        return max(1, int(profile.width * scale)), max(1, int(profile.height * scale))
+
+    def _frame_copy(self, frame: np.ndarray) -> np.ndarray:
+        """Copy ``frame`` into the next publish buffer and return it."""
+        if not self._frames or self._frames[0].shape != frame.shape:
+            self._frames = [np.empty(frame.shape, dtype=np.uint8) for _ in range(self.SLOTS)]
+        copy = self._frames[self._next_frame]
+        self._next_frame = (self._next_frame + 1) % self.SLOTS
+        np.copyto(copy, frame)
+        return copy
+
+    def _slot(self, shape: Tuple[int, ...]) -> np.ndarray:
+        if not self._slots or self._slots[0].shape != shape:
+            self._slots = [np.empty(shape, dtype=np.uint8) for _ in range(self.SLOTS)]
+        slot = self._slots[self._next_slot]
+        self._next_slot = (self._next_slot + 1) % self.SLOTS
+        return slot
+
+    def _scratch_buffer(self, shape: Tuple[int, ...]) -> np.ndarray:
+        if self._scratch is None or self._scratch.shape != shape:
+            self._scratch = np.empty(shape, dtype=np.uint8)
+        return self._scratch
+
+    def publish(self, frame: np.ndarray, profile: OutputProfile) -> bool:
+        """Make ``frame``, in ``profile``'s pixel format, the latest preview frame.
+
+        Returns:
+            False if the frame was skipped (tap disabled or throttled)
+        """
+        if not self.enabled:
+            return False
+
+        now = time.perf_counter()
+        max_fps = self.max_fps
+        if max_fps and now - self._last_publish < 1 / max_fps:
+            return False
+        self._last_publish = now
+
+        self._sequence += 1
+        self._published = (self._sequence, self._frame_copy(frame), profile)
+        return True
+
+    def _convert(self, frame: np.ndarray, profile: OutputProfile) -> np.ndarray:
+        """Convert and scale a published frame into the next preview slot."""
+        width, height = self.preview_size(profile)
+        slot = self._slot((height, width, 3))
+        code = _CONVERSIONS[self.pixel_format].get(profile.pixel_format)
+        resize = (width, height) != (profile.width, profile.height)
+        interpolation = cv2.INTER_AREA if width < profile.width else cv2.INTER_LINEAR
+
+        if code is None:
+            # Already in the preview format
+            if resize:
+                cv2.resize(frame, (width, height), dst=slot, interpolation=interpolation)
+            else:
+                np.copyto(slot, frame)
+        elif profile.pixel_format == 'NV12':
+            # Chroma is subsampled, so convert at full size, then scale
+            if resize:
+                full = self._scratch_buffer((profile.height, profile.width, 3))
+                cv2.cvtColor(frame, code, dst=full)
+                cv2.resize(full, (width, height), dst=slot, interpolation=interpolation)
+            else:
+                cv2.cvtColor(frame, code, dst=slot)
+        else:
+            # Scale first so the conversion runs on fewer pixels
+            if resize:
+                small = self._scratch_buffer((height, width, 3))
+                cv2.resize(frame, (width, height), dst=small, interpolation=interpolation)
+                cv2.cvtColor(small, code, dst=slot)
+            else:
+                cv2.cvtColor(frame, code, dst=slot)
+        return slot
+
+    @property
+    def sequence(self) -> int:
+        """Number of frames published so far."""
+        return self._sequence
+
+    def latest(self) -> Optional[Tuple[int, np.ndarray]]:
+        """Return ``(sequence, frame)`` for the latest frame, or None before the first.
+
+        ``sequence`` increases with every published frame, so a reader can
+        tell whether anything changed since its last call. Each frame is
+        converted once, by the first reader to ask for it.
+        """
+        published = self._published
+        if published is None:
+            return None
+
+        sequence, frame, profile = published
+        with self._lock:
+            latest = self._latest
+            if latest is None or latest[0] != sequence:
+                latest = self._latest = (sequence, self._convert(frame, profile))
+            return latest
+
+    def clear(self):
+        """Forget the latest frame, e.g. when streaming stops."""
+        self._published = None
+        with self._lock:
+            self._latest = None
@@ -0,0 +1,240 @@
+"""
+Thumbnails
+
+Small WebP (or JPEG) poster frames of video files in a content-addressed
+on-disk cache. Entries are keyed by path, size and modification time, so a
+file is opened once per version, and the cache keeps under a byte budget by
+evicting the least recently used entries. The desktop list and the
+``main.py --list`` listing share the same cache directory.
+"""
+import hashlib
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from core.ffmpeg_tools import CREATION_FLAGS, find_tool, probe_media
+
+# Default location of the thumbnail store
+DEFAULT_THUMBNAIL_DIR = Path.home() / '.streamforge' / 'thumbnails'
+
+# Default size budget of the store
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Fraction of the clip the poster frame is taken at, past any fade-in
+POSTER_POSITION = 0.1
+
+# Encoder parameters per thumbnail format
+_ENCODE_PARAMS = {
+    'webp': [cv2.IMWRITE_WEBP_QUALITY, 75],
+    'jpg': [cv2.IMWRITE_JPEG_QUALITY, 80]
+}
+
+
+class ThumbnailCache:
+    """Size-bounded directory of thumbnail images.
+
+    Safe to share between threads and processes: thumbnails are written to
+    a temporary file and renamed into place, and each process evicts from
+    its own view of the directory, read when the cache is first used.
+    Using a thumbnail touches its modification time, which is the LRU order.
+
+    Args:
+        directory: Where thumbnails are stored; created if missing
+        size: ``(width, height)`` thumbnails are scaled down to fit
+        max_bytes: Size budget; least recently used thumbnails are deleted
+            once it is exceeded
+        image_format: 'webp' or 'jpg'; falls back to 'jpg' if OpenCV cannot
+            write WebP
+    """
+
+    def __init__(self, directory: str = str(DEFAULT_THUMBNAIL_DIR), size: Tuple[int, int] = (160, 90),
+                 max_bytes: int = DEFAULT_MAX_BYTES, image_format: str = 'webp'):
+        if image_format not in _ENCODE_PARAMS:
+            raise ValueError(f"Unsupported thumbnail format: {image_format}")
+        if image_format == 'webp' and not cv2.haveImageWriter('.webp'):
+            image_format = 'jpg'
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.size = size
+        self.max_bytes = max_bytes
+        self.image_format = image_format
+        self._lock = threading.Lock()
+        self._entries: Optional[OrderedDict] = None
+        self._total_bytes = 0
+
+    # ===== Lookup =====
+
+    def _file(self, path: str) -> Optional[Path]:
+        """Thumbnail file for the current version of ``path``; None if it cannot be read."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        key = f"{Path(path).absolute()}|{stat.st_size}|{stat.st_mtime_ns}|{self.size[0]}x{self.size[1]}"
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.{self.image_format}"
+
+    def get(self, path: str) -> Optional[str]:
+        """Return the thumbnail file of ``path`` if it was already made."""
+        thumbnail = self._file(path)
+        if thumbnail is None or not thumbnail.exists():
+            return None
+        self._touch(thumbnail)
+        return str(thumbnail)
+
+    def get_or_create(self, path: str, duration: Optional[float] = None) -> Optional[str]:
+        """Return the thumbnail file of ``path``, making it first if needed.
+
+        Args:
+            path: Video file
+            duration: Clip length in seconds, if known, to place the poster
+                frame; otherwise it is probed
+
+        Returns:
+            The thumbnail path, or None if no frame could be read
+        """
+        thumbnail = self._file(path)
+        if thumbnail is None:
+            return None
+        if thumbnail.exists():
+            self._touch(thumbnail)
+            return str(thumbnail)
+
+        image = self._poster_frame(path, duration)
+        if image is None:
+            return None
+
+        ok, data = cv2.imencode(f".{self.image_format}", image, _ENCODE_PARAMS[self.image_format])
+        if not ok:
+            return None
+
+        thumbnail.parent.mkdir(exist_ok=True)
+        temp_path = thumbnail.with_name(f"{thumbnail.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data.tobytes())
+        os.replace(temp_path, thumbnail)
+        self._add(thumbnail, len(data))
+        return str(thumbnail)
+
+    # ===== Eviction =====
+
+    def _load_entries(self):
+        """Read the existing thumbnails, oldest use first (called with the lock held)."""
+        entries = []
+        for thumbnail in self.directory.glob(f"*/*.{self.image_format}"):
+            try:
+                stat = thumbnail.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, str(thumbnail), stat.st_size))
+        entries.sort()
+
+        self._entries = OrderedDict((name, size) for _, name, size in entries)
+        self._total_bytes = sum(self._entries.values())
+
+    def _touch(self, thumbnail: Path):
+        """Mark ``thumbnail`` as just used."""
+        try:
+            os.utime(thumbnail)
+        except OSError:
+            pass
+        with self._lock:
+            if self._entries is not None and str(thumbnail) in self._entries:
+                self._entries.move_to_end(str(thumbnail))
+
+    def _add(self, thumbnail: Path, size: int):
+        """Record a new thumbnail and evict old ones past the budget."""
+        with self._lock:
+            if self._entries is None:
+                self._load_entries()
+            else:
+                self._total_bytes += size - self._entries.pop(str(thumbnail), 0)
+                self._entries[str(thumbnail)] = size
+
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                name, old_size = self._entries.popitem(last=False)
+                self._total_bytes -= old_size
+                try:
+                    os.remove(name)
+                except OSError:
+                    pass  # Already evicted by another process
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes used by the thumbnails this cache knows of."""
+        with self._lock:
+            if self._entries is None:
+                self._load_entries()
+            return self._total_bytes
+
+    # ===== Extraction =====
+
+    def _poster_frame(self, path: str, duration: Optional[float]) -> Optional[np.ndarray]:
+        """Read a representative frame of ``path``, scaled to fit ``size``."""
+        frame = None
+        if find_tool('ffmpeg'):
+            if duration is None:
+                probe = probe_media(path)
+                duration = probe['duration'] if probe else None
+            frame = self._ffmpeg_frame(path, (duration or 0.0) * POSTER_POSITION)
+        if frame is None:
+            frame = self._opencv_frame(path)
+        if frame is None:
+            logger.debug(f"No frame for thumbnail of {path}")
+            return None
+
+        height, width = frame.shape[:2]
+        scale = min(self.size[0] / width, self.size[1] / height, 1.0)
+        if scale == 1.0:
+            return frame
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    def _ffmpeg_frame(self, path: str, position: float) -> Optional[np.ndarray]:
+        """Decode the first keyframe at or before ``position`` with ffmpeg, scaled down.
+
+        The seek is an input option without accurate seeking and only
+        keyframes are decoded, so this costs one keyframe however long the
+        file is.
+        """
+        width, height = self.size
+        try:
+            result = subprocess.run(
+                [find_tool('ffmpeg'), '-v', 'error', '-nostdin',
+                 '-noaccurate_seek', '-ss', f"{position:.3f}", '-skip_frame', 'nokey', '-i', path,
+                 '-frames:v', '1', '-an', '-sn',
+                 '-vf', f"scale='min({width},iw)':'min({height},ih)':force_original_aspect_ratio=decrease",
+                 '-f', 'image2pipe', '-c:v', 'bmp', '-'],
+                capture_output=True, timeout=30, creationflags=CREATION_FLAGS
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"ffmpeg poster frame failed for {path}: {e}")
+            return None
+
+        if not result.stdout:
+            return None
+        return cv2.imdecode(np.frombuffer(result.stdout, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    @staticmethod
+    def _opencv_frame(path: str) -> Optional[np.ndarray]:
+        """Read a frame at ``POSTER_POSITION`` of ``path`` with OpenCV."""
+        capture = cv2.VideoCapture(path)
+        try:
+            if not capture.isOpened():
+                return None
+
+            frame_count = capture.get(cv2.CAP_PROP_FRAME_COUNT)
+            if frame_count > 1:
+                capture.set(cv2.CAP_PROP_POS_FRAMES, int(frame_count * POSTER_POSITION))
+            ret, frame = capture.read()
+            return frame if ret else None
+        finally:
+            capture.release()
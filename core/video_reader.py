@@ -0,0 +1,112 @@
+"""
+FFmpeg Video Reader
+
+Decodes a video file to BGR frames through an ffmpeg pipe. ffmpeg seeks
+straight to the keyframe before the requested time and decodes forward only
+to that time, where OpenCV's seek backs off further and decodes more. Used
+for playback after a seek; the decode loop uses it like a
+``cv2.VideoCapture``.
+"""
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.ffmpeg_tools import popen_ffmpeg
+
+
+class FFmpegVideoReader:
+    """The subset of ``cv2.VideoCapture`` the decode loop uses, backed by ffmpeg.
+
+    Args:
+        path: Video file to read
+        width: Frame width of the video
+        height: Frame height of the video
+        fps: Frame rate of the video
+        frame_count: Total number of frames, if known
+        start: Position in seconds at which decoding starts
+    """
+
+    def __init__(self, path: str, width: int, height: int, fps: float,
+                 frame_count: int = 0, start: float = 0.0):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_count = frame_count
+        self._frame_bytes = width * height * 3
+        self._process = None
+        self._position = 0
+        self._start(start)
+
+    def _start(self, seconds: float):
+        self.release()
+        args = ['-ss', f"{seconds:.6f}"] if seconds > 0 else []
+        args += ['-i', self.path, '-map', '0:v:0', '-an', '-sn',
+                 '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-']
+        self._process = popen_ffmpeg(args)
+        self._position = int(round(seconds * self.fps)) if self.fps > 0 else 0
+
+    def isOpened(self) -> bool:
+        return self._process is not None
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """Decode the next frame, into ``image`` if given."""
+        if image is None:
+            image = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        if not self._read_into(image):
+            return False, None
+        return True, image
+
+    def grab(self) -> bool:
+        """Decode and discard the next frame."""
+        return self.read()[0]
+
+    def _read_into(self, image: np.ndarray) -> bool:
+        if not self._process:
+            return False
+
+        view = memoryview(image).cast('B')
+        filled = 0
+        while filled < self._frame_bytes:
+            count = self._process.stdout.readinto(view[filled:])
+            if not count:
+                return False
+            filled += count
+
+        self._position += 1
+        return True
+
+    def get(self, prop: int) -> float:
+        """Return a capture property, like ``cv2.VideoCapture.get``."""
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.frame_count)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._position)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return self._position / self.fps * 1000 if self.fps > 0 else 0.0
+        return 0.0
+
+    def set(self, prop: int, value: float) -> bool:
+        """Seek with ``CAP_PROP_POS_FRAMES`` or ``CAP_PROP_POS_MSEC``."""
+        if prop == cv2.CAP_PROP_POS_FRAMES and self.fps > 0:
+            self._start(value / self.fps)
+            return True
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            self._start(value / 1000)
+            return True
+        return False
+
+    def release(self):
+        """Stop the ffmpeg process."""
+        if self._process:
+            self._process.kill()
+            self._process.stdout.close()
+            self._process.wait()
+            self._process = None
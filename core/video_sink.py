@@ -0,0 +1,233 @@
+"""
+Video Sinks
+
+Destinations for the paced video stream. The engine sends every frame to
+one ``VideoSink``: the virtual camera by default, or a null, raw file,
+shared memory or pipe sink, which run without any camera device (e.g. for
+headless benchmarks).
+"""
+import struct
+import subprocess
+from abc import ABC, abstractmethod
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from core.output_profile import OutputProfile
+
+# ffmpeg names of the output pixel formats, for pipe consumers
+FFMPEG_PIXEL_FORMATS = {'RGB': 'rgb24', 'BGR': 'bgr24', 'NV12': 'nv12'}
+
+
+class VideoSink(ABC):
+    """Destination for paced video frames, opened once per streaming session.
+
+    Subclasses implement ``send`` and usually ``open`` and ``close``.
+    """
+
+    # Pixel formats the sink accepts, in order of preference
+    formats: Tuple[str, ...] = OutputProfile.SUPPORTED_FORMATS
+
+    def open(self, profile: OutputProfile) -> OutputProfile:
+        """Prepare to receive frames of ``profile``.
+
+        Returns:
+            The profile frames must be sent in, with a concrete pixel format
+
+        Raises:
+            RuntimeError: If the sink cannot take any of the profile's formats
+        """
+        for pixel_format in profile.candidate_formats:
+            if pixel_format in self.formats:
+                return profile.with_format(pixel_format)
+        raise RuntimeError(f"{type(self).__name__} does not support {profile.pixel_format}")
+
+    @abstractmethod
+    def send(self, frame: np.ndarray):
+        """Output one frame in the profile returned by ``open``."""
+
+    def close(self):
+        """Release the sink; it can be opened again afterwards."""
+
+
+class VirtualCamSink(VideoSink):
+    """Sends frames to a pyvirtualcam virtual camera.
+
+    With an 'AUTO' profile, the candidate formats are tried in order and
+    the first one the camera backend accepts is used.
+
+    Args:
+        backend: pyvirtualcam backend name, or None for the platform default
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = backend
+        self.camera = None
+
+    def open(self, profile: OutputProfile) -> OutputProfile:
+        import pyvirtualcam
+
+        errors = []
+        for pixel_format in profile.candidate_formats:
+            try:
+                self.camera = pyvirtualcam.Camera(
+                    width=profile.width,
+                    height=profile.height,
+                    fps=profile.fps,
+                    fmt=pyvirtualcam.PixelFormat[pixel_format],
+                    backend=self.backend
+                )
+            except (KeyError, ValueError, RuntimeError) as e:
+                errors.append(f"{pixel_format}: {e}")
+                continue
+            return profile.with_format(pixel_format)
+
+        raise RuntimeError(f"Could not open virtual camera ({'; '.join(errors)})")
+
+    def send(self, frame: np.ndarray):
+        self.camera.send(frame)
+
+    def close(self):
+        if self.camera:
+            try:
+                self.camera.close()
+            except Exception as e:
+                logger.error(f"Error closing virtual camera: {e}")
+            self.camera = None
+
+
+class NullVideoSink(VideoSink):
+    """Discards frames, counting them."""
+
+    def __init__(self):
+        self.frames_sent = 0
+
+    def send(self, frame: np.ndarray):
+        self.frames_sent += 1
+
+
+class RawFileVideoSink(VideoSink):
+    """Appends raw frames to a file, e.g. for ``ffplay -f rawvideo``.
+
+    Args:
+        path: Output file; truncated when the sink is opened
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self.frames_sent = 0
+
+    def open(self, profile: OutputProfile) -> OutputProfile:
+        profile = super().open(profile)
+        self._file = open(self.path, 'wb')
+        logger.info(
+            f"Writing raw video to {self.path} "
+            f"({profile.width}x{profile.height} {FFMPEG_PIXEL_FORMATS[profile.pixel_format]} @ {profile.fps}fps)"
+        )
+        return profile
+
+    def send(self, frame: np.ndarray):
+        self._file.write(memoryview(np.ascontiguousarray(frame)).cast('B'))
+        self.frames_sent += 1
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class SharedMemoryVideoSink(VideoSink):
+    """Publishes the latest frame in a named shared memory block.
+
+    The block starts with a header (see ``HEADER``): a sequence number that
+    is odd while a frame is being written, followed by width, height, fps
+    and the pixel format name. Readers copy the frame and retry if the
+    sequence number changed or was odd, so only whole frames are seen.
+
+    Args:
+        name: Shared memory block name
+    """
+
+    # sequence, width, height, fps, pixel format (ASCII, NUL padded)
+    HEADER = struct.Struct('<QIId8s')
+
+    def __init__(self, name: str = 'streamforge_video'):
+        self.name = name
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._frame: Optional[np.ndarray] = None
+        self._sequence = 0
+
+    def open(self, profile: OutputProfile) -> OutputProfile:
+        profile = super().open(profile)
+        size = self.HEADER.size + int(np.prod(profile.frame_shape))
+        self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        self._frame = np.ndarray(profile.frame_shape, dtype=np.uint8,
+                                 buffer=self._shm.buf, offset=self.HEADER.size)
+        self._profile = profile
+        self._sequence = 0
+        self._write_header()
+        return profile
+
+    def _write_header(self):
+        profile = self._profile
+        self.HEADER.pack_into(self._shm.buf, 0, self._sequence, profile.width, profile.height,
+                              profile.fps, profile.pixel_format.encode('ascii'))
+
+    def send(self, frame: np.ndarray):
+        self._sequence += 1
+        self._write_header()  # Odd: frame being written
+        np.copyto(self._frame, frame)
+        self._sequence += 1
+        self._write_header()
+
+    def close(self):
+        if self._shm:
+            self._frame = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+class PipeVideoSink(VideoSink):
+    """Writes raw frames to the stdin of a command, e.g. an ffmpeg encoder.
+
+    ``{width}``, ``{height}``, ``{fps}`` and ``{pix_fmt}`` (ffmpeg pixel
+    format name) in the command are filled in from the output profile.
+
+    Args:
+        command: Command and arguments
+    """
+
+    def __init__(self, command: List[str]):
+        self.command = command
+        self._process: Optional[subprocess.Popen] = None
+
+    def open(self, profile: OutputProfile) -> OutputProfile:
+        profile = super().open(profile)
+        fields = {
+            'width': profile.width,
+            'height': profile.height,
+            'fps': profile.fps,
+            'pix_fmt': FFMPEG_PIXEL_FORMATS[profile.pixel_format]
+        }
+        self._process = subprocess.Popen(
+            [arg.format(**fields) for arg in self.command],
+            stdin=subprocess.PIPE
+        )
+        return profile
+
+    def send(self, frame: np.ndarray):
+        self._process.stdin.write(memoryview(np.ascontiguousarray(frame)).cast('B'))
+
+    def close(self):
+        if self._process:
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=5.0)
+            except (OSError, subprocess.TimeoutExpired) as e:
+                logger.warning(f"Video pipe did not exit cleanly: {e}")
+                self._process.kill()
+            self._process = None
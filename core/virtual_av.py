@@ -4,19 +4,52 @@ Virtual Audio/Video Engine
 This module provides the core functionality for streaming video and audio
 through virtual devices. It's designed to be used by both the desktop and web interfaces.
 """
+import bisect
 import logging
 import time
 import threading
 import queue
-from typing import Optional, List, Tuple, Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional, List, Tuple, Callable, Dict, NamedTuple, Set, Iterable
 from pathlib import Path
 
 import cv2
 import numpy as np
-import sounddevice as sd
-import soundfile as sf
 from loguru import logger
 
+from core.audio_buffer import AudioRingBuffer
+from core.audio_sink import AudioSink, SoundDeviceSink
+from core.audio_source import AudioSource, OUTPUT_CHANNELS, open_audio
+from core.clip_prefetch import ClipPrefetcher, PreparedClip, open_clip
+from core.disk_cache import DiskCachedClip, DiskCacheWriter, DiskFrameCache
+from core.ffmpeg_tools import ffmpeg_available, probe_keyframes, probe_media
+from core.frame_buffer import FrameRingBuffer
+from core.loop_cache import CachedClip, LoopCache
+from core.media_clock import MediaClock
+from core.media_index import DEFAULT_INDEX_PATH, MediaIndex
+from core.media_probe import MediaInfo, probe_file
+from core.media_scan import AUDIO, VIDEO, scan_media
+from core.metrics import INTERVAL_BUCKETS, LATENCY_BUCKETS, MetricsRegistry, MetricsServer
+from core.output_profile import OutputProfile, FrameFitter
+from core.playlist import Playlist, REPEAT_ALL, REPEAT_OFF
+from core.preview import PreviewTap
+from core.video_reader import FFmpegVideoReader
+from core.video_sink import VideoSink, VirtualCamSink
+
+
+class FrameTag(NamedTuple):
+    """Tag of decoded frames: which queue item they belong to and where they start.
+    
+    A new tag starts with every item played (also each pass of a clip
+    looping in place) and after every seek.
+    """
+    
+    item: int  # Sequence number of the queue item, also used by its soundtrack
+    path: str
+    start: float  # Media position (seconds) of the first frame with this tag
+    seek: int = 0  # Number of the seek that started this segment; 0 from the item start
+
+
 class VirtualAVEngine:
     """Core engine for handling virtual audio and video streaming.
     
@@ -28,47 +61,166 @@ class VirtualAVEngine:
     VIDEO_EXTS = {'.mp4', '.avi', '.mov', '.mkv', '.webm'}
     AUDIO_EXTS = {'.wav', '.mp3', '.flac', '.ogg', '.aac'}
     
+    # Number of decoded frames kept ahead of the virtual camera
+    DEFAULT_FRAME_BUFFER_DEPTH = 8
+    
+    # Seconds before the end of a clip at which the next one is opened
+    PREFETCH_LEAD_SECONDS = 2.0
+    # Frames of the next clip decoded while the current one finishes
+    PREROLL_FRAMES = 5
+    
+    # Memory budget for decoded copies of looping clips
+    DEFAULT_LOOP_CACHE_BYTES = 1024 * 1024 * 1024
+    
+    # Audio output modes: device callback fed from a ring buffer, or blocking writes
+    AUDIO_MODES = ('callback', 'blocking')
+    # Frames of decoded audio buffered ahead of the output callback
+    AUDIO_BUFFER_FRAMES = 16384
+    AUDIO_CHUNK_FRAMES = 1024
+    AUDIO_DEVICE = 'CABLE Input (VB-Audio Virtual Cable)'
+    
+    # How far video may drift from the media clock before frames are dropped
+    DEFAULT_AV_SYNC_TOLERANCE = 0.040
+    
+    # Rate at which the held frame is resent to the virtual camera while paused
+    PAUSE_REFRESH_FPS = 5
+    
+    # Worker processes that probe newly loaded files
+    PROBE_WORKERS = 4
+    
     def __init__(self):
         # Video properties
         self.video_capture: Optional[cv2.VideoCapture] = None
-        self.virtual_cam = None
+        self.video_sink: VideoSink = VirtualCamSink()
         self.current_video_path: Optional[str] = None
-        self.video_queue: List[str] = []
+        self.video_playlist = Playlist()
         self.video_playing = False
         self.video_loop = False
         self.video_thread: Optional[threading.Thread] = None
+        self.video_decode_thread: Optional[threading.Thread] = None
         self.video_stop_event = threading.Event()
+        self.frame_buffer: Optional[FrameRingBuffer] = None
+        self.frame_buffer_depth = self.DEFAULT_FRAME_BUFFER_DEPTH
+        self.output_profile = OutputProfile()
+        self.active_profile: Optional[OutputProfile] = None  # Format negotiated with the sink
+        self.loop_cache = LoopCache(self.DEFAULT_LOOP_CACHE_BYTES)
+        self.disk_cache: Optional[DiskFrameCache] = None
+        self.disk_cache_thread: Optional[threading.Thread] = None
+        self.clip_gap_last: Optional[float] = None
+        self.clip_gap_max: Optional[float] = None
+        self.preview = PreviewTap()  # Latest sent frame, for the UI
         
         # Audio properties
-        self.audio_stream: Optional[sd.OutputStream] = None
-        self.audio_data = None
+        self.audio_sink: AudioSink = SoundDeviceSink(self.AUDIO_DEVICE)
+        self.audio_source: Optional[AudioSource] = None
         self.audio_samplerate = 44100
+        self.audio_mode = 'callback'
+        self.video_audio = True  # Play soundtracks embedded in video files
+        self.audio_ring: Optional[AudioRingBuffer] = None
         self.current_audio_path: Optional[str] = None
-        self.audio_queue: List[str] = []
+        self.audio_playlist = Playlist()
+        # Videos started by the decoder, whose soundtracks the audio worker plays
+        self.soundtrack_queue: Optional[queue.Queue] = None
+        self._items_started = 0
+        self._soundtrack_floor = 0  # First item whose soundtrack may still play
+        self._audio_item: Optional[int] = None
+        self._video_item: Optional[int] = None  # Item the pacing loop is presenting
+        # (item, seek number, session time of media position 0) of the soundtrack playing
+        self._soundtrack_anchor: Optional[Tuple[int, int, float]] = None
+        self._soundtrack_failed: Optional[int] = None  # Last item whose soundtrack could not play
         self.audio_playing = False
         self.audio_loop = False
         self.audio_thread: Optional[threading.Thread] = None
         self.audio_stop_event = threading.Event()
         
+        # A/V synchronization
+        self.media_clock = MediaClock()
+        self.av_sync_tolerance = self.DEFAULT_AV_SYNC_TOLERANCE
+        self.av_offset: Optional[float] = None
+        
+        # Metrics, updated by the worker threads
+        self.metrics = MetricsRegistry('streamforge')
+        self.metrics_server: Optional[MetricsServer] = None
+        self._metrics_file_stop = threading.Event()
+        self._metrics_file_thread: Optional[threading.Thread] = None
+        self._register_metrics()
+        
+        # Pending seeks and playlist jumps, taken by the decode workers
+        self._seek_lock = threading.Lock()
+        self._video_seek: Optional[Tuple[float, int]] = None  # (target, seek number)
+        self._audio_seek: Optional[Tuple[float, int]] = None
+        self._seeks = 0  # Seeks requested, numbering the segments they start
+        self._video_retime = threading.Event()  # Wakes the pacing loop out of an early hold
+        self._video_jump = False
+        self._audio_jump = False
+        self._decoding_video = False  # Decode workers still taking playlist items
+        self._decoding_audio = False
+        self._audio_wake = threading.Event()
+        self.keyframe_index: Dict[str, List[float]] = {}
+        self._keyframe_scans: Set[str] = set()
+        
+        # Pause state; devices stay open while paused
+        self.paused = False
+        self._resume_event = threading.Event()
+        self.pause_slate: Optional[np.ndarray] = None
+        
+        # Media metadata index and background probing
+        self.media_index: Optional[MediaIndex] = None
+        self.probe_pool: Optional[ProcessPoolExecutor] = None
+        self.probing: Dict[str, Future] = {}
+        self.invalid_media: Set[str] = set()
+        self._probe_lock = threading.Lock()
+        self.set_media_index(str(DEFAULT_INDEX_PATH))
+        
         # Callbacks for UI updates
         self.status_callbacks = []
         self.error_callbacks = []
+        self.probe_callbacks = []
+        self.preview_callbacks = []
         
         logger.info("VirtualAVEngine initialized")
     
     # ===== Core Methods =====
     
-    def load_media(self, paths: List[str]) -> Tuple[List[str], List[str]]:
+    def load_media(self, paths: List[str], parallel_scan: bool = False,
+                   progress_callback: Optional[Callable[[str], None]] = None) -> Tuple[List[str], List[str]]:
         """Load media files from the given paths.
         
+        Directories are walked once, classifying files by suffix as they
+        are found. Files are queued as soon as they are found, so playback
+        can start while a large directory is still being scanned.
+        
+        Returns without opening any file. Files that are new or changed since
+        they were last indexed are probed on a process pool; each result is
+        reported to the probe callbacks, and files that fail to open are
+        dropped from the queues.
+        
         Args:
             paths: List of file or directory paths to load media from
+            parallel_scan: Walk top-level subdirectories in parallel
+            progress_callback: Called with each entry as it is loaded
             
         Returns:
             Tuple of (loaded_paths, error_messages)
         """
         loaded = []
         errors = []
+        queued = []
+        
+        # Embedded soundtracks need ffmpeg to demux
+        demux_audio = self.video_audio and ffmpeg_available()
+        if self.video_audio and not demux_audio:
+            logger.warning("ffmpeg not found; soundtracks of video files will not be played")
+        
+        def add(kind: str, path: str):
+            queued.append((kind, path))
+            entry = f"{'Video' if kind == VIDEO else 'Audio'}: {path}"
+            loaded.append(entry)
+            if progress_callback:
+                try:
+                    progress_callback(entry)
+                except Exception as e:
+                    logger.error(f"Error in progress callback: {e}")
         
         for path in paths:
             path = str(Path(path).absolute())
@@ -76,53 +228,269 @@ class VirtualAVEngine:
             
             if path_obj.is_file():
                 if self._is_video_file(path):
-                    self.video_queue.append(path)
-                    loaded.append(f"Video: {path}")
+                    self.video_playlist.append(path)
+                    add(VIDEO, path)
                 elif self._is_audio_file(path):
-                    self.audio_queue.append(path)
-                    loaded.append(f"Audio: {path}")
+                    self.audio_playlist.append(path)
+                    add(AUDIO, path)
                 else:
                     errors.append(f"Unsupported file format: {path}")
             elif path_obj.is_dir():
                 # Recursively find all media files in directory
-                for ext in self.VIDEO_EXTS.union(self.AUDIO_EXTS):
-                    for file_path in path_obj.rglob(f"*{ext}"):
-                        file_path = str(file_path.absolute())
-                        if self._is_video_file(file_path):
-                            self.video_queue.append(file_path)
-                            loaded.append(f"Video: {file_path}")
-                        elif self._is_audio_file(file_path):
-                            self.audio_queue.append(file_path)
-                            loaded.append(f"Audio: {file_path}")
+                for kind, file_path in scan_media(path, self.VIDEO_EXTS, self.AUDIO_EXTS, parallel_scan):
+                    if kind == VIDEO:
+                        self.video_playlist.append(file_path)
+                    else:
+                        self.audio_playlist.append(file_path)
+                    add(kind, file_path)
             else:
                 errors.append(f"File or directory not found: {path}")
         
+        # Probe new or changed files in the background
+        self._submit_probes(queued)
+        
         # If we have video but no audio, or vice versa, notify
-        if self.video_queue and not self.audio_queue:
+        if self.video_playlist and not self.audio_playlist and not demux_audio:
             logger.warning("Video files loaded but no audio files found")
-        elif self.audio_queue and not self.video_queue:
+        elif self.audio_playlist and not self.video_playlist:
             logger.warning("Audio files loaded but no video files found")
         
         return loaded, errors
     
+    def _plays_soundtracks(self) -> bool:
+        """Whether audio comes from the soundtracks of the video queue instead of the audio playlist.
+        
+        Each soundtrack plays alongside its own video, whatever the order or
+        navigation, so loose audio files are left out while this is on. If
+        none of the videos has a soundtrack, the audio files play instead.
+        """
+        if not (self.video_audio and self.video_playlist and ffmpeg_available()):
+            return False
+        if not self.audio_playlist:
+            return True
+        
+        if any(self._has_soundtrack(path) for path in self.video_playlist):
+            logger.warning("Audio files are not played while video soundtracks are enabled")
+            return True
+        logger.info("Loaded videos have no soundtracks; playing the audio files instead")
+        return False
+    
+    def _has_soundtrack(self, path: str) -> bool:
+        """Whether the video ``path`` has an audio stream, from the media index or a quick probe."""
+        info = self.get_media_info(path)
+        if info is not None:
+            return info.audio_codec is not None or info.samplerate is not None
+        probed = probe_media(path)
+        return bool(probed and probed['audio'])
+    
     def start_streaming(self):
         """Start both video and audio streaming."""
-        if not self.video_playing and self.video_queue:
-            self._start_video_stream()
+        if not self.video_playing and not self.audio_playing:
+            self.media_clock.reset()
+            self.soundtrack_queue = queue.Queue() if self._plays_soundtracks() else None
+            self._audio_item = None
+            self._video_item = None
+            self._soundtrack_anchor = None
+            self._soundtrack_failed = None
         
-        if not self.audio_playing and self.audio_queue:
+        # Audio first, so video finds it running and waits for each soundtrack
+        if not self.audio_playing and (self.soundtrack_queue or self.audio_playlist.has_next()):
             self._start_audio_stream()
+        
+        if not self.video_playing and self.video_playlist.has_next():
+            self._start_video_stream()
     
     def stop_streaming(self):
         """Stop both video and audio streaming."""
+        self.paused = False
+        self._resume_event.set()
         self._stop_video_stream()
         self._stop_audio_stream()
     
+    def pause(self):
+        """Pause playback at the current position, keeping devices open.
+        
+        The virtual camera keeps receiving the held frame (or the pause
+        slate) at ``PAUSE_REFRESH_FPS`` and the audio output plays silence,
+        so ``resume`` continues instantly from the same position.
+        """
+        if self.paused or not (self.video_playing or self.audio_playing):
+            return
+        
+        self._resume_event.clear()
+        self.paused = True
+        self.media_clock.pause()
+        self._video_retime.set()
+        self._notify_status("Playback paused")
+    
+    def resume(self):
+        """Resume paused playback."""
+        if not self.paused:
+            return
+        
+        self.media_clock.resume()
+        self.paused = False
+        self._resume_event.set()
+        self._notify_status("Playback resumed")
+    
+    def toggle_pause(self):
+        """Pause if playing, resume if paused, otherwise start streaming."""
+        if self.paused:
+            self.resume()
+        elif self.video_playing or self.audio_playing:
+            self.pause()
+        else:
+            self.start_streaming()
+    
+    def next_media(self):
+        """Skip to the next item of the video and audio playlists."""
+        self._navigate(lambda playlist: playlist.advance())
+    
+    def previous_media(self):
+        """Go back to the previous item of the video and audio playlists."""
+        self._navigate(lambda playlist: playlist.previous())
+    
+    def play_media(self, path: str):
+        """Start playing from ``path``, in whichever playlists contain it."""
+        self._navigate(lambda playlist: playlist.jump_to(path), restart=True)
+    
+    def _navigate(self, move: Callable[[Playlist], object], restart: bool = False):
+        """Move the playlist cursors and play on from the new current items.
+        
+        While streaming, devices stay open: as for a seek, the decode
+        workers drop what they had buffered and start over on the new
+        items, and paused playback resumes. Otherwise streaming starts only
+        if ``restart`` is set.
+        """
+        streaming = self.video_playing or self.audio_playing
+        if self.paused:
+            self.resume()
+        
+        with self._seek_lock:
+            self._video_seek = None
+            self._audio_seek = None
+            for playlist in (self.video_playlist, self.audio_playlist):
+                move(playlist)
+            
+            # A worker that already ran out of items cannot take the jump
+            if not streaming:
+                in_place = True
+            elif self.soundtrack_queue is not None:
+                in_place = self._decoding_video  # Soundtracks follow the decoder
+            else:
+                in_place = (self._decoding_video or not self.video_playing) and \
+                           (self._decoding_audio or not self.audio_playing)
+            if in_place:
+                self._video_jump = self._decoding_video
+                self._audio_jump = self._decoding_audio
+        self._audio_wake.set()
+        self._video_retime.set()
+        
+        if not in_place:
+            self.stop_streaming()
+        if streaming or restart:
+            self.start_streaming()
+    
+    def seek(self, seconds: float, exact: bool = True):
+        """Jump to ``seconds`` into the current video and audio items.
+        
+        Devices stay open: the decode workers reposition their sources and
+        drop what they had buffered. With ffmpeg installed a video seek
+        starts decoding at the keyframe before the target and decodes
+        forward only to it. With ``exact`` False the target snaps to the
+        nearest keyframe, so nothing needs decoding past the keyframe, which
+        keeps scrubbing cheap. Until a file's keyframes have been listed in
+        the background, its seeks are not snapped.
+        """
+        if seconds < 0:
+            raise ValueError("Seek position cannot be negative")
+        
+        path = self.video_playlist.current
+        if not exact and path:
+            seconds = self._nearest_keyframe(path, seconds)
+        
+        with self._seek_lock:
+            self._seeks += 1
+            pending = (seconds, self._seeks)
+            if self.video_playing or self.video_playlist.has_next():
+                self._video_seek = pending
+            if self.audio_playing or self.audio_playlist.has_next() or \
+                    (self.video_audio and self.video_playlist.has_next()):
+                self._audio_seek = pending
+        self._audio_wake.set()
+        self._video_retime.set()
+        logger.info(f"Seek to {seconds:.3f}s")
+    
+    def _take_video_seek(self, tag: FrameTag) -> Optional[FrameTag]:
+        """Clear the pending video seek and return ``tag`` moved to it; None if no seek is pending."""
+        if self._video_seek is None:
+            return None
+        with self._seek_lock:
+            pending, self._video_seek = self._video_seek, None
+        if pending is None:
+            return None
+        target, number = pending
+        return tag._replace(start=target, seek=number)
+    
+    def _take_audio_seek(self) -> Optional[Tuple[float, int]]:
+        """Return and clear the pending audio seek as ``(target, seek number)``."""
+        if self._audio_seek is None:
+            return None
+        with self._seek_lock:
+            pending, self._audio_seek = self._audio_seek, None
+        return pending
+    
+    def _keyframes(self, path: str) -> Optional[List[float]]:
+        """Keyframe times of ``path`` from memory or the media index.
+        
+        Load-time probes skip keyframes, since listing them reads the whole
+        file. If they are not known yet, they are listed on a background
+        thread and None is returned meanwhile.
+        """
+        keyframes = self.keyframe_index.get(path)
+        if keyframes is None:
+            info = self.get_media_info(path)
+            if info and info.keyframes:
+                keyframes = self.keyframe_index[path] = info.keyframes
+            else:
+                self._scan_keyframes(path)
+        return keyframes
+    
+    def _scan_keyframes(self, path: str):
+        """List the keyframes of ``path`` with ffprobe on a background thread, once."""
+        with self._seek_lock:
+            if path in self._keyframe_scans:
+                return
+            self._keyframe_scans.add(path)
+        
+        def scan():
+            keyframes = probe_keyframes(path)
+            if not keyframes:
+                return  # Seeks on this file stay unsnapped
+            self.keyframe_index[path] = keyframes
+            info = self.get_media_info(path)
+            if info:
+                info.keyframes = keyframes
+                self.media_index.put(info)
+            logger.debug(f"Listed {len(keyframes)} keyframes of {path}")
+        
+        threading.Thread(target=scan, daemon=True).start()
+    
+    def _nearest_keyframe(self, path: str, seconds: float) -> float:
+        """Snap ``seconds`` to the closest keyframe of ``path``, if keyframes are known."""
+        keyframes = self._keyframes(path)
+        if not keyframes:
+            return seconds
+        
+        index = bisect.bisect_left(keyframes, seconds)
+        candidates = keyframes[max(index - 1, 0):index + 1]
+        return min(candidates, key=lambda keyframe: abs(keyframe - seconds))
+    
     # ===== Video Methods =====
     
     def _start_video_stream(self):
         """Start the video streaming thread."""
-        if self.video_playing or not self.video_queue:
+        if self.video_playing or not self.video_playlist.has_next():
             return
         
         self.video_stop_event.clear()
@@ -137,15 +505,14 @@ class VirtualAVEngine:
             return
         
         self.video_stop_event.set()
+        self._video_retime.set()
+        if self.frame_buffer:
+            self.frame_buffer.close()
         if self.video_thread and self.video_thread.is_alive():
             self.video_thread.join(timeout=2.0)
         
-        if self.virtual_cam:
-            try:
-                self.virtual_cam.close()
-            except Exception as e:
-                logger.error(f"Error closing virtual camera: {e}")
-            self.virtual_cam = None
+        self.video_sink.close()
+        self.preview.clear()
         
         if self.video_capture:
             self.video_capture.release()
@@ -155,41 +522,237 @@ class VirtualAVEngine:
         self._notify_status("Video streaming stopped")
     
     def _video_stream_worker(self):
-        """Worker thread for streaming video frames."""
+        """Worker thread for streaming video frames.
+        
+        Acts as the pacing thread: ``video_sink`` (the virtual camera by
+        default) is opened once with ``output_profile`` and stays open for
+        the whole queue. Frames are decoded ahead of time by
+        ``_video_decode_worker`` into ``frame_buffer`` and this loop only
+        sends them and sleeps until the next frame is due.
+        """
         try:
-            import pyvirtualcam
+            sink = self.video_sink
             
-            while not self.video_stop_event.is_set() and self.video_queue:
-                self.current_video_path = self.video_queue.pop(0)
+            try:
+                profile = sink.open(self.output_profile)
+                self.active_profile = profile
+                
+                logger.info(
+                    f"{type(sink).__name__} opened ({profile.width}x{profile.height} "
+                    f"@ {profile.fps}fps, {profile.pixel_format})"
+                )
+                
+                # Start decoding the queue ahead into the ring buffer
+                self.frame_buffer = FrameRingBuffer(self.frame_buffer_depth, profile.frame_shape)
+                self.video_decode_thread = threading.Thread(
+                    target=self._video_decode_worker,
+                    args=(self.frame_buffer, profile),
+                    daemon=True
+                )
+                self.video_decode_thread.start()
+                
+                # Main pacing loop
+                self._pace_video(self.frame_buffer, profile)
+                
+            except ImportError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in video stream: {e}")
+                self._notify_error(f"Video error: {str(e)}")
+            
+            finally:
+                if self.frame_buffer:
+                    self.frame_buffer.close()
+                if self.video_decode_thread:
+                    self.video_decode_thread.join(timeout=2.0)
+                    self.video_decode_thread = None
+                
+                sink.close()
+            
+        except ImportError as e:
+            error_msg = f"{e.name} not installed. Video output will not work."
+            logger.error(error_msg)
+            self._notify_error(error_msg)
+        
+        self.video_playing = False
+        self._notify_status("Video streaming ended")
+    
+    def _pace_video(self, buffer: FrameRingBuffer, profile: OutputProfile):
+        """Send buffered frames on time according to the media clock.
+        
+        Each frame is presented at its media position on the session
+        timeline. While an item's soundtrack plays, that position is
+        anchored to where the audio worker started (or last seeked) the
+        soundtrack, so every clip lines up with its own audio however long
+        earlier clips and device reopens took; a clip waits for its
+        soundtrack to start. Otherwise frames follow on from the previous
+        one. When audio drives the clock, video that falls behind by more
+        than ``av_sync_tolerance`` drops frames to catch up, and video that
+        runs ahead holds (repeats) the current frame until audio catches up.
+        """
+        clock = self.media_clock
+        interval = profile.frame_interval
+        tag: Optional[FrameTag] = None
+        media_zero = 0.0  # Session time of media position 0 of the current item
+        segment_frame = 0
+        next_pts = None
+        last_send = None
+        self.av_offset = None
+        slate = self._fit_pause_slate(profile)
+        
+        while not self.video_stop_event.is_set():
+            frame = buffer.acquire_read(timeout=interval)
+            if frame is None:
+                if buffer.finished:
+                    break
+                continue
+            self._video_retime.clear()
+            
+            if self.paused:
+                if not self._hold_paused_frame(frame if slate is None else slate):
+                    buffer.release_read()
+                    break
+                last_send = None
+            
+            # New item or seek: continue the timeline, or wait for the soundtrack
+            if buffer.read_tag != tag:
+                tag = buffer.read_tag
+                segment_frame = 0
+                media_zero = (clock.now() if next_pts is None else next_pts) - tag.start
+                self._video_item = tag.item
+                self._wait_for_soundtrack(tag.item)
+            
+            # Only the soundtrack segment these frames belong to moves them
+            anchor = self._soundtrack_anchor
+            if anchor and anchor[:2] == (tag.item, tag.seek):
+                media_zero = anchor[2]
+            pts = media_zero + tag.start + segment_frame * interval
+            segment_frame += 1
+            next_pts = pts + interval
+            
+            # Late: drop this frame if a newer one is already waiting
+            delay = pts - clock.now()
+            if delay < -self.av_sync_tolerance:
+                self.video_frames_late.inc()
+                if buffer.fill_level > 1:
+                    buffer.release_read()
+                    self.video_frames_dropped.inc()
+                    continue
+            
+            # Early: hold the previous frame on screen until this one is due,
+            # unless a seek, pause, jump or stop makes it stale meanwhile
+            if delay > 0:
+                if delay > interval + self.av_sync_tolerance:
+                    self.video_frames_repeated.inc(int(delay / interval))
+                if self._video_retime.wait(delay):
+                    buffer.release_read()
+                    if self.video_stop_event.is_set():
+                        break
+                    continue
+            
+            send_start = time.perf_counter()
+            self.video_sink.send(frame)
+            now = time.perf_counter()
+            if self.preview.publish(frame, profile):
+                self._notify_preview(self.preview.sequence)
+            buffer.release_read()
+            
+            self.video_send_latency.observe(now - send_start)
+            self.video_frames_sent.inc()
+            self.video_send_rate.mark()
+            if last_send is not None:
+                self.video_frame_interval.observe(now - last_send)
+            
+            # With the soundtrack as anchor this is the offset between what
+            # is seen and heard; otherwise how far video runs ahead of the clock
+            if clock.audio_master:
+                self.av_offset = pts - clock.now()
+            
+            # Measure the output gap whenever a new clip starts
+            if tag.path != self.current_video_path:
+                if last_send is not None:
+                    self._record_clip_gap(now - last_send)
+                self.current_video_path = tag.path
+            last_send = now
+    
+    def _wait_for_soundtrack(self, item: int):
+        """Hold the video until the audio worker has started the soundtrack of ``item``.
+        
+        Returns early if soundtracks are off, audio stops, or the audio
+        worker moved past ``item`` or gave up on its soundtrack (e.g. it
+        failed to open); the clip then plays on the clock alone.
+        """
+        if self.soundtrack_queue is None:
+            return
+        while self.audio_playing and not self.video_stop_event.is_set():
+            anchor = self._soundtrack_anchor
+            if anchor and anchor[0] >= item:
+                return
+            audio_item, failed = self._audio_item, self._soundtrack_failed
+            if (audio_item is not None and audio_item > item) or (failed is not None and failed >= item):
+                return
+            self.video_stop_event.wait(0.005)
+    
+    def _hold_paused_frame(self, frame: np.ndarray) -> bool:
+        """Resend ``frame`` at ``PAUSE_REFRESH_FPS`` until playback resumes.
+        
+        Returns:
+            False if streaming was stopped instead
+        """
+        while self.paused and not self.video_stop_event.is_set():
+            self.video_sink.send(frame)
+            if self.preview.publish(frame, self.active_profile):
+                self._notify_preview(self.preview.sequence)
+            self._resume_event.wait(1 / self.PAUSE_REFRESH_FPS)
+        return not self.video_stop_event.is_set()
+    
+    def _fit_pause_slate(self, profile: OutputProfile) -> Optional[np.ndarray]:
+        """Scale the pause slate into ``profile``, if one is set."""
+        if self.pause_slate is None:
+            return None
+        
+        height, width = self.pause_slate.shape[:2]
+        slate = np.empty(profile.frame_shape, dtype=np.uint8)
+        FrameFitter(width, height, profile).fit(self.pause_slate, slate)
+        return slate
+    
+    def _video_decode_worker(self, buffer: FrameRingBuffer, profile: OutputProfile):
+        """Worker thread that decodes the video queue ahead of the pacing loop.
+        
+        Every clip is scaled or letterboxed into ``profile`` and converted to
+        its frame rate by repeating or skipping source frames, so the pacing
+        loop sees one continuous stream. The next queue item is opened and
+        prerolled in the background near the end of each clip.
+        """
+        prefetcher = ClipPrefetcher(self.PREROLL_FRAMES)
+        try:
+            path = self._next_video_path(buffer, first=True)
+            while path and not self.video_stop_event.is_set():
+                clip = None
+                tag = self._start_item(path)
                 
                 try:
-                    self.video_capture = cv2.VideoCapture(self.current_video_path)
-                    if not self.video_capture.isOpened():
-                        raise IOError(f"Could not open video file: {self.current_video_path}")
-                    
-                    # Get video properties
-                    width = int(self.video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
-                    height = int(self.video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                    fps = self.video_capture.get(cv2.CAP_PROP_FPS)
-                    
-                    # Initialize virtual camera
-                    self.virtual_cam = pyvirtualcam.Camera(width=width, height=height, fps=fps)
-                    
-                    logger.info(f"Streaming video: {self.current_video_path} ({width}x{height} @ {fps}fps)")
+                    cached = self.loop_cache.lookup(path, profile) if self.video_loop else None
+                    disk_cached = None
+                    if not cached and self.disk_cache:
+                        disk_cached = self.disk_cache.lookup(path, profile)
                     
-                    # Main video loop
-                    while not self.video_stop_event.is_set():
-                        ret, frame = self.video_capture.read()
-                        if not ret:
-                            if self.video_loop and self.video_queue:
-                                self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                                continue
-                            break
+                    if cached:
+                        if not self._play_cached_clip(cached, buffer, tag, profile):
+                            break  # Buffer closed
+                    elif disk_cached:
+                        if not self._play_disk_cached_clip(disk_cached, buffer, tag, profile):
+                            break  # Buffer closed
+                    else:
+                        clip = prefetcher.take(path) or open_clip(path)
+                        self.video_capture = clip.capture
                         
-                        # Convert BGR to RGB
-                        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        self.virtual_cam.send(frame_rgb)
-                        self.virtual_cam.sleep_until_next_frame()
+                        logger.info(f"Streaming video: {path} ({clip.width}x{clip.height} @ {clip.fps}fps)")
+                        
+                        fitter = FrameFitter(clip.width, clip.height, profile)
+                        rate_ratio = profile.fps / clip.fps if clip.fps > 0 else 1.0
+                        if not self._decode_clip(clip, buffer, fitter, rate_ratio, prefetcher, profile, tag):
+                            break  # Buffer closed
                     
                 except Exception as e:
                     logger.error(f"Error in video stream: {e}")
@@ -197,34 +760,290 @@ class VirtualAVEngine:
                     time.sleep(1)  # Prevent tight loop on error
                 
                 finally:
-                    if self.video_capture:
-                        self.video_capture.release()
-                        self.video_capture = None
-                    
-                    if self.virtual_cam:
-                        self.virtual_cam.close()
-                        self.virtual_cam = None
-                    
-                    # If looping, add the video back to the queue
-                    if self.video_loop and self.current_video_path:
-                        self.video_queue.append(self.current_video_path)
+                    self.video_capture = None
+                    if clip:
+                        clip.release()
                 
-                if not self.video_loop:
+                if self.video_stop_event.is_set():
                     break
+                path = self._next_video_path(buffer)
+        
+        finally:
+            with self._seek_lock:
+                self._decoding_video = False
+            prefetcher.cancel()
+            buffer.finish()
+            if self.soundtrack_queue is not None:
+                self.soundtrack_queue.put(None)
+    
+    def _next_video_path(self, buffer: FrameRingBuffer, first: bool = False) -> Optional[str]:
+        """Move the video playlist on and return the next file for the decode worker.
+        
+        After ``_navigate`` this is the new current item instead, and the
+        frames still buffered from the old one are dropped. Returns None
+        when the queue has ended.
+        """
+        playlist = self.video_playlist
+        with self._seek_lock:
+            jumped, self._video_jump = self._video_jump, False
+            if first:
+                path = playlist.current or playlist.advance()
+            else:
+                path = playlist.current if jumped else playlist.advance()
+            self._decoding_video = path is not None
+        
+        if jumped:
+            buffer.flush()
+            # Soundtracks of the items started so far are abandoned
+            self._soundtrack_floor = self._items_started
+            self._audio_wake.set()
+        return path
+    
+    def _decode_clip(self, clip: PreparedClip, buffer: FrameRingBuffer, fitter: FrameFitter,
+                     rate_ratio: float, prefetcher: ClipPrefetcher, profile: OutputProfile,
+                     tag: FrameTag) -> bool:
+        """Decode one clip into ``buffer``, starting with its preroll frames.
+        
+        ``rate_ratio`` is output fps divided by source fps; each source frame
+        is written that many times on average. The decoded frames are written
+        through to the disk cache if one is configured and, while looping,
+        recorded into the loop cache so later passes skip decoding. A lone
+        looping clip that cannot be cached is rewound in place instead.
+        
+        Returns:
+            False if the buffer was closed before the clip ended
+        """
+        lead_frames = int(self.PREFETCH_LEAD_SECONDS * clip.fps) if clip.fps > 0 else 0
+        prefetch_at = clip.frame_count - lead_frames if clip.frame_count > 0 else 0
+        preroll = iter(clip.frames)
+        frames_read = 0
+        credit = 0.0
+        # Decoder output buffer, reused for every frame after the preroll,
+        # unless frames need no fitting and are decoded into the ring slot
+        image: Optional[np.ndarray] = None
+        
+        recording: Optional[CachedClip] = None
+        if self.video_loop:
+            recording = self.loop_cache.start_recording(clip.path, profile, clip.frame_count, rate_ratio)
+        disk_writer: Optional[DiskCacheWriter] = None
+        if self.disk_cache:
+            disk_writer = self.disk_cache.start_writing(clip.path, profile, clip.frame_count, rate_ratio)
+        
+        try:
+            while not self.video_stop_event.is_set() and not self._video_jump:
+                seek_tag = self._take_video_seek(tag)
+                if seek_tag is not None:
+                    tag = seek_tag
+                    frames_read = self._seek_clip(clip, tag.start)
+                    preroll = iter(())
+                    credit = 0.0
+                    # The cached copy would no longer be contiguous
+                    if recording:
+                        self.loop_cache.discard(recording)
+                        recording = None
+                    if disk_writer:
+                        disk_writer.abort()
+                        disk_writer = None
+                    buffer.flush()
+                
+                frame = next(preroll, None)
+                target: Optional[np.ndarray] = None
+                if frame is None:
+                    if fitter.identity:
+                        target = buffer.acquire_write()
+                        if target is None:
+                            return False
+                    ret, frame = clip.capture.read(image if target is None else target)
+                    if ret:
+                        if frame is not target:
+                            image = frame
+                    else:
+                        cached = False
+                        if disk_writer:
+                            disk_writer.finish()
+                            disk_writer = None
+                            cached = True
+                        if recording:
+                            self.loop_cache.commit(recording)
+                            recording = None
+                            cached = True
+                        if not cached and self._repeats_in_place(clip.path):
+                            clip.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                            frames_read = 0
+                            tag = self._start_item(clip.path)
+                            continue
+                        return True
+                frames_read += 1
+                
+                # Get the next clip ready while this one plays out
+                if frames_read >= prefetch_at:
+                    next_path = self.video_playlist.peek_next()
+                    if next_path and next_path != clip.path and not self._is_cached(next_path, profile):
+                        prefetcher.prefetch(next_path)
+                
+                credit += rate_ratio
+                repeats = int(credit)
+                credit -= repeats
+                if repeats == 0:
+                    continue
+                
+                # A frame decoded in place is already in the first slot written
+                write = None if target is not None and frame is target else lambda dst: fitter.fit(frame, dst)
+                slot = self._emit_frame(buffer, write, repeats, tag)
+                if slot is None:
+                    return False
+                
+                if recording and not recording.append(slot, repeats):
+                    logger.info(f"Clip longer than reported, not caching: {clip.path}")
+                    self.loop_cache.discard(recording)
+                    recording = None
+                if disk_writer:
+                    disk_writer.append(slot, repeats)
+        
+        finally:
+            if recording:
+                self.loop_cache.discard(recording)
+            if disk_writer:
+                disk_writer.abort()
+        
+        return True
+    
+    def _play_cached_clip(self, cached: CachedClip, buffer: FrameRingBuffer, tag: FrameTag,
+                          profile: OutputProfile) -> bool:
+        """Feed a clip from the loop cache into ``buffer`` without decoding.
+        
+        Returns:
+            False if the buffer was closed before the clip ended
+        """
+        index = 0
+        while index < cached.count:
+            if self.video_stop_event.is_set() or self._video_jump:
+                break
             
-        except ImportError:
-            error_msg = "pyvirtualcam not installed. Virtual webcam will not work."
-            logger.error(error_msg)
-            self._notify_error(error_msg)
+            seek_tag = self._take_video_seek(tag)
+            if seek_tag is not None:
+                tag = seek_tag
+                index = self._cached_frame_at(cached.repeats[:cached.count], tag.start, profile)
+                buffer.flush()
+                continue
+            
+            if self._emit_frame(buffer, lambda dst: cached.read_into(index, dst),
+                                int(cached.repeats[index]), tag) is None:
+                return False
+            index += 1
         
-        self.video_playing = False
-        self._notify_status("Video streaming ended")
+        return True
+    
+    def _play_disk_cached_clip(self, cached: DiskCachedClip, buffer: FrameRingBuffer, tag: FrameTag,
+                               profile: OutputProfile) -> bool:
+        """Feed a memory-mapped clip into ``buffer`` as zero-copy slices.
+        
+        Returns:
+            False if the buffer was closed before the clip ended
+        """
+        index = 0
+        while index < len(cached):
+            if self.video_stop_event.is_set() or self._video_jump:
+                break
+            
+            seek_tag = self._take_video_seek(tag)
+            if seek_tag is not None:
+                tag = seek_tag
+                index = self._cached_frame_at(cached.repeats, tag.start, profile)
+                buffer.flush()
+                continue
+            
+            frame = cached.prefault(index)
+            for _ in range(int(cached.repeats[index])):
+                if buffer.acquire_write() is None:
+                    return False
+                buffer.commit_external(frame, tag)
+                self.video_frames_decoded.inc()
+                self.video_decode_rate.mark()
+            index += 1
+        
+        return True
+    
+    @staticmethod
+    def _cached_frame_at(repeats: np.ndarray, seconds: float, profile: OutputProfile) -> int:
+        """Index of the cached frame on screen ``seconds`` into a cached clip."""
+        return int(np.searchsorted(np.cumsum(repeats), seconds * profile.fps, side='right'))
+    
+    def _seek_clip(self, clip: PreparedClip, seconds: float) -> int:
+        """Reposition a clip that is being decoded at ``seconds``.
+        
+        With ffmpeg installed the clip switches to an ``FFmpegVideoReader``
+        started at the target; otherwise OpenCV's own seek is used.
+        
+        Returns:
+            Index of the next source frame
+        """
+        start = time.perf_counter()
+        if ffmpeg_available():
+            reader = FFmpegVideoReader(clip.path, clip.width, clip.height, clip.fps,
+                                       clip.frame_count, seconds)
+            clip.capture.release()
+            clip.capture = reader
+            self.video_capture = reader
+        else:
+            clip.capture.set(cv2.CAP_PROP_POS_MSEC, seconds * 1000)
+        
+        logger.debug(f"Seeked {clip.path} to {seconds:.3f}s in {(time.perf_counter() - start) * 1000:.1f}ms")
+        return int(seconds * clip.fps) if clip.fps > 0 else 0
+    
+    def _is_cached(self, path: str, profile: OutputProfile) -> bool:
+        """Check whether ``path`` can be played without decoding."""
+        if self.video_loop and self.loop_cache.contains(path, profile):
+            return True
+        return bool(self.disk_cache and self.disk_cache.contains(path, profile))
+    
+    def _emit_frame(self, buffer: FrameRingBuffer, write: Optional[Callable[[np.ndarray], None]],
+                    repeats: int, tag: FrameTag) -> Optional[np.ndarray]:
+        """Write one frame into ``repeats`` consecutive buffer slots.
+        
+        ``write`` fills the first slot (None if the frame was decoded into
+        it already); repeats are copied from it.
+        
+        Returns:
+            The first slot written, or None if the buffer was closed
+        """
+        first_slot = None
+        for _ in range(repeats):
+            slot = buffer.acquire_write()
+            if slot is None:
+                return None
+            
+            if first_slot is None:
+                if write:
+                    write(slot)
+                first_slot = slot
+            else:
+                np.copyto(slot, first_slot)  # Repeated frame
+            buffer.commit_write(tag)
+            self.video_frames_decoded.inc()
+            self.video_decode_rate.mark()
+        
+        return first_slot
+    
+    def _start_item(self, path: str) -> FrameTag:
+        """Number a new pass of ``path`` and queue its soundtrack, if soundtracks are on."""
+        item = self._items_started
+        self._items_started += 1
+        if self.soundtrack_queue is not None:
+            self.soundtrack_queue.put((item, path))
+        return FrameTag(item, path, 0.0)
+    
+    def _record_clip_gap(self, gap: float):
+        """Record the time between the last frame of one clip and the first of the next."""
+        self.clip_gap_last = gap
+        self.clip_gap_max = gap if self.clip_gap_max is None else max(self.clip_gap_max, gap)
+        logger.debug(f"Clip transition gap: {gap * 1000:.1f}ms")
     
     # ===== Audio Methods =====
     
     def _start_audio_stream(self):
         """Start the audio streaming thread."""
-        if self.audio_playing or not self.audio_queue:
+        if self.audio_playing or not (self.soundtrack_queue or self.audio_playlist.has_next()):
             return
         
         self.audio_stop_event.clear()
@@ -242,94 +1061,429 @@ class VirtualAVEngine:
         if self.audio_thread and self.audio_thread.is_alive():
             self.audio_thread.join(timeout=2.0)
         
-        if self.audio_stream:
-            try:
-                self.audio_stream.stop()
-                self.audio_stream.close()
-            except Exception as e:
-                logger.error(f"Error stopping audio stream: {e}")
-            self.audio_stream = None
+        self.audio_sink.close()
         
         self.audio_playing = False
-        self.audio_data = None
         self._notify_status("Audio streaming stopped")
     
     def _audio_stream_worker(self):
-        """Worker thread for streaming audio."""
+        """Worker thread for streaming audio.
+        
+        Plays the soundtrack of each video the decode worker starts, in the
+        same order, or otherwise the audio playlist. Files are decoded
+        incrementally into a preallocated chunk buffer, so
+        startup latency and memory use do not depend on file length. In
+        callback mode this thread only decodes into ``audio_ring`` and
+        ``audio_sink`` pulls from it; in blocking mode it writes chunks to
+        the sink itself.
+        """
+        chunk = np.zeros((self.AUDIO_CHUNK_FRAMES, OUTPUT_CHANNELS), dtype='float32')
+        self.audio_ring = AudioRingBuffer(self.AUDIO_BUFFER_FRAMES, OUTPUT_CHANNELS)
+        
         try:
-            while not self.audio_stop_event.is_set() and self.audio_queue:
-                self.current_audio_path = self.audio_queue.pop(0)
-                
+            self.current_audio_path = self._next_audio_path(first=True)
+            while self.current_audio_path and not self.audio_stop_event.is_set():
                 try:
-                    # Load audio file
-                    self.audio_data, self.audio_samplerate = sf.read(
-                        self.current_audio_path, 
-                        always_2d=True,  # Force stereo if mono
-                        dtype='float32'  # Required by sounddevice
+                    # Open audio file for streaming
+                    self.audio_source = open_audio(
+                        self.current_audio_path,
+                        self.AUDIO_CHUNK_FRAMES,
+                        video=self._is_video_file(self.current_audio_path)
                     )
+                    self.audio_samplerate = self.audio_source.samplerate
                     
-                    # Convert to interleaved format if needed
-                    if len(self.audio_data.shape) == 1:
-                        self.audio_data = np.column_stack((self.audio_data, self.audio_data))
-                    
-                    logger.info(f"Streaming audio: {self.current_audio_path} ({self.audio_samplerate}Hz, {len(self.audio_data)} samples)")
-                    
-                    # Start audio stream
-                    self.audio_stream = sd.OutputStream(
-                        samplerate=self.audio_samplerate,
-                        channels=2,  # Force stereo output
-                        dtype='float32',
-                        device='CABLE Input (VB-Audio Virtual Cable)'
-                    )
+                    logger.info(f"Streaming audio: {self.current_audio_path} ({self.audio_samplerate}Hz, {self.audio_source.frames} samples)")
                     
-                    self.audio_stream.start()
-                    
-                    # Main audio loop
-                    position = 0
-                    while not self.audio_stop_event.is_set() and position < len(self.audio_data):
-                        chunk_size = 1024  # Process in chunks to remain responsive
-                        chunk = self.audio_data[position:position + chunk_size]
-                        
-                        # Pad with zeros if needed (shouldn't happen with proper chunking)
-                        if len(chunk) < chunk_size:
-                            padding = np.zeros((chunk_size - len(chunk), 2), dtype='float32')
-                            chunk = np.vstack((chunk, padding))
-                        
-                        self.audio_stream.write(chunk)
-                        position += chunk_size
-                        
-                        # Small sleep to prevent CPU hogging
-                        time.sleep(0.001)
-                    
-                    # If we've reached the end and loop is enabled, add back to queue
-                    if self.audio_loop and position >= len(self.audio_data) and self.current_audio_path:
-                        self.audio_queue.append(self.current_audio_path)
+                    if self.audio_mode == 'callback':
+                        self._play_audio_callback(self.audio_source, chunk)
+                    else:
+                        self._play_audio_blocking(self.audio_source, chunk)
                     
                 except Exception as e:
                     logger.error(f"Error in audio stream: {e}")
                     self._notify_error(f"Audio error: {str(e)}")
+                    # Let the video of this item play without its soundtrack
+                    self._soundtrack_failed = self._audio_item
                     time.sleep(1)  # Prevent tight loop on error
                 
                 finally:
-                    if self.audio_stream:
-                        self.audio_stream.stop()
-                        self.audio_stream.close()
-                        self.audio_stream = None
+                    self.audio_sink.close()
+                    self.media_clock.detach_audio()
                     
-                    self.audio_data = None
+                    if self.audio_source:
+                        self.audio_source.close()
+                        self.audio_source = None
                 
-                if not self.audio_loop:
+                if self.audio_stop_event.is_set():
                     break
+                self.current_audio_path = self._next_audio_path()
             
         except Exception as e:
             logger.error(f"Fatal error in audio worker: {e}")
             self._notify_error(f"Fatal audio error: {str(e)}")
         
+        with self._seek_lock:
+            self._decoding_audio = False
         self.audio_playing = False
         self._notify_status("Audio streaming ended")
     
+    def _next_audio_path(self, first: bool = False) -> Optional[str]:
+        """Return the next file for the audio worker; None when there is nothing left.
+        
+        After ``_navigate`` this is the new current item of the audio
+        playlist, or the soundtrack of the first video started since.
+        """
+        soundtracks = self.soundtrack_queue
+        if soundtracks is None:
+            playlist = self.audio_playlist
+            with self._seek_lock:
+                jumped, self._audio_jump = self._audio_jump, False
+                if first:
+                    path = playlist.current or playlist.advance()
+                else:
+                    path = playlist.current if jumped else playlist.advance()
+                self._decoding_audio = path is not None
+            return path
+        
+        # Wait for the decode worker to start its next video
+        while not self.audio_stop_event.is_set():
+            try:
+                entry = soundtracks.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if entry is None:
+                return None
+            if entry[0] < self._soundtrack_floor:
+                continue  # Started before the last jump
+            self._audio_item, path = entry
+            return path
+        return None
+    
+    def _audio_jumped(self) -> bool:
+        """Whether ``_navigate`` moved audio off the file being played."""
+        if self.soundtrack_queue is not None:
+            return self._audio_item is not None and self._audio_item < self._soundtrack_floor
+        return self._audio_jump
+    
+    def _wait_for_video(self) -> bool:
+        """Hold a soundtrack until the pacing loop reaches its video.
+        
+        Soundtracks that are shorter or longer than their video would
+        otherwise start the next item's audio early or late.
+        
+        Returns:
+            False if the video has already moved past this item, or audio
+            was stopped, so the soundtrack should be skipped
+        """
+        item = self._audio_item
+        if self.soundtrack_queue is None or item is None:
+            return True
+        while self.video_playing and not self.audio_stop_event.is_set() and not self._audio_jumped():
+            video_item = self._video_item
+            if video_item is not None and video_item >= item:
+                return video_item == item
+            self.audio_stop_event.wait(0.005)
+        return not self.audio_stop_event.is_set() and not self._audio_jumped()
+    
+    def _anchor_soundtrack(self, base: float, played: int, samplerate: int, position: float,
+                           seek: int = 0):
+        """Publish where media position 0 of the playing soundtrack falls on the session clock.
+        
+        Args:
+            base: Clock time of the first sample handed to the sink
+            played: Samples handed to the sink before the one at ``position``
+            samplerate: Sample rate of the source
+            position: Media position (seconds) of that sample
+            seek: Number of the seek that moved the source to ``position``;
+                0 from the start of the item
+        """
+        if self.soundtrack_queue is not None and self._audio_item is not None:
+            self._soundtrack_anchor = (self._audio_item, seek, base + played / samplerate - position)
+    
+    def _play_audio_blocking(self, source: AudioSource, chunk: np.ndarray) -> bool:
+        """Play ``source`` with blocking sink writes.
+        
+        Returns:
+            True if the source played to the end
+        """
+        if not self._wait_for_video():
+            return False
+        
+        sink = self.audio_sink
+        sink.open(source.samplerate, OUTPUT_CHANNELS)  # Force stereo output
+        base = self.media_clock.attach_audio()
+        self._anchor_soundtrack(base, 0, source.samplerate, 0.0)
+        
+        written = 0
+        while not self.audio_stop_event.is_set() and not self._audio_jumped():
+            if self.paused:
+                # Keep the sink fed with silence without advancing the source
+                chunk.fill(0)
+                sink.write(chunk)
+                self.media_clock.update_audio(written / source.samplerate, sink.latency)
+                continue
+            
+            seek = self._seek_audio_source(source)
+            if seek is not None:
+                self._anchor_soundtrack(base, written, source.samplerate, *seek)
+            count = source.read_into(chunk)
+            if count == 0:
+                return True
+            
+            # Pad the last chunk with silence
+            if count < len(chunk):
+                chunk[count:] = 0
+            
+            sink.write(chunk)
+            
+            # The chunk just queued starts playing after the sink latency
+            self.media_clock.update_audio(written / source.samplerate, sink.latency)
+            written += count
+            
+            # Small sleep to prevent CPU hogging
+            time.sleep(0.001)
+        
+        return False
+    
+    def _play_audio_callback(self, source: AudioSource, chunk: np.ndarray) -> bool:
+        """Play ``source`` through the sink callback, decoding into ``audio_ring``.
+        
+        Returns:
+            True if the source played to the end
+        """
+        ring = self.audio_ring
+        ring.reset()
+        
+        # Poll interval for a full ring: a quarter of its duration
+        wait = ring.capacity / source.samplerate / 4
+        
+        def fill() -> bool:
+            """Decode until the ring is full; False at end of file."""
+            while ring.free >= len(chunk):
+                count = source.read_into(chunk)
+                if count == 0:
+                    return False
+                ring.write(chunk[:count])
+            return True
+        
+        # Prefill before the sink starts pulling
+        start = self._seek_audio_source(source)
+        more = fill()
+        if not self._wait_for_video():
+            return False
+        base = self.media_clock.attach_audio()
+        self._anchor_soundtrack(base, 0, source.samplerate, *(start or (0.0, 0)))
+        
+        self.audio_sink.open(source.samplerate, OUTPUT_CHANNELS, callback=self._audio_callback)
+        
+        # Keep the ring topped up, then let the sink drain what is left
+        while not self.audio_stop_event.is_set() and not self._audio_jumped():
+            seek = self._seek_audio_source(source)
+            if seek is not None:
+                ring.discard()
+                self._anchor_soundtrack(base, ring.frames_played, source.samplerate, *seek)
+                more = True
+            if more:
+                more = fill()
+                ring.end_of_stream = not more
+            elif ring.available == 0:
+                break
+            
+            # Woken early by seeks and jumps
+            self._audio_wake.wait(wait)
+            self._audio_wake.clear()
+        
+        return not self.audio_stop_event.is_set() and not self._audio_jumped()
+    
+    def _seek_audio_source(self, source: AudioSource) -> Optional[Tuple[float, int]]:
+        """Apply a pending seek to ``source``.
+        
+        Returns:
+            The position (seconds) the source was moved to and the seek
+            number, or None if no seek was pending
+        """
+        pending = self._take_audio_seek()
+        if pending is None:
+            return None
+        
+        target, number = pending
+        frame = int(target * source.samplerate)
+        if source.frames > 0:
+            frame = min(frame, source.frames)
+        source.seek(frame)
+        return frame / source.samplerate, number
+    
+    def _audio_callback(self, outdata: np.ndarray, latency: float, underflow: bool, overflow: bool):
+        """Audio sink pull callback; must not block or allocate sample memory."""
+        ring = self.audio_ring
+        if underflow:
+            ring.device_underflows += 1
+            self.audio_device_underflows.inc()
+        if overflow:
+            ring.overruns += 1
+        
+        played = ring.frames_played
+        if self.paused:
+            outdata.fill(0)  # Hold the position; the stream keeps running
+        elif ring.read_into(outdata) < len(outdata) and not ring.end_of_stream:
+            self.audio_underruns.inc()
+        
+        # Drive the media clock from what the sink is about to play
+        self.media_clock.update_audio(played / self.audio_samplerate, latency)
+    
+    # ===== Media Index Methods =====
+    
+    def _submit_probes(self, files: List[Tuple[str, str]]):
+        """Probe ``(kind, path)`` pairs missing from the media index on the process pool."""
+        if not files:
+            return
+        
+        kinds = {path: kind for kind, path in files}
+        stale = self.media_index.stale(kinds) if self.media_index else list(kinds)
+        
+        submitted = []
+        with self._probe_lock:
+            for path in stale:
+                if path in self.probing:
+                    continue
+                
+                if not self.probe_pool:
+                    self.probe_pool = ProcessPoolExecutor(max_workers=self.PROBE_WORKERS)
+                future = self.probe_pool.submit(probe_file, path, kinds[path])
+                self.probing[path] = future
+                submitted.append((path, future))
+        
+        # A finished future runs its callback right away, which takes the lock
+        for path, future in submitted:
+            future.add_done_callback(lambda f, path=path: self._probe_done(path, f))
+    
+    def _probe_done(self, path: str, future: Future):
+        """Store a finished probe in the index, or drop the file if it failed."""
+        with self._probe_lock:
+            self.probing.pop(path, None)
+        
+        if future.cancelled():
+            return
+        
+        info = None
+        error = None
+        try:
+            info = future.result()
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        
+        if info:
+            self.invalid_media.discard(path)
+            if self.media_index:
+                try:
+                    self.media_index.put(info)
+                except Exception as e:
+                    logger.warning(f"Could not index {path}: {e}")
+        else:
+            # Found at load time instead of mid-stream
+            logger.warning(f"Dropping unreadable media {path}: {error}")
+            self.invalid_media.add(path)
+            self._remove_queued(path)
+        
+        self._notify_probe(path, info, error)
+    
+    def _remove_queued(self, path: str):
+        """Remove every occurrence of ``path`` from the video and audio playlists."""
+        self.video_playlist.remove(path)
+        self.audio_playlist.remove(path)
+    
+    def _shutdown_probes(self):
+        """Cancel pending probes and stop the probe pool."""
+        with self._probe_lock:
+            pool = self.probe_pool
+            self.probe_pool = None
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    # ===== Metrics Methods =====
+    
+    def _register_metrics(self):
+        """Create the engine's metrics in ``self.metrics``."""
+        metrics = self.metrics
+        
+        # Video, updated by the decode and pacing threads
+        self.video_frames_decoded = metrics.counter(
+            'video_frames_decoded_total', 'Frames decoded into the frame buffer')
+        self.video_decode_rate = metrics.rate('video_decode_fps', 'Frames decoded per second')
+        self.video_frames_sent = metrics.counter('video_frames_sent_total', 'Frames sent to the video sink')
+        self.video_send_rate = metrics.rate('video_send_fps', 'Frames sent per second')
+        self.video_frames_late = metrics.counter(
+            'video_frames_late_total', 'Frames due longer ago than the A/V sync tolerance')
+        self.video_frames_dropped = metrics.counter(
+            'video_frames_dropped_total', 'Late frames skipped to catch up with the clock')
+        self.video_frames_repeated = metrics.counter(
+            'video_frames_repeated_total', 'Frame slots the previous frame was held for')
+        self.video_send_latency = metrics.histogram(
+            'video_send_seconds', 'Time to hand one frame to the video sink', LATENCY_BUCKETS)
+        self.video_frame_interval = metrics.histogram(
+            'video_frame_interval_seconds', 'Time between consecutive frames sent', INTERVAL_BUCKETS)
+        metrics.gauge('video_buffer_fill_ratio', 'Fraction of the frame buffer holding decoded frames',
+                      lambda: self.frame_buffer.fill_level / self.frame_buffer.depth if self.frame_buffer else None)
+        metrics.gauge('video_queue_depth', 'Videos left to play after the current one',
+                      self.video_playlist.remaining)
+        
+        # Audio, updated by the output callback
+        self.audio_underruns = metrics.counter(
+            'audio_underruns_total', 'Audio callbacks that found the ring buffer short')
+        self.audio_device_underflows = metrics.counter(
+            'audio_device_underflows_total', 'Output underflows reported by the audio sink')
+        metrics.gauge('audio_buffer_fill_ratio', 'Fraction of the audio ring buffer holding decoded audio',
+                      lambda: self.audio_ring.available / self.audio_ring.capacity if self.audio_ring else None)
+        metrics.gauge('audio_queue_depth', 'Audio files left to play after the current one',
+                      self.audio_playlist.remaining)
+        
+        metrics.gauge('av_offset_seconds', 'Video presentation time minus the audio clock',
+                      lambda: self.av_offset)
+    
+    def set_metrics_server(self, port: Optional[int], host: str = '127.0.0.1'):
+        """Serve Prometheus metrics over HTTP on ``port`` (None to stop)."""
+        if self.metrics_server:
+            self.metrics_server.close()
+            self.metrics_server = None
+        
+        if port is not None:
+            self.metrics_server = MetricsServer(self.metrics, port, host)
+            logger.info(f"Serving metrics on http://{host}:{self.metrics_server.port}/metrics")
+    
+    def set_metrics_file(self, path: Optional[str], interval: float = 5.0):
+        """Write Prometheus metrics to ``path`` every ``interval`` seconds (None to stop)."""
+        self._metrics_file_stop.set()
+        if self._metrics_file_thread:
+            self._metrics_file_thread.join(timeout=2.0)
+            self._metrics_file_thread = None
+        
+        if path:
+            self._metrics_file_stop = threading.Event()
+            self._metrics_file_thread = threading.Thread(
+                target=self._metrics_file_worker,
+                args=(path, interval, self._metrics_file_stop),
+                daemon=True
+            )
+            self._metrics_file_thread.start()
+            logger.info(f"Writing metrics to {path} every {interval:g}s")
+    
+    def _metrics_file_worker(self, path: str, interval: float, stop: threading.Event):
+        """Worker thread for ``set_metrics_file``."""
+        while True:
+            try:
+                self.metrics.write_textfile(path)
+            except OSError as e:
+                logger.error(f"Error writing metrics to {path}: {e}")
+            if stop.wait(interval):
+                break
+    
     # ===== Helper Methods =====
     
+    def _repeats_in_place(self, path: str) -> bool:
+        """Whether the video playlist would play ``path`` again right after itself."""
+        playlist = self.video_playlist
+        return playlist.repeat != REPEAT_OFF and playlist.peek_next() == path
+    
     def _is_video_file(self, path: str) -> bool:
         """Check if the given path points to a supported video file."""
         return Path(path).suffix.lower() in self.VIDEO_EXTS
@@ -356,6 +1510,22 @@ class VirtualAVEngine:
             except Exception as e:
                 logger.error(f"Error in error callback: {e}")
     
+    def _notify_preview(self, sequence: int):
+        """Notify all registered preview callbacks."""
+        for callback in self.preview_callbacks:
+            try:
+                callback(sequence)
+            except Exception as e:
+                logger.error(f"Error in preview callback: {e}")
+    
+    def _notify_probe(self, path: str, info: Optional[MediaInfo], error: Optional[str]):
+        """Notify all registered probe callbacks."""
+        for callback in self.probe_callbacks:
+            try:
+                callback(path, info, error)
+            except Exception as e:
+                logger.error(f"Error in probe callback: {e}")
+    
     # ===== Public API =====
     
     def register_status_callback(self, callback: Callable[[str], None]):
@@ -368,14 +1538,221 @@ class VirtualAVEngine:
         if callback not in self.error_callbacks:
             self.error_callbacks.append(callback)
     
+    def register_probe_callback(self, callback: Callable[[str, Optional[MediaInfo], Optional[str]], None]):
+        """Register a callback for files probed in the background.
+        
+        Called from a pool thread with ``(path, info, error)``: ``info`` is
+        the probed ``MediaInfo``, or None with ``error`` set if the file
+        could not be opened.
+        """
+        if callback not in self.probe_callbacks:
+            self.probe_callbacks.append(callback)
+    
+    def register_preview_callback(self, callback: Callable[[int], None]):
+        """Register a callback for new preview frames.
+        
+        Called from the pacing thread with the frame's sequence number each
+        time ``preview`` publishes a frame, so a UI can redraw on demand
+        instead of polling. Must return quickly: read the frame with
+        ``preview.latest()`` from the UI thread, which is where it is
+        converted and scaled.
+        """
+        if callback not in self.preview_callbacks:
+            self.preview_callbacks.append(callback)
+    
+    def set_media_index(self, db_path: Optional[str]):
+        """Open the media metadata index at ``db_path``, or disable it with None."""
+        with self._probe_lock:
+            if self.media_index:
+                self.media_index.close()
+                self.media_index = None
+            
+            if db_path:
+                try:
+                    self.media_index = MediaIndex(db_path)
+                except Exception as e:
+                    logger.warning(f"Media index unavailable ({db_path}): {e}")
+    
+    def get_media_info(self, path: str) -> Optional[MediaInfo]:
+        """Return indexed metadata for ``path`` without opening it, if known and current."""
+        return self.media_index.get(path) if self.media_index else None
+    
+    def get_media_infos(self, paths: Iterable[str]) -> Dict[str, MediaInfo]:
+        """Return indexed metadata for every path in ``paths`` that is known and current."""
+        return self.media_index.get_many(paths) if self.media_index else {}
+    
     def set_video_loop(self, loop: bool):
         """Enable or disable video looping."""
         self.video_loop = loop
+        self.video_playlist.set_repeat(REPEAT_ALL if loop else REPEAT_OFF)
         logger.info(f"Video loop {'enabled' if loop else 'disabled'}")
     
+    def set_frame_buffer_depth(self, depth: int):
+        """Set how many decoded frames are buffered ahead (applies to the next clip)."""
+        if depth < 2:
+            raise ValueError("Frame buffer depth must be at least 2")
+        self.frame_buffer_depth = depth
+        logger.info(f"Frame buffer depth set to {depth}")
+    
+    def set_loop_cache(self, budget_bytes: int, downscale: float = 1.0):
+        """Configure the in-memory cache used for looping clips (drops cached clips).
+        
+        Args:
+            budget_bytes: Maximum memory for decoded frames; 0 disables caching
+            downscale: Factor (0, 1] applied to cached frames to save memory
+        """
+        self.loop_cache = LoopCache(budget_bytes, downscale)
+        logger.info(f"Loop cache set to {budget_bytes / 2**20:.0f}MB (downscale {downscale})")
+    
+    def set_disk_cache(self, directory: Optional[str], budget_bytes: int = 0):
+        """Enable the on-disk raw frame cache, or disable it with ``directory=None``.
+        
+        Args:
+            directory: Directory for cached frame files
+            budget_bytes: Maximum total size of the cache
+        """
+        self.disk_cache = DiskFrameCache(directory, budget_bytes) if directory else None
+        if directory:
+            logger.info(f"Disk cache at {directory} ({budget_bytes / 2**30:.1f}GB)")
+        else:
+            logger.info("Disk cache disabled")
+    
+    def warm_disk_cache(self, paths: Optional[List[str]] = None):
+        """Decode videos into the disk cache in the background.
+        
+        Run ahead of a session so playback is served from the cache without
+        decoding. Defaults to every video in the queue.
+        """
+        if not self.disk_cache:
+            self._notify_error("Disk cache is not enabled")
+            return
+        if self.disk_cache_thread and self.disk_cache_thread.is_alive():
+            return
+        
+        paths = list(self.video_playlist if paths is None else paths)
+        self.disk_cache_thread = threading.Thread(
+            target=self._disk_cache_worker,
+            args=(self.disk_cache, paths, self._expected_profile()),
+            daemon=True
+        )
+        self.disk_cache_thread.start()
+    
+    def _expected_profile(self) -> OutputProfile:
+        """The profile frames are produced in: as negotiated last, or the first candidate."""
+        if self.active_profile and self.active_profile.with_format(self.output_profile.pixel_format) == self.output_profile:
+            return self.active_profile
+        return self.output_profile.with_format(self.output_profile.candidate_formats[0])
+    
+    def _disk_cache_worker(self, cache: DiskFrameCache, paths: List[str], profile: OutputProfile):
+        """Worker thread for ``warm_disk_cache``."""
+        cached = 0
+        for path in paths:
+            try:
+                if cache.build(path, profile):
+                    cached += 1
+            except Exception as e:
+                logger.error(f"Error caching {path}: {e}")
+                self._notify_error(f"Cache error: {str(e)}")
+        
+        self._notify_status(f"Disk cache ready ({cached}/{len(paths)} videos)")
+    
+    def set_output_profile(self, profile: OutputProfile):
+        """Set the virtual camera output profile (applies when streaming next starts)."""
+        self.output_profile = profile
+        logger.info(
+            f"Output profile set to {profile.width}x{profile.height} "
+            f"@ {profile.fps}fps ({profile.pixel_format})"
+        )
+    
+    def set_preview(self, enabled: bool, max_size: Optional[Tuple[int, int]] = None,
+                    pixel_format: Optional[str] = None, max_fps: Optional[float] = None):
+        """Publish sent frames to ``preview``, to be scaled to fit ``max_size`` (width, height) when read.
+        
+        Args:
+            enabled: Whether the pacing thread publishes frames
+            max_size: Size to fit, e.g. the preview widget's; None for the output size
+            pixel_format: Preview pixel format, 'BGR' or 'RGB'; None keeps the current one
+            max_fps: Most preview frames per second; None keeps the current limit
+        """
+        if pixel_format is not None:
+            if pixel_format not in PreviewTap.PIXEL_FORMATS:
+                raise ValueError(f"Unsupported preview pixel format: {pixel_format}")
+            self.preview.pixel_format = pixel_format
+        if max_fps is not None:
+            if max_fps <= 0:
+                raise ValueError("Preview frame rate must be positive")
+            self.preview.max_fps = max_fps
+        self.preview.max_size = max_size
+        self.preview.enabled = enabled
+        if not enabled:
+            self.preview.clear()
+    
+    def set_pause_slate(self, image_path: Optional[str]):
+        """Show the image at ``image_path`` while paused instead of the held frame (None to clear).
+        
+        Applies when streaming next starts.
+        """
+        if image_path is None:
+            self.pause_slate = None
+            logger.info("Pause slate cleared")
+            return
+        
+        image = cv2.imread(image_path)
+        if image is None:
+            self._notify_error(f"Could not read pause slate: {image_path}")
+            return
+        self.pause_slate = image
+        logger.info(f"Pause slate set to {image_path}")
+    
+    def set_av_sync_tolerance(self, seconds: float):
+        """Set how far video may lag the media clock before frames are dropped."""
+        if seconds < 0:
+            raise ValueError("Sync tolerance cannot be negative")
+        self.av_sync_tolerance = seconds
+        logger.info(f"A/V sync tolerance set to {seconds * 1000:.0f}ms")
+    
+    def set_video_audio(self, enabled: bool):
+        """Enable or disable playing the soundtracks of video files loaded from now on."""
+        self.video_audio = enabled
+        logger.info(f"Video soundtracks {'enabled' if enabled else 'disabled'}")
+    
+    def set_audio_mode(self, mode: str):
+        """Choose 'callback' or 'blocking' audio output (applies to the next file)."""
+        if mode not in self.AUDIO_MODES:
+            raise ValueError(f"Unknown audio mode: {mode}")
+        self.audio_mode = mode
+        logger.info(f"Audio mode set to {mode}")
+    
+    def set_video_sink(self, sink: VideoSink):
+        """Send video to ``sink`` instead of the virtual camera (applies when video streaming starts)."""
+        if self.video_playing:
+            raise RuntimeError("Cannot change the video sink while video is streaming")
+        self.video_sink = sink
+        logger.info(f"Video sink set to {type(sink).__name__}")
+    
+    def set_audio_sink(self, sink: AudioSink):
+        """Send audio to ``sink`` instead of the audio device (applies when audio streaming starts)."""
+        if self.audio_playing:
+            raise RuntimeError("Cannot change the audio sink while audio is streaming")
+        self.audio_sink = sink
+        logger.info(f"Audio sink set to {type(sink).__name__}")
+    
+    def set_shuffle(self, enabled: bool):
+        """Enable or disable shuffled playback order for both playlists."""
+        self.video_playlist.set_shuffle(enabled)
+        self.audio_playlist.set_shuffle(enabled)
+        logger.info(f"Shuffle {'enabled' if enabled else 'disabled'}")
+    
+    def clear_media(self):
+        """Stop streaming and empty both playlists."""
+        self.stop_streaming()
+        self.video_playlist.clear()
+        self.audio_playlist.clear()
+    
     def set_audio_loop(self, loop: bool):
         """Enable or disable audio looping."""
         self.audio_loop = loop
+        self.audio_playlist.set_repeat(REPEAT_ALL if loop else REPEAT_OFF)
         logger.info(f"Audio loop {'enabled' if loop else 'disabled'}")
     
     def get_status(self) -> dict:
@@ -384,14 +1761,49 @@ class VirtualAVEngine:
             'video': {
                 'playing': self.video_playing,
                 'current': self.current_video_path,
-                'queue_size': len(self.video_queue),
-                'loop': self.video_loop
+                'queue_size': self.video_playlist.remaining(),
+                'playlist_size': len(self.video_playlist),
+                'shuffle': self.video_playlist.shuffle,
+                'loop': self.video_loop,
+                'sink': type(self.video_sink).__name__,
+                'profile': self.output_profile.to_dict(),
+                'active_profile': self.active_profile.to_dict() if self.active_profile else None,
+                'clip_gap_ms': {
+                    'last': self.clip_gap_last * 1000 if self.clip_gap_last is not None else None,
+                    'max': self.clip_gap_max * 1000 if self.clip_gap_max is not None else None,
+                    'frame_interval': self.output_profile.frame_interval * 1000
+                },
+                'buffer': self.frame_buffer.stats() if self.frame_buffer else None,
+                'decode_fps': self.video_decode_rate.collect(),
+                'send_fps': self.video_send_rate.collect(),
+                'frames_late': self.video_frames_late.value,
+                'frames_dropped': self.video_frames_dropped.value,
+                'frames_repeated': self.video_frames_repeated.value,
+                'loop_cache': self.loop_cache.stats(),
+                'disk_cache': self.disk_cache.stats() if self.disk_cache else None
             },
             'audio': {
                 'playing': self.audio_playing,
                 'current': self.current_audio_path,
-                'queue_size': len(self.audio_queue),
-                'loop': self.audio_loop
+                'soundtracks': self.soundtrack_queue is not None,
+                'queue_size': self.audio_playlist.remaining(),
+                'playlist_size': len(self.audio_playlist),
+                'shuffle': self.audio_playlist.shuffle,
+                'loop': self.audio_loop,
+                'mode': self.audio_mode,
+                'sink': type(self.audio_sink).__name__,
+                'buffer': self.audio_ring.stats() if self.audio_ring else None
+            },
+            'paused': self.paused,
+            'library': {
+                'probing': len(self.probing),
+                'invalid': len(self.invalid_media)
+            },
+            'sync': {
+                'clock': self.media_clock.now(),
+                'audio_master': self.media_clock.audio_master,
+                'av_offset_ms': self.av_offset * 1000 if self.av_offset is not None else None,
+                'tolerance_ms': self.av_sync_tolerance * 1000
             }
         }
     
@@ -400,4 +1812,10 @@ class VirtualAVEngine:
         self.stop_streaming()
         self.status_callbacks.clear()
         self.error_callbacks.clear()
+        self.probe_callbacks.clear()
+        self.preview_callbacks.clear()
+        self._shutdown_probes()
+        self.set_media_index(None)
+        self.set_metrics_server(None)
+        self.set_metrics_file(None)
         logger.info("VirtualAVEngine cleaned up")
@@ -7,34 +7,273 @@ It includes a modern, dark-themed UI with video preview and playback controls.
 import os
 import sys
 import logging
+import queue
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set, Tuple
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QFileDialog, QListWidget, QListWidgetItem,
+    QPushButton, QLabel, QFileDialog, QListView, QAbstractItemView,
     QStatusBar, QSlider, QStyle, QMessageBox, QFrame, QSplitter
 )
-from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal, QThread, QObject, QProcess
-from PyQt6.QtGui import QPixmap, QImage, QIcon, QFont, QColor, QPalette
+from PyQt6.QtCore import (
+    Qt, QEvent, QSize, QTimer, pyqtSignal, QThread, QObject, QProcess,
+    QAbstractListModel, QModelIndex
+)
+from PyQt6.QtGui import QImage, QIcon, QFont, QColor, QPalette, QPainter
+import numpy as np
 import qtawesome as qta
 
+from core.media_probe import MediaInfo
+from core.media_scan import AUDIO, VIDEO
+from core.thumbnails import ThumbnailCache
 from core.virtual_av import VirtualAVEngine
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Custom QListWidget for drag and drop support
-class MediaListWidget(QListWidget):
-    """Custom QListWidget that supports drag and drop for media files."""
+# Background thumbnail generation for visible list rows
+class ThumbnailLoader(QObject):
+    """Makes thumbnails on a small pool of worker threads.
+    
+    The most recent requests are served first, so the rows on screen get
+    their thumbnails before rows that were scrolled past.
+    """
+    
+    # Emitted from a worker thread with (path, thumbnail file or '')
+    thumbnail_ready = pyqtSignal(str, str)
+    
+    WORKERS = 2
+    
+    def __init__(self, cache: ThumbnailCache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self._requests: queue.LifoQueue = queue.LifoQueue()
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._worker, daemon=True) for _ in range(self.WORKERS)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def request(self, path: str, duration: Optional[float] = None):
+        """Queue ``path`` (``duration`` seconds long, if known) for a thumbnail unless it is already queued."""
+        with self._lock:
+            if path in self._pending:
+                return
+            self._pending.add(path)
+        self._requests.put((path, duration))
+    
+    def _worker(self):
+        while not self._stop_event.is_set():
+            try:
+                path, duration = self._requests.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            try:
+                thumbnail = self.cache.get_or_create(path, duration)
+            except Exception as e:
+                logger.error(f"Error making thumbnail for {path}: {e}")
+                thumbnail = None
+            
+            with self._lock:
+                self._pending.discard(path)
+            if not self._stop_event.is_set():
+                self.thumbnail_ready.emit(path, thumbnail or '')
+    
+    def close(self):
+        """Stop the worker threads."""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+
+
+# List model of the media queue
+class MediaListModel(QAbstractListModel):
+    """Rows of ``(kind, path)`` for the media queue, shown as "Video: path".
+    
+    Rows are appended in batches without touching existing ones. Their
+    media info is read from the index in one batch when they are added and
+    kept up to date from probe results, so painting a row never touches the
+    disk. Video thumbnails are requested from the loader only when the view
+    asks for a row on screen, with a bounded in-memory cache of icons.
+    """
+    
+    PathRole = Qt.ItemDataRole.UserRole
+    
+    # Thumbnail icons kept in memory
+    ICON_CACHE_SIZE = 512
+    
+    def __init__(self, engine: VirtualAVEngine, loader: ThumbnailLoader, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.loader = loader
+        loader.thumbnail_ready.connect(self.set_thumbnail)
+        
+        self._entries: List[Tuple[str, str]] = []
+        self._rows: Dict[str, List[int]] = {}
+        self._errors: Dict[str, str] = {}
+        self._infos: Dict[str, MediaInfo] = {}
+        self._icons: OrderedDict = OrderedDict()
+        self._no_thumbnail: Set[str] = set()
+        
+        self._video_icon = qta.icon('fa5s.film', color='#ff6b6b')
+        self._audio_icon = qta.icon('fa5s.music', color='#6b9eff')
+        self._error_icon = qta.icon('fa5s.exclamation-triangle', color='#ffb86b')
+    
+    # ===== Model Interface =====
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._entries)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._entries):
+            return None
+        
+        kind, path = self._entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{'Video' if kind == VIDEO else 'Audio'}: {path}"
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icon(kind, path)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self._tooltip(path)
+        if role == Qt.ItemDataRole.ForegroundRole and path in self._errors:
+            return QColor('#888888')
+        if role == self.PathRole:
+            return path
+        return None
+    
+    def _icon(self, kind: str, path: str) -> QIcon:
+        if path in self._errors:
+            return self._error_icon
+        if kind != VIDEO:
+            return self._audio_icon
+        
+        icon = self._icons.get(path)
+        if icon is not None:
+            self._icons.move_to_end(path)
+            return icon
+        if path not in self._no_thumbnail:
+            info = self._infos.get(path)
+            self.loader.request(path, info.duration if info else None)
+        return self._video_icon
+    
+    def _tooltip(self, path: str) -> str:
+        if path in self._errors:
+            return f"Cannot be played: {self._errors[path]}"
+        info = self._infos.get(path)
+        if info:
+            return self.format_media_info(info)
+        return "Probing..." if path in self.engine.probing else path
+    
+    @staticmethod
+    def format_media_info(info) -> str:
+        """Format a MediaInfo record as a one-line summary."""
+        parts = []
+        if info.width and info.height:
+            video = f"{info.width}x{info.height}"
+            if info.fps:
+                video += f" @ {info.fps:.2f} fps"
+            if info.video_codec:
+                video += f" ({info.video_codec})"
+            parts.append(video)
+        if info.samplerate:
+            audio = f"{info.samplerate} Hz"
+            if info.channels:
+                audio += f" {info.channels}ch"
+            if info.audio_codec:
+                audio += f" ({info.audio_codec})"
+            parts.append(audio)
+        if info.duration:
+            minutes, seconds = divmod(int(info.duration), 60)
+            parts.append(f"{minutes}:{seconds:02d}")
+        return " | ".join(parts) or info.path
+    
+    # ===== Editing =====
+    
+    def append_entries(self, entries: List[Tuple[str, str]]):
+        """Append ``(kind, path)`` rows in one insert."""
+        if not entries:
+            return
+        
+        new_paths = {path for _, path in entries if path not in self._infos}
+        self._infos.update(self.engine.get_media_infos(new_paths))
+        
+        first = len(self._entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        for row, (kind, path) in enumerate(entries, first):
+            self._entries.append((kind, path))
+            self._rows.setdefault(path, []).append(row)
+        self.endInsertRows()
+    
+    def clear(self):
+        """Remove every row."""
+        self.beginResetModel()
+        self._entries.clear()
+        self._rows.clear()
+        self._errors.clear()
+        self._infos.clear()
+        self.endResetModel()
+    
+    def path(self, index: QModelIndex) -> Optional[str]:
+        """File path of the row at ``index``."""
+        return self.data(index, self.PathRole)
+    
+    def _path_changed(self, path: str, roles: List[Qt.ItemDataRole]):
+        for row in self._rows.get(path, ()):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, roles)
+    
+    # ===== Updates =====
+    
+    def set_probe_result(self, path: str, info, error: Optional[str]):
+        """Store the probe result for ``path``, marking it unplayable if the probe failed."""
+        if info:
+            self._infos[path] = info
+        elif error:
+            self._errors[path] = error
+        self._path_changed(path, [
+            Qt.ItemDataRole.ToolTipRole,
+            Qt.ItemDataRole.DecorationRole,
+            Qt.ItemDataRole.ForegroundRole
+        ])
+    
+    def set_thumbnail(self, path: str, thumbnail: str):
+        """Show a finished thumbnail; an empty ``thumbnail`` means none could be made."""
+        if not thumbnail:
+            self._no_thumbnail.add(path)
+            return
+        
+        self._icons[path] = QIcon(thumbnail)
+        if len(self._icons) > self.ICON_CACHE_SIZE:
+            self._icons.popitem(last=False)
+        self._path_changed(path, [Qt.ItemDataRole.DecorationRole])
+
+
+# Media queue view with drag and drop support
+class MediaListView(QListView):
+    """List view of the media queue that accepts dropped media files.
+    
+    Rows have a uniform height, so the view lays out and paints only the
+    rows on screen however long the queue is.
+    """
+    
+    # Emitted with the local paths of dropped files
+    files_dropped = pyqtSignal(list)
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
-        self.setDragDropMode(QListWidget.DragDropMode.DropOnly)
-        self.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
-        self.setIconSize(QSize(32, 32))
+        self.setDragDropMode(QAbstractItemView.DragDropMode.DropOnly)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setUniformItemSizes(True)
+        self.setIconSize(QSize(64, 36))
     
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -51,15 +290,79 @@ class MediaListWidget(QListWidget):
     def dropEvent(self, event):
         if event.mimeData().hasUrls():
             urls = [url.toLocalFile() for url in event.mimeData().urls()]
-            self.parent().add_media_files(urls)
+            self.files_dropped.emit(urls)
             event.acceptProposedAction()
         else:
             event.ignore()
 
+# QLabel that draws preview frames straight from the engine's buffers
+class PreviewLabel(QLabel):
+    """QLabel that paints an RGB888 preview frame centered, without a QPixmap copy.
+    
+    Frames are expected at the label's size in device pixels (see
+    ``frame_size``); they are wrapped in a ``QImage`` that shares their
+    memory and drawn as they are, so nothing is converted or scaled on the
+    GUI thread.
+    """
+    
+    # Emitted with the new frame size (width, height) in device pixels
+    frame_size_changed = pyqtSignal(int, int)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._frame: Optional[np.ndarray] = None  # Keeps the image's memory alive
+        self._image: Optional[QImage] = None
+    
+    def frame_size(self) -> tuple:
+        """Size in device pixels that frames should fit."""
+        ratio = self.devicePixelRatioF()
+        return int(self.width() * ratio), int(self.height() * ratio)
+    
+    def set_frame(self, frame: np.ndarray):
+        """Show ``frame`` (height x width x 3, RGB) on the next paint."""
+        height, width = frame.shape[:2]
+        self._frame = frame
+        self._image = QImage(frame.data, width, height, frame.strides[0], QImage.Format.Format_RGB888)
+        self._image.setDevicePixelRatio(self.devicePixelRatioF())
+        self.update()
+    
+    def clear_frame(self):
+        """Stop drawing a frame."""
+        self._frame = None
+        self._image = None
+        self.update()
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._image is None:
+            return
+        
+        size = self._image.deviceIndependentSize()
+        painter = QPainter(self)
+        painter.drawImage(
+            int((self.width() - size.width()) / 2),
+            int((self.height() - size.height()) / 2),
+            self._image
+        )
+        painter.end()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.frame_size_changed.emit(*self.frame_size())
+
 # Main application window
 class StreamForgeDesktop(QMainWindow):
     """Main application window for the StreamForge desktop interface."""
     
+    # Emitted from the engine's probe pool with (path, info, error)
+    media_probed = pyqtSignal(str, object, object)
+    
+    # Emitted from the engine's pacing thread when a preview frame is ready
+    preview_ready = pyqtSignal()
+    
+    # Most preview redraws per second
+    PREVIEW_MAX_FPS = 30
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("StreamForge - Desktop")
@@ -72,6 +375,11 @@ class StreamForgeDesktop(QMainWindow):
         self.engine = VirtualAVEngine()
         self.engine.register_status_callback(self.update_status)
         self.engine.register_error_callback(self.show_error)
+        self.media_probed.connect(self.update_media_info)
+        self.engine.register_probe_callback(self.media_probed.emit)
+        
+        # Thumbnails for the media list, made in the background
+        self.thumbnail_loader = ThumbnailLoader(ThumbnailCache(), self)
         
         # Theme settings
         self.dark_mode = True
@@ -84,10 +392,13 @@ class StreamForgeDesktop(QMainWindow):
         # Check audio device
         self.check_audio_device()
         
-        # Update timer for video preview
-        self.preview_timer = QTimer(self)
-        self.preview_timer.timeout.connect(self.update_preview)
-        self.preview_timer.start(30)  # ~33 FPS
+        # Video preview, redrawn when the engine publishes a frame; only
+        # enabled while the window is visible and not minimized
+        self.preview_sequence = 0
+        self.preview_active = False
+        self.preview_ready.connect(self.update_preview)
+        self.engine.register_preview_callback(lambda sequence: self.preview_ready.emit())
+        self.video_preview.frame_size_changed.connect(self.resize_preview)
         
         # Status update timer
         self.status_timer = QTimer(self)
@@ -175,8 +486,11 @@ class StreamForgeDesktop(QMainWindow):
         btn_add.clicked.connect(self.browse_media)
         
         # Media list
-        self.media_list = MediaListWidget()
-        self.media_list.itemDoubleClicked.connect(self.play_selected_media)
+        self.media_model = MediaListModel(self.engine, self.thumbnail_loader, self)
+        self.media_list = MediaListView()
+        self.media_list.setModel(self.media_model)
+        self.media_list.doubleClicked.connect(self.play_selected_media)
+        self.media_list.files_dropped.connect(self.add_media_files)
         
         # Playback controls
         control_layout = QHBoxLayout()
@@ -202,11 +516,18 @@ class StreamForgeDesktop(QMainWindow):
         self.btn_loop.setCheckable(True)
         self.btn_loop.toggled.connect(self.toggle_loop)
         
+        self.btn_shuffle = QPushButton()
+        self.btn_shuffle.setIcon(qta.icon('fa5s.random', color='white'))
+        self.btn_shuffle.setCheckable(True)
+        self.btn_shuffle.setToolTip("Shuffle")
+        self.btn_shuffle.toggled.connect(self.toggle_shuffle)
+        
         control_layout.addWidget(self.btn_prev)
         control_layout.addWidget(self.btn_play)
         control_layout.addWidget(self.btn_stop)
         control_layout.addWidget(self.btn_next)
         control_layout.addWidget(self.btn_loop)
+        control_layout.addWidget(self.btn_shuffle)
         
         # Add widgets to left layout
         left_layout.addWidget(btn_add)
@@ -219,7 +540,7 @@ class StreamForgeDesktop(QMainWindow):
         right_layout = QVBoxLayout(right_panel)
         
         # Video preview
-        self.video_preview = QLabel()
+        self.video_preview = PreviewLabel()
         self.video_preview.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.video_preview.setStyleSheet("background-color: #1e1e1e; border-radius: 8px;")
         self.video_preview.setMinimumSize(640, 360)
@@ -323,18 +644,11 @@ class StreamForgeDesktop(QMainWindow):
         
         loaded, errors = self.engine.load_media(file_paths)
         
-        # Update media list
-        self.media_list.clear()
-        for file_path in loaded:
-            item = QListWidgetItem(file_path)
-            
-            # Set appropriate icon based on file type
-            if file_path.lower().endswith(tuple(self.engine.VIDEO_EXTS)):
-                item.setIcon(qta.icon('fa5s.film', color='#ff6b6b'))
-            else:
-                item.setIcon(qta.icon('fa5s.music', color='#6b9eff'))
-            
-            self.media_list.addItem(item)
+        # Append the new entries to the list
+        self.media_model.append_entries([
+            (VIDEO if entry.startswith('Video: ') else AUDIO, entry.split(': ', 1)[-1])
+            for entry in loaded
+        ])
         
         # Show errors if any
         if errors:
@@ -342,23 +656,21 @@ class StreamForgeDesktop(QMainWindow):
         
         self.update_ui_state()
     
+    def update_media_info(self, path, info, error):
+        """Show a probe result on the matching list rows."""
+        self.media_model.set_probe_result(path, info, error)
+    
     def clear_queue(self):
         """Clear the media queue."""
-        self.engine.stop_streaming()
-        self.media_list.clear()
-        self.engine.video_queue.clear()
-        self.engine.audio_queue.clear()
+        self.engine.clear_media()
+        self.media_model.clear()
         self.update_ui_state()
     
     # ===== Playback Control =====
     
     def toggle_playback(self):
         """Toggle between play and pause."""
-        if self.engine.video_playing or self.engine.audio_playing:
-            self.engine.stop_streaming()
-        else:
-            self.engine.start_streaming()
-        
+        self.engine.toggle_pause()
         self.update_ui_state()
     
     def stop_playback(self):
@@ -368,18 +680,12 @@ class StreamForgeDesktop(QMainWindow):
     
     def next_media(self):
         """Skip to the next media in the queue."""
-        # For simplicity, we'll just stop and restart streaming
-        self.engine.stop_streaming()
-        if self.engine.video_queue or self.engine.audio_queue:
-            self.engine.start_streaming()
+        self.engine.next_media()
         self.update_ui_state()
     
     def previous_media(self):
         """Go back to the previous media in the queue."""
-        # For simplicity, we'll just stop and restart streaming
-        self.engine.stop_streaming()
-        if self.engine.video_queue or self.engine.audio_queue:
-            self.engine.start_streaming()
+        self.engine.previous_media()
         self.update_ui_state()
     
     def toggle_loop(self, checked):
@@ -387,11 +693,13 @@ class StreamForgeDesktop(QMainWindow):
         self.engine.set_video_loop(checked)
         self.engine.set_audio_loop(checked)
     
-    def play_selected_media(self, item):
+    def toggle_shuffle(self, checked):
+        """Toggle shuffled playback order."""
+        self.engine.set_shuffle(checked)
+    
+    def play_selected_media(self, index):
         """Play the selected media file."""
-        # For simplicity, we'll just start playing from the beginning
-        self.engine.stop_streaming()
-        self.engine.start_streaming()
+        self.engine.play_media(self.media_model.path(index))
         self.update_ui_state()
     
     # ===== UI Updates =====
@@ -399,7 +707,7 @@ class StreamForgeDesktop(QMainWindow):
     def update_ui_state(self):
         """Update the UI based on the current state."""
         # Update play/pause button
-        if self.engine.video_playing or self.engine.audio_playing:
+        if (self.engine.video_playing or self.engine.audio_playing) and not self.engine.paused:
             self.btn_play.setIcon(qta.icon('fa5s.pause', color='white'))
             self.btn_play.setToolTip("Pause")
         else:
@@ -407,12 +715,15 @@ class StreamForgeDesktop(QMainWindow):
             self.btn_play.setToolTip("Play")
         
         # Update button states
-        has_media = bool(self.engine.video_queue or self.engine.audio_queue)
+        video_playlist = self.engine.video_playlist
+        audio_playlist = self.engine.audio_playlist
+        has_media = bool(video_playlist or audio_playlist)
         self.btn_play.setEnabled(has_media)
         self.btn_stop.setEnabled(has_media)
-        self.btn_next.setEnabled(has_media and len(self.engine.video_queue) > 1)
-        self.btn_prev.setEnabled(has_media and bool(self.engine.current_video_path or self.engine.current_audio_path))
+        self.btn_next.setEnabled(has_media and (video_playlist.peek_next() or audio_playlist.peek_next()) is not None)
+        self.btn_prev.setEnabled(has_media and (video_playlist.current or audio_playlist.current) is not None)
         self.btn_loop.setEnabled(has_media)
+        self.btn_shuffle.setEnabled(has_media)
         
         # Update status bar
         status = []
@@ -425,32 +736,30 @@ class StreamForgeDesktop(QMainWindow):
             self.status_bar.showMessage(" | ".join(status))
     
     def update_preview(self):
-        """Update the video preview."""
-        if not hasattr(self, 'engine') or not self.engine.video_capture:
+        """Show the latest frame the engine sent, if it changed."""
+        if not hasattr(self, 'engine'):
+            return
+        
+        latest = self.engine.preview.latest()
+        if latest is None or latest[0] == self.preview_sequence:
             return
         
         try:
-            ret, frame = self.engine.video_capture.read()
-            if ret:
-                # Convert BGR to RGB
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Convert to QImage
-                h, w, ch = frame_rgb.shape
-                bytes_per_line = ch * w
-                q_img = QImage(frame_rgb.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-                
-                # Scale image to fit the preview while maintaining aspect ratio
-                scaled_pixmap = QPixmap.fromImage(q_img).scaled(
-                    self.video_preview.size(),
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                
-                self.video_preview.setPixmap(scaled_pixmap)
+            # Already RGB888 at the widget's size; wrapped, not copied
+            self.preview_sequence, frame = latest
+            self.video_preview.set_frame(frame)
         except Exception as e:
             logger.error(f"Error updating preview: {e}")
     
+    def set_preview_active(self, active: bool):
+        """Turn the engine's preview publishing on or off."""
+        self.preview_active = active
+        self.engine.set_preview(active, self.video_preview.frame_size(), 'RGB', self.PREVIEW_MAX_FPS)
+    
+    def resize_preview(self, width: int, height: int):
+        """Have the engine produce preview frames at the preview widget's new size."""
+        self.engine.set_preview(self.preview_active, (width, height), 'RGB')
+    
     def update_status(self, message):
         """Update the status bar with a message."""
         self.status_bar.showMessage(message, 5000)  # Show for 5 seconds
@@ -470,8 +779,25 @@ class StreamForgeDesktop(QMainWindow):
     
     # ===== Window Events =====
     
+    def showEvent(self, event):
+        """Start the preview when the window is shown."""
+        super().showEvent(event)
+        self.set_preview_active(not self.isMinimized())
+    
+    def hideEvent(self, event):
+        """Stop the preview while the window is hidden."""
+        super().hideEvent(event)
+        self.set_preview_active(False)
+    
+    def changeEvent(self, event):
+        """Stop the preview while the window is minimized."""
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.set_preview_active(self.isVisible() and not self.isMinimized())
+    
     def closeEvent(self, event):
         """Handle window close event."""
+        self.thumbnail_loader.close()
         self.engine.cleanup()
         event.accept()
     
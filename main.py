@@ -21,6 +21,8 @@ def parse_args():
     parser.add_argument('--desktop', action='store_true', help='Launch desktop interface')
     parser.add_argument('--web', action='store_true', help='Launch web interface')
     parser.add_argument('--port', type=int, default=5000, help='Port for web interface (default: 5000)')
+    parser.add_argument('--list', metavar='DIR',
+                        help='List the media files under DIR with their cached thumbnails and exit')
     return parser.parse_args()
 
 def launch_desktop():
@@ -49,11 +51,31 @@ def launch_web(port: int):
     app = create_app()
     app.run(debug=True, port=port, use_reloader=False)
 
+def list_media(root: str):
+    """Print the kind, path and thumbnail file of every media file under ``root``."""
+    from concurrent.futures import ThreadPoolExecutor
+    from core.media_scan import VIDEO, scan_media
+    from core.thumbnails import ThumbnailCache
+    from core.virtual_av import VirtualAVEngine
+    
+    cache = ThumbnailCache()
+    files = list(scan_media(root, VirtualAVEngine.VIDEO_EXTS, VirtualAVEngine.AUDIO_EXTS))
+    
+    def thumbnail(entry):
+        kind, path = entry
+        return cache.get_or_create(path) if kind == VIDEO else None
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for (kind, path), thumb in zip(files, executor.map(thumbnail, files)):
+            print(f"{kind}\t{path}\t{thumb or '-'}")
+
 def main():
     """Main entry point for StreamForge."""
     args = parse_args()
     
-    if args.desktop:
+    if args.list:
+        list_media(args.list)
+    elif args.desktop:
         launch_desktop()
     elif args.web:
         launch_web(args.port)
@@ -0,0 +1,97 @@
+"""Tests for ``AudioRingBuffer`` wrap-around, discarding and underruns."""
+import numpy as np
+
+from core.audio_buffer import AudioRingBuffer
+
+
+def frames(start: int, count: int, channels: int = 2) -> np.ndarray:
+    """Sample frames numbered ``start`` onwards, every channel holding the number."""
+    return np.repeat(np.arange(start, start + count, dtype='float32')[:, None], channels, axis=1)
+
+
+def test_write_then_read_in_order():
+    ring = AudioRingBuffer(8)
+    assert ring.write(frames(0, 5)) == 5
+    out = np.empty((5, 2), dtype='float32')
+    assert ring.read_into(out) == 5
+    np.testing.assert_array_equal(out, frames(0, 5))
+    assert ring.frames_played == 5
+
+
+def test_write_stops_when_full():
+    ring = AudioRingBuffer(8)
+    assert ring.write(frames(0, 10)) == 8
+    assert ring.free == 0
+    assert ring.write(frames(10, 1)) == 0
+
+
+def test_wrap_around_keeps_samples_contiguous():
+    ring = AudioRingBuffer(8)
+    out = np.empty((3, 2), dtype='float32')
+    written = 0
+    for _ in range(10):
+        written += ring.write(frames(written, 5))
+        ring.read_into(out)
+
+    # Whatever is left comes out in order after many wraps
+    start = ring.frames_played
+    rest = np.empty((ring.available, 2), dtype='float32')
+    assert ring.read_into(rest) == len(rest)
+    np.testing.assert_array_equal(rest, frames(start, len(rest)))
+    assert start + len(rest) == written
+
+
+def test_short_read_pads_with_silence_and_counts_underrun():
+    ring = AudioRingBuffer(8)
+    ring.write(frames(1, 2))
+    out = np.full((4, 2), 5.0, dtype='float32')
+    assert ring.read_into(out) == 2
+    np.testing.assert_array_equal(out[2:], 0)
+    assert ring.underruns == 1
+
+
+def test_end_of_stream_is_not_an_underrun():
+    ring = AudioRingBuffer(8)
+    ring.write(frames(1, 2))
+    ring.end_of_stream = True
+    ring.read_into(np.empty((4, 2), dtype='float32'))
+    assert ring.underruns == 0
+
+
+def test_discard_skips_queued_audio():
+    ring = AudioRingBuffer(8)
+    ring.write(frames(0, 6))
+    ring.discard()
+    assert ring.available == 0
+    assert ring.free == 8
+
+    ring.write(frames(100, 3))
+    out = np.empty((3, 2), dtype='float32')
+    assert ring.read_into(out) == 3
+    np.testing.assert_array_equal(out, frames(100, 3))
+    assert ring.frames_played == 3
+
+
+def test_discard_across_wrap_around():
+    ring = AudioRingBuffer(8)
+    out = np.empty((6, 2), dtype='float32')
+    ring.write(frames(0, 6))
+    ring.read_into(out)
+    ring.write(frames(6, 7))  # Wraps past the end of the storage
+    ring.discard()
+
+    ring.write(frames(50, 8))
+    full = np.empty((8, 2), dtype='float32')
+    assert ring.read_into(full) == 8
+    np.testing.assert_array_equal(full, frames(50, 8))
+
+
+def test_reset_drops_audio_and_counters():
+    ring = AudioRingBuffer(8)
+    ring.write(frames(0, 4))
+    ring.read_into(np.empty((2, 2), dtype='float32'))
+    ring.end_of_stream = True
+    ring.reset()
+    assert ring.available == 0
+    assert ring.frames_played == 0
+    assert not ring.end_of_stream
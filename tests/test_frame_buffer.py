@@ -0,0 +1,134 @@
+"""Tests for ``FrameRingBuffer`` slot order, wrap-around and flushing."""
+import threading
+
+import numpy as np
+import pytest
+
+from core.frame_buffer import FrameRingBuffer
+
+SHAPE = (2, 2, 3)
+
+
+def write(buffer: FrameRingBuffer, value: int, tag=None):
+    slot = buffer.acquire_write(timeout=1.0)
+    assert slot is not None
+    slot.fill(value)
+    buffer.commit_write(tag)
+
+
+def read(buffer: FrameRingBuffer):
+    """Read one frame; returns (value, tag)."""
+    frame = buffer.acquire_read(timeout=1.0)
+    assert frame is not None
+    value, tag = int(frame[0, 0, 0]), buffer.read_tag
+    buffer.release_read()
+    return value, tag
+
+
+def test_depth_must_be_at_least_two():
+    with pytest.raises(ValueError):
+        FrameRingBuffer(1, SHAPE)
+
+
+def test_frames_and_tags_come_out_in_order_across_wrap_around():
+    buffer = FrameRingBuffer(3, SHAPE)
+    for value in range(10):
+        write(buffer, value, tag=f"tag{value}")
+        assert read(buffer) == (value, f"tag{value}")
+    assert buffer.frames_written == buffer.frames_read == 10
+
+
+def test_full_buffer_blocks_writer_until_read():
+    buffer = FrameRingBuffer(2, SHAPE)
+    write(buffer, 1)
+    write(buffer, 2)
+    assert buffer.acquire_write(timeout=0.01) is None
+
+    assert read(buffer) == (1, None)
+    write(buffer, 3)
+    assert [read(buffer)[0] for _ in range(2)] == [2, 3]
+
+
+def test_external_frame_is_passed_without_copy():
+    buffer = FrameRingBuffer(2, SHAPE)
+    frame = np.full(SHAPE, 9, dtype=np.uint8)
+    buffer.acquire_write()
+    buffer.commit_external(frame, 'cached')
+    assert buffer.acquire_read(timeout=1.0) is frame
+    assert buffer.read_tag == 'cached'
+    buffer.release_read()
+
+    # The slot is the buffer's own again afterwards
+    write(buffer, 4)
+    write(buffer, 5)
+    assert [read(buffer)[0] for _ in range(2)] == [4, 5]
+
+
+def test_flush_drops_unread_frames():
+    buffer = FrameRingBuffer(4, SHAPE)
+    for value in range(3):
+        write(buffer, value)
+    assert buffer.flush() == 3
+    assert buffer.fill_level == 0
+
+    write(buffer, 7)
+    assert read(buffer) == (7, None)
+
+
+def test_flush_keeps_frame_being_read():
+    buffer = FrameRingBuffer(3, SHAPE)
+    for value in range(3):
+        write(buffer, value)
+    frame = buffer.acquire_read(timeout=1.0)
+    assert buffer.flush() == 2
+    assert int(frame[0, 0, 0]) == 0
+    buffer.release_read()
+
+    write(buffer, 8)
+    assert read(buffer) == (8, None)
+
+
+def test_flush_after_wrap_around():
+    buffer = FrameRingBuffer(3, SHAPE)
+    for value in range(5):
+        write(buffer, value)
+        read(buffer)
+    write(buffer, 5)
+    write(buffer, 6)
+    buffer.flush()
+    for value in (10, 11, 12):
+        write(buffer, value)
+    assert [read(buffer)[0] for _ in range(3)] == [10, 11, 12]
+
+
+def test_flush_wakes_blocked_writer():
+    buffer = FrameRingBuffer(2, SHAPE)
+    write(buffer, 1)
+    write(buffer, 2)
+    slots = []
+    writer = threading.Thread(target=lambda: slots.append(buffer.acquire_write(timeout=2.0)))
+    writer.start()
+    buffer.flush()
+    writer.join(timeout=2.0)
+    assert slots and slots[0] is not None
+
+
+def test_finish_drains_then_reports_finished():
+    buffer = FrameRingBuffer(2, SHAPE)
+    write(buffer, 1)
+    buffer.finish()
+    assert not buffer.finished
+    assert read(buffer) == (1, None)
+    assert buffer.acquire_read(timeout=0.01) is None
+    assert buffer.finished
+
+
+def test_close_wakes_blocked_reader():
+    buffer = FrameRingBuffer(2, SHAPE)
+    frames = []
+    reader = threading.Thread(target=lambda: frames.append(buffer.acquire_read(timeout=2.0)))
+    reader.start()
+    buffer.close()
+    reader.join(timeout=2.0)
+    assert frames == [None]
+    assert buffer.finished
@@ -0,0 +1,215 @@
+"""Tests for the play cursor, shuffle and repeat of ``Playlist``."""
+import random
+
+import pytest
+
+from core.playlist import Playlist, REPEAT_ALL, REPEAT_ONE
+
+ITEMS = [f"clip{i}.mp4" for i in range(8)]
+
+
+def play_pass(playlist: Playlist) -> list:
+    """Advance until the end of the list and return what was played."""
+    played = []
+    while (path := playlist.advance()) is not None:
+        played.append(path)
+    return played
+
+
+def shuffled(seed: int = 7) -> Playlist:
+    """Shuffled playlist of ``ITEMS`` with a fixed random order."""
+    random.seed(seed)
+    playlist = Playlist(ITEMS)
+    playlist.set_shuffle(True)
+    return playlist
+
+
+def shuffled_order(seed: int = 7) -> list:
+    """Play order of ``shuffled(seed)``."""
+    return play_pass(shuffled(seed))
+
+
+# ===== Shuffle and Repeat =====
+
+def test_sequential_pass_plays_list_order():
+    playlist = Playlist(ITEMS)
+    assert play_pass(playlist) == ITEMS
+    assert playlist.current is None
+    assert not playlist.has_next()
+
+
+def test_shuffle_is_a_permutation():
+    for seed in range(20):
+        order = shuffled_order(seed)
+        assert sorted(order) == sorted(ITEMS)
+
+
+def test_shuffle_varies_the_order():
+    orders = {tuple(shuffled_order(seed)) for seed in range(20)}
+    assert len(orders) > 1
+
+
+def test_shuffle_keeps_current_item_first():
+    playlist = Playlist(ITEMS)
+    playlist.advance()
+    playlist.advance()
+    playlist.set_shuffle(True)
+    assert playlist.current == ITEMS[1]
+    rest = play_pass(playlist)
+    assert sorted(rest + [ITEMS[1]]) == sorted(ITEMS)
+
+
+def test_unshuffle_continues_in_list_order():
+    playlist = shuffled()
+    playlist.advance()
+    current = playlist.current
+    playlist.set_shuffle(False)
+    assert playlist.current == current
+    assert play_pass(playlist) == ITEMS[ITEMS.index(current) + 1:]
+
+
+def test_repeat_all_reshuffles_every_pass():
+    playlist = shuffled()
+    playlist.set_repeat(REPEAT_ALL)
+    passes = [tuple(playlist.advance() for _ in ITEMS) for _ in range(10)]
+    for order in passes:
+        assert sorted(order) == sorted(ITEMS)
+    assert len(set(passes)) > 1
+
+
+def test_repeat_one_stays_on_current():
+    playlist = Playlist(ITEMS)
+    playlist.advance()
+    playlist.set_repeat(REPEAT_ONE)
+    assert [playlist.advance() for _ in range(3)] == [ITEMS[0]] * 3
+
+
+def test_unknown_repeat_mode_raises():
+    with pytest.raises(ValueError):
+        Playlist(ITEMS).set_repeat('sometimes')
+
+
+# ===== Removal =====
+
+@pytest.mark.parametrize('shuffle', [False, True])
+def test_remove_current_continues_with_next(shuffle):
+    playlist = shuffled() if shuffle else Playlist(ITEMS)
+    order = shuffled_order() if shuffle else ITEMS
+    for _ in range(3):
+        playlist.advance()
+    assert playlist.current == order[2]
+
+    playlist.remove(order[2])
+    assert play_pass(playlist) == order[3:]
+
+
+@pytest.mark.parametrize('shuffle', [False, True])
+def test_remove_earlier_item_keeps_current(shuffle):
+    playlist = shuffled() if shuffle else Playlist(ITEMS)
+    order = shuffled_order() if shuffle else ITEMS
+    for _ in range(3):
+        playlist.advance()
+
+    playlist.remove(order[0])
+    assert playlist.current == order[2]
+    assert play_pass(playlist) == order[3:]
+
+
+@pytest.mark.parametrize('shuffle', [False, True])
+def test_remove_later_item_keeps_current(shuffle):
+    playlist = shuffled() if shuffle else Playlist(ITEMS)
+    order = shuffled_order() if shuffle else ITEMS
+    for _ in range(3):
+        playlist.advance()
+
+    playlist.remove(order[5])
+    assert playlist.current == order[2]
+    assert play_pass(playlist) == order[3:5] + order[6:]
+
+
+def test_remove_every_occurrence():
+    playlist = Playlist(['a', 'b', 'a', 'c'])
+    playlist.advance()
+    playlist.advance()
+    playlist.remove('a')
+    assert len(playlist) == 2
+    assert playlist.current == 'b'
+    assert play_pass(playlist) == ['c']
+
+
+def test_remove_missing_item_is_ignored():
+    playlist = Playlist(ITEMS)
+    playlist.advance()
+    playlist.remove('missing.mp4')
+    assert playlist.current == ITEMS[0]
+    assert len(playlist) == len(ITEMS)
+
+
+# ===== Appending =====
+
+def test_append_during_playback_plays_at_end():
+    playlist = Playlist(ITEMS[:3])
+    playlist.advance()
+    playlist.append('new.mp4')
+    assert play_pass(playlist) == ITEMS[1:3] + ['new.mp4']
+
+
+def test_append_while_shuffled_plays_later_in_pass():
+    for seed in range(20):
+        playlist = shuffled(seed)
+        played = [playlist.advance() for _ in range(3)]
+        playlist.append('new.mp4')
+        played += play_pass(playlist)
+        assert sorted(played) == sorted(ITEMS + ['new.mp4'])
+        assert played.index('new.mp4') >= 3
+
+
+def test_append_after_end_resumes_playback():
+    playlist = Playlist(ITEMS[:2])
+    play_pass(playlist)
+    playlist.append('new.mp4')
+    assert playlist.has_next()
+
+
+# ===== Jumping =====
+
+def test_jump_moves_cursor():
+    playlist = Playlist(ITEMS)
+    assert playlist.jump(4) == ITEMS[4]
+    assert playlist.current == ITEMS[4]
+    assert playlist.current_index == 4
+    assert playlist.advance() == ITEMS[5]
+    assert playlist.previous() == ITEMS[4]
+
+
+def test_jump_while_shuffled_continues_shuffled_order():
+    playlist = shuffled()
+    order = shuffled_order()
+    target = order[5]
+    assert playlist.jump(ITEMS.index(target)) == target
+    assert playlist.current == target
+    assert play_pass(playlist) == order[6:]
+
+
+def test_jump_out_of_range_raises():
+    playlist = Playlist(ITEMS)
+    with pytest.raises(IndexError):
+        playlist.jump(len(ITEMS))
+    with pytest.raises(IndexError):
+        playlist.jump(-1)
+
+
+def test_jump_to_path():
+    playlist = Playlist(ITEMS)
+    assert playlist.jump_to(ITEMS[3])
+    assert playlist.current == ITEMS[3]
+    assert not playlist.jump_to('missing.mp4')
+    assert playlist.current == ITEMS[3]
+
+
+def test_previous_stays_on_first_item_unless_repeating():
+    playlist = Playlist(ITEMS)
+    playlist.advance()
+    assert playlist.previous() == ITEMS[0]
+    playlist.set_repeat(REPEAT_ALL)
+    assert playlist.previous() == ITEMS[-1]